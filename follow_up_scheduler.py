@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Follow-up Scheduler for Fiverr Workflow Automation
+Dispatches follow-ups stored in the scheduled_tasks table when they fall due
+"""
+
+import heapq
+import json
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from workflow_automation import FiverrWorkflowAutomation
+
+logger = logging.getLogger(__name__)
+
+
+class FollowUpScheduler:
+    """Timer-queue runner for scheduled follow-ups.
+
+    The pending-task index on ``scheduled_tasks.due_at`` is the persistent
+    priority queue, so tasks survive restarts. In memory the runner keeps the
+    next due time read from the index after each dispatch, plus a min-heap of
+    wake-up times for tasks scheduled through this object. The thread sleeps
+    until the earliest of those (capped at ``max_sleep`` so tasks added by other
+    processes are noticed) and then sends every due task in batches through
+    ``send_bulk_messages``.
+    """
+
+    def __init__(self, automation: FiverrWorkflowAutomation, batch_size: int = 500,
+                 max_sleep: float = 60.0, error_delay: float = 5.0):
+        self.automation = automation
+        self.batch_size = batch_size
+        self.max_sleep = max_sleep
+        self.error_delay = error_delay
+        self._wakeups: List[float] = []
+        self._next_due_at: Optional[float] = None
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, project_id: int, days: float = 7, template_name: str = 'follow_up',
+                 custom_vars: Dict[str, str] = None) -> int:
+        """Persist a follow-up and wake the runner if it is due sooner than anything queued"""
+        task_id = self.automation.schedule_follow_up(project_id, days, template_name, custom_vars)
+        self._push_wakeup(time.time() + days * 86400)
+        return task_id
+
+    def _push_wakeup(self, timestamp: float):
+        with self._condition:
+            heapq.heappush(self._wakeups, timestamp)
+            self._condition.notify()
+
+    def next_due(self) -> Optional[datetime]:
+        """Due time of the earliest pending task (a single index seek)"""
+        row = self.automation.db.connection().execute('''
+            SELECT due_at FROM scheduled_tasks
+            WHERE status = 'pending'
+            ORDER BY due_at
+            LIMIT 1
+        ''').fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def _dispatch_batch(self, now: str) -> Tuple[int, int]:
+        """Send one batch of due tasks; returns (done, failed)"""
+        with self.automation.db.transaction(immediate=True) as conn:
+            tasks = conn.execute('''
+                SELECT id, project_id, payload FROM scheduled_tasks
+                WHERE status = 'pending' AND due_at <= ?
+                ORDER BY due_at
+                LIMIT ?
+            ''', (now, self.batch_size)).fetchall()
+            if not tasks:
+                return 0, 0
+
+            # Tasks sharing a template and variables go out in one bulk send
+            groups: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+            for task_id, project_id, payload in tasks:
+                groups[payload or '{}'].append((task_id, project_id))
+
+            done, failed = [], []
+            for payload, group in groups.items():
+                options = json.loads(payload)
+                results = self.automation.send_bulk_messages(
+                    options.get('template_name', 'follow_up'),
+                    list(dict.fromkeys(project_id for _, project_id in group)),
+                    options.get('custom_vars'))
+                for task_id, project_id in group:
+                    if results.get(project_id):
+                        done.append((now, task_id))
+                    else:
+                        failed.append((now, 'project missing or message could not be rendered', task_id))
+
+            conn.executemany('''
+                UPDATE scheduled_tasks SET status = 'done', completed_date = ? WHERE id = ?
+            ''', done)
+            conn.executemany('''
+                UPDATE scheduled_tasks SET status = 'failed', completed_date = ?, last_error = ?
+                WHERE id = ?
+            ''', failed)
+        return len(done), len(failed)
+
+    def run_due(self) -> Dict[str, int]:
+        """Dispatch every task that is due now, batch by batch"""
+        now = datetime.now().isoformat()
+        totals = {'done': 0, 'failed': 0}
+        while True:
+            done, failed = self._dispatch_batch(now)
+            totals['done'] += done
+            totals['failed'] += failed
+            if done + failed < self.batch_size:
+                break
+        if totals['done'] or totals['failed']:
+            logger.info(f"Follow-ups dispatched: {totals['done']} sent, {totals['failed']} failed")
+
+        # Replaced rather than pushed, so waking early never grows the heap
+        next_due = self.next_due()
+        with self._condition:
+            self._next_due_at = next_due.timestamp() if next_due is not None else None
+            self._condition.notify()
+        return totals
+
+    def _sleep_seconds(self) -> float:
+        candidates = self._wakeups[:1] + ([self._next_due_at] if self._next_due_at is not None else [])
+        if not candidates:
+            return self.max_sleep
+        return min(max(0.0, min(candidates) - time.time()), self.max_sleep)
+
+    def _run(self):
+        while True:
+            started = time.time()
+            failed = False
+            try:
+                self.run_due()
+            except Exception as e:
+                logger.error(f"Follow-up scheduler error: {str(e)}")
+                failed = True
+            with self._condition:
+                # Wake-ups up to the start of this pass have just been served
+                while self._wakeups and self._wakeups[0] <= started:
+                    heapq.heappop(self._wakeups)
+                if not self._stopping:
+                    # After a failed pass the due times are stale (already past), so back
+                    # off instead of retrying in a tight loop
+                    delay = self._sleep_seconds()
+                    self._condition.wait(max(delay, min(self.error_delay, self.max_sleep)) if failed else delay)
+                if self._stopping:
+                    return
+
+    def start(self):
+        """Run the scheduler in a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name='follow-up-scheduler', daemon=True)
+        self._thread.start()
+        logger.info("Follow-up scheduler started")
+
+    def stop(self, timeout: float = None):
+        """Stop the background thread after the current dispatch"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        logger.info("Follow-up scheduler stopped")
+
+
+def main():
+    """Send all follow-ups that are due in the local workflow database"""
+    print("⏰ Follow-up Scheduler")
+    print("=" * 50)
+
+    automation = FiverrWorkflowAutomation()
+    scheduler = FollowUpScheduler(automation)
+    totals = scheduler.run_due()
+    next_due = scheduler.next_due()
+    automation.close()
+
+    print(f"Follow-ups sent: {totals['done']}")
+    print(f"Follow-ups failed: {totals['failed']}")
+    print(f"Next follow-up due: {next_due.isoformat() if next_due else 'none pending'}")
+
+if __name__ == "__main__":
+    main()
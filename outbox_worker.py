@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Outbox Delivery Worker for Fiverr Workflow Automation
+Drains the outbox table in the background and delivers queued messages over SMTP
+"""
+
+import os
+import queue
+import random
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from workflow_automation import DatabaseConnectionManager, FiverrWorkflowAutomation
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPConnectionPool:
+    """A bounded pool of logged-in SMTP connections reused across deliveries"""
+
+    def __init__(self, host: str, port: int = 25, username: str = None, password: str = None,
+                 use_tls: bool = False, max_connections: int = 4, timeout: float = 30.0):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._idle: "queue.LifoQueue[smtplib.SMTP]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            smtp.starttls()
+        if self.username:
+            smtp.login(self.username, self.password or '')
+        return smtp
+
+    def acquire(self) -> smtplib.SMTP:
+        """Return an idle live connection, opening a new one if none is available"""
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    smtp = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._connect()
+                try:
+                    if smtp.noop()[0] == 250:
+                        return smtp
+                except (smtplib.SMTPException, OSError):
+                    pass
+                self._discard(smtp)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, smtp: smtplib.SMTP, broken: bool = False):
+        """Return a connection to the pool, or close it if it failed mid-send"""
+        if broken:
+            self._discard(smtp)
+        else:
+            self._idle.put(smtp)
+        self._slots.release()
+
+    def _discard(self, smtp: smtplib.SMTP):
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            smtp.close()
+
+    def close_all(self):
+        """Close all idle connections"""
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting deliveries to ``rate`` messages per second"""
+
+    def __init__(self, rate: float, burst: int = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class OutboxDeliveryWorker:
+    """Background worker that claims due outbox rows in batches and delivers them.
+
+    Rows move ``pending -> sending -> sent``; a failed delivery goes back to
+    ``pending`` with an exponential backoff (plus jitter) until ``max_attempts``
+    is reached, after which it is marked ``failed``. Rows left in ``sending`` by
+    a crashed worker are reclaimed once their lease expires; that counts as an
+    attempt, so a row that keeps killing its worker also ends up ``failed``.
+    """
+
+    def __init__(self, db: DatabaseConnectionManager, smtp_pool: SMTPConnectionPool,
+                 sender: str, batch_size: int = 50, max_workers: int = 4,
+                 rate_per_second: float = 10.0, max_attempts: int = 5,
+                 backoff_base: float = 30.0, poll_interval: float = 5.0,
+                 lease_seconds: float = 600.0):
+        self.db = db
+        self.smtp_pool = smtp_pool
+        self.sender = sender
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(rate_per_second)
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    def claim_batch(self) -> List[Tuple]:
+        """Atomically mark up to ``batch_size`` due rows as sending and return them"""
+        now = datetime.now()
+        lease_expired = (now - timedelta(seconds=self.lease_seconds)).isoformat()
+        with self.db.transaction(immediate=True) as conn:
+            # An expired lease counts as a failed attempt, so a message that crashes or
+            # hangs every worker that claims it is eventually given up on
+            conn.execute('''
+                UPDATE outbox SET status = 'failed', attempts = attempts + 1,
+                                  last_error = 'delivery lease expired'
+                WHERE status = 'sending' AND claimed_at < ? AND attempts + 1 >= ?
+            ''', (lease_expired, self.max_attempts))
+            conn.execute('''
+                UPDATE outbox SET status = 'pending', attempts = attempts + 1,
+                                  last_error = 'delivery lease expired'
+                WHERE status = 'sending' AND claimed_at < ?
+            ''', (lease_expired,))
+            rows = conn.execute('''
+                SELECT id, recipient, subject, content, attempts
+                FROM outbox
+                WHERE status = 'pending' AND next_attempt_at <= ?
+                ORDER BY next_attempt_at
+                LIMIT ?
+            ''', (now.isoformat(), self.batch_size)).fetchall()
+            if rows:
+                conn.executemany(
+                    "UPDATE outbox SET status = 'sending', claimed_at = ? WHERE id = ?",
+                    [(now.isoformat(), row[0]) for row in rows])
+        return rows
+
+    def _build_message(self, recipient: str, subject: str, content: str) -> MIMEMultipart:
+        message = MIMEMultipart()
+        message['From'] = self.sender
+        message['To'] = recipient
+        message['Subject'] = subject or ''
+        message.attach(MIMEText(content or '', 'plain', 'utf-8'))
+        return message
+
+    def _deliver(self, row: Tuple) -> Tuple[int, Optional[str]]:
+        """Send one claimed row; returns (outbox_id, error or None)"""
+        outbox_id, recipient, subject, content, _ = row
+        self.rate_limiter.acquire()
+        try:
+            smtp = self.smtp_pool.acquire()
+        except (smtplib.SMTPException, OSError) as e:
+            return outbox_id, f"connect: {e}"
+        try:
+            smtp.sendmail(self.sender, [recipient], self._build_message(recipient, subject, content).as_string())
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException) as e:
+            # The server answered, so the connection itself is still usable
+            self.smtp_pool.release(smtp)
+            return outbox_id, str(e)
+        except (smtplib.SMTPException, OSError) as e:
+            self.smtp_pool.release(smtp, broken=True)
+            return outbox_id, str(e)
+        self.smtp_pool.release(smtp)
+        return outbox_id, None
+
+    def _record_results(self, rows: List[Tuple], results: Dict[int, Optional[str]]):
+        """Write the outcome of a batch back to the outbox in one transaction"""
+        now = datetime.now()
+        sent, retry, failed = [], [], []
+        for outbox_id, _, _, _, attempts in rows:
+            error = results.get(outbox_id, 'not attempted')
+            if error is None:
+                sent.append((now.isoformat(), outbox_id))
+            elif attempts + 1 >= self.max_attempts:
+                failed.append((error, outbox_id))
+            else:
+                delay = self.backoff_base * (2 ** attempts) * random.uniform(0.8, 1.2)
+                retry.append(((now + timedelta(seconds=delay)).isoformat(), error, outbox_id))
+
+        with self.db.transaction() as conn:
+            conn.executemany('''
+                UPDATE outbox SET status = 'sent', sent_date = ?, attempts = attempts + 1,
+                                  last_error = NULL
+                WHERE id = ?
+            ''', sent)
+            conn.executemany('''
+                UPDATE outbox SET status = 'pending', next_attempt_at = ?, last_error = ?,
+                                  attempts = attempts + 1
+                WHERE id = ?
+            ''', retry)
+            conn.executemany('''
+                UPDATE outbox SET status = 'failed', last_error = ?, attempts = attempts + 1
+                WHERE id = ?
+            ''', failed)
+        return {'sent': len(sent), 'retry': len(retry), 'failed': len(failed)}
+
+    def run_once(self) -> Dict[str, int]:
+        """Claim and deliver a single batch; returns counts by outcome"""
+        rows = self.claim_batch()
+        if not rows:
+            return {'sent': 0, 'retry': 0, 'failed': 0}
+
+        if self._executor is not None:
+            results = dict(self._executor.map(self._deliver, rows))
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = dict(executor.map(self._deliver, rows))
+
+        counts = self._record_results(rows, results)
+        logger.info(f"Outbox batch: {counts['sent']} sent, {counts['retry']} retrying, {counts['failed']} failed")
+        return counts
+
+    def drain(self) -> Dict[str, int]:
+        """Deliver batches until nothing is due"""
+        totals = {'sent': 0, 'retry': 0, 'failed': 0}
+        while True:
+            counts = self.run_once()
+            for key, value in counts.items():
+                totals[key] += value
+            if not any(counts.values()):
+                return totals
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                counts = self.run_once()
+            except Exception as e:
+                logger.error(f"Outbox worker error: {str(e)}")
+                counts = {}
+            if not any(counts.values()):
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def start(self):
+        """Start draining the outbox in a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='outbox')
+        self._thread = threading.Thread(target=self._run, name='outbox-worker', daemon=True)
+        self._thread.start()
+        logger.info("Outbox delivery worker started")
+
+    def wake(self):
+        """Skip the remaining poll interval, e.g. right after enqueueing messages"""
+        self._wake.set()
+
+    def stop(self, timeout: float = None):
+        """Finish the current batch, then stop the worker and close SMTP connections"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.smtp_pool.close_all()
+        logger.info("Outbox delivery worker stopped")
+
+
+def worker_from_env(db: DatabaseConnectionManager) -> OutboxDeliveryWorker:
+    """Build a worker from SMTP_* environment variables"""
+    pool = SMTPConnectionPool(
+        host=os.getenv('SMTP_HOST', 'localhost'),
+        port=int(os.getenv('SMTP_PORT', '25')),
+        username=os.getenv('SMTP_USERNAME'),
+        password=os.getenv('SMTP_PASSWORD'),
+        use_tls=os.getenv('SMTP_USE_TLS', '').lower() in ('1', 'true', 'yes'),
+        max_connections=int(os.getenv('SMTP_MAX_CONNECTIONS', '4'))
+    )
+    return OutboxDeliveryWorker(
+        db, pool,
+        sender=os.getenv('SMTP_FROM', 'your-email@domain.com'),
+        max_workers=pool.max_connections,
+        rate_per_second=float(os.getenv('SMTP_RATE_PER_SECOND', '10'))
+    )
+
+
+def main():
+    """Drain the outbox of the local workflow database once"""
+    print("📬 Outbox Delivery Worker")
+    print("=" * 50)
+
+    automation = FiverrWorkflowAutomation()
+    worker = worker_from_env(automation.db)
+    totals = worker.drain()
+    worker.smtp_pool.close_all()
+    automation.close()
+
+    print(f"Sent: {totals['sent']}")
+    print(f"Retrying later: {totals['retry']}")
+    print(f"Failed permanently: {totals['failed']}")
+
+if __name__ == "__main__":
+    main()
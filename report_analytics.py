@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Dataset Analytics for the Automated Report Generator
+Computes report findings from sample_data.json-style datasets with vectorized pandas aggregations
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Any, Tuple, Union
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DATASET_TABLES = ('kpi_metrics', 'revenue_data', 'customer_data')
+
+# Low-cardinality text columns are converted to categoricals so group-bys hash codes, not strings
+CATEGORY_COLUMNS = {
+    'revenue_data': ('ProductLine', 'Region', 'CustomerSegment', 'SalesChannel'),
+    'customer_data': ('CustomerSegment', 'ChurnRisk'),
+}
+
+DatasetSource = Union[str, Path, Dict[str, Any]]
+
+# Metrics and report fields computed from dataset files, keyed by (path, mtime)
+# so a batch sharing one dataset aggregates it once
+_ANALYSIS_CACHE: "OrderedDict[tuple, Tuple[Dict[str, Any], Dict[str, Any]]]" = OrderedDict()
+_ANALYSIS_CACHE_SIZE = 32
+# Reports are generated from thread pools; guards every read, write and eviction
+_ANALYSIS_LOCK = threading.Lock()
+
+
+def load_dataset(source: DatasetSource) -> Dict[str, pd.DataFrame]:
+    """Load a dataset (JSON file path or already-parsed dict) into one DataFrame per table"""
+    if isinstance(source, (str, Path)):
+        with open(source, 'r', encoding='utf-8') as f:
+            source = json.load(f)
+
+    frames = {}
+    for table in DATASET_TABLES:
+        data = source.get(table)
+        frame = data.copy() if isinstance(data, pd.DataFrame) else pd.DataFrame(data or [])
+        for column in CATEGORY_COLUMNS.get(table, ()):
+            if column in frame:
+                frame[column] = frame[column].astype('category')
+        frames[table] = frame
+
+    revenue = frames['revenue_data']
+    if not revenue.empty:
+        revenue['Date'] = pd.to_datetime(revenue['Date'])
+        if 'Cost' not in revenue:
+            revenue['Cost'] = revenue['Revenue'] - revenue.get('Profit', 0)
+        if 'Profit' not in revenue:
+            revenue['Profit'] = revenue['Revenue'] - revenue['Cost']
+    return frames
+
+
+def _breakdown(revenue: pd.DataFrame, column: str) -> pd.DataFrame:
+    """Revenue, profit, share of revenue and margin per value of ``column``, largest first"""
+    grouped = revenue.groupby(column, observed=True)[['Revenue', 'Profit']].sum()
+    total = grouped['Revenue'].sum()
+    grouped['Share'] = grouped['Revenue'] / total if total else 0.0
+    grouped['Margin'] = (grouped['Profit'] / grouped['Revenue']).replace([np.inf, -np.inf], np.nan).fillna(0.0)
+    return grouped.sort_values('Revenue', ascending=False)
+
+
+def compute_metrics(frames: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
+    """Aggregate a loaded dataset into plain Python metrics"""
+    revenue = frames['revenue_data']
+    customers = frames['customer_data']
+    metrics: Dict[str, Any] = {'revenue_rows': len(revenue), 'customer_rows': len(customers)}
+
+    if not revenue.empty:
+        totals = revenue[['Revenue', 'Cost', 'Profit']].sum()
+        metrics.update({
+            'total_revenue': float(totals['Revenue']),
+            'total_profit': float(totals['Profit']),
+            'margin': float(totals['Profit'] / totals['Revenue']) if totals['Revenue'] else 0.0,
+            'start_date': revenue['Date'].min(),
+            'end_date': revenue['Date'].max(),
+        })
+        for key, column in (('by_product_line', 'ProductLine'), ('by_region', 'Region'),
+                            ('by_segment', 'CustomerSegment'), ('by_channel', 'SalesChannel')):
+            if column in revenue:
+                metrics[key] = _breakdown(revenue, column)
+
+        monthly = revenue.groupby(revenue['Date'].dt.to_period('M'))['Revenue'].sum().sort_index()
+        growth = monthly.pct_change()
+        metrics['monthly_revenue'] = monthly
+        metrics['mom_growth'] = float(growth.iloc[-1]) if len(growth) > 1 else None
+        metrics['avg_mom_growth'] = float(growth.iloc[1:].mean()) if len(growth) > 1 else None
+        metrics['monthly_volatility'] = float(monthly.std() / monthly.mean()) if len(monthly) > 1 else None
+
+    if not customers.empty:
+        if 'ChurnRisk' in customers:
+            metrics['churn_mix'] = customers['ChurnRisk'].value_counts(normalize=True)
+            if 'LifetimeValue' in customers:
+                metrics['churn_ltv'] = customers.groupby('ChurnRisk', observed=True)['LifetimeValue'].mean()
+        if 'LifetimeValue' in customers:
+            metrics['avg_lifetime_value'] = float(customers['LifetimeValue'].mean())
+        if 'SatisfactionScore' in customers:
+            metrics['avg_satisfaction'] = float(customers['SatisfactionScore'].mean())
+
+    metrics['kpis'] = frames['kpi_metrics']
+    return metrics
+
+
+def _money(value: float) -> str:
+    return f"${value:,.0f}"
+
+
+def _percent(value: float, signed: bool = False) -> str:
+    return f"{value:+.1%}" if signed else f"{value:.1%}"
+
+
+def _kpi_value(value: Any, unit: str) -> str:
+    if unit == '$':
+        return _money(value)
+    if unit == '%':
+        return _percent(value)
+    return f"{value}{unit or ''}"
+
+
+def _breakdown_table(frame: pd.DataFrame, label: str) -> str:
+    # One line per group (a handful), never per data row
+    lines = [f"| {label} | Revenue | Share | Margin |", "|---|---:|---:|---:|"]
+    lines.extend(f"| {name} | {_money(row.Revenue)} | {_percent(row.Share)} | {_percent(row.Margin)} |"
+                 for name, row in zip(frame.index, frame.itertuples(index=False)))
+    return '\n'.join(lines)
+
+
+def _trend_analysis(metrics: Dict[str, Any]) -> str:
+    lines = ["", "**Revenue Trends:**",
+             f"- Total revenue: {_money(metrics['total_revenue'])} "
+             f"(profit {_money(metrics['total_profit'])}, margin {_percent(metrics['margin'])})"]
+    monthly = metrics['monthly_revenue']
+    if metrics['mom_growth'] is not None:
+        lines.append(f"- Month-over-month growth: {_percent(metrics['mom_growth'], signed=True)} "
+                     f"({monthly.index[-1].strftime('%b %Y')} vs {monthly.index[-2].strftime('%b %Y')})")
+        lines.append(f"- Average monthly growth: {_percent(metrics['avg_mom_growth'], signed=True)}")
+        lines.append(f"- Monthly variance: ±{_percent(metrics['monthly_volatility'])} from average")
+    lines.append(f"- Best month: {monthly.idxmax().strftime('%b %Y')} ({_money(monthly.max())})")
+
+    if 'avg_lifetime_value' in metrics:
+        lines += ["", "**Customer Trends:**", f"- Customers analysed: {metrics['customer_rows']:,}",
+                  f"- Average customer value: {_money(metrics['avg_lifetime_value'])}"]
+        if 'avg_satisfaction' in metrics:
+            lines.append(f"- Average satisfaction: {metrics['avg_satisfaction']:.1f} / 5")
+        if 'churn_mix' in metrics:
+            lines.append(f"- Customers at high churn risk: {_percent(metrics['churn_mix'].get('High', 0.0))}")
+    return '\n'.join(lines) + '\n'
+
+
+def _segmentation(metrics: Dict[str, Any]) -> str:
+    parts = [""]
+    for key, label in (('by_product_line', 'Product Line'), ('by_region', 'Region'),
+                       ('by_segment', 'Customer Segment'), ('by_channel', 'Sales Channel')):
+        if key in metrics:
+            parts += [f"**Revenue by {label}:**", _breakdown_table(metrics[key], label), ""]
+
+    if 'churn_mix' in metrics:
+        parts.append("**Churn Risk Mix:**")
+        ltv = metrics.get('churn_ltv', {})
+        for risk, share in metrics['churn_mix'].items():
+            value = f" (average lifetime value {_money(ltv[risk])})" if risk in ltv else ""
+            parts.append(f"- {risk} risk: {_percent(share)} of customers{value}")
+        parts.append("")
+    return '\n'.join(parts)
+
+
+def _kpi_definitions(kpis: pd.DataFrame) -> List[Dict[str, str]]:
+    return [{
+        'name': kpi['MetricName'],
+        'definition': f"{kpi.get('Category', '')} metric: {_kpi_value(kpi['CurrentValue'], kpi.get('Unit'))} "
+                      f"vs {_kpi_value(kpi['PreviousValue'], kpi.get('Unit'))} previously "
+                      f"({kpi.get('PerformanceStatus', 'n/a')})",
+        'target': _kpi_value(kpi['TargetValue'], kpi.get('Unit'))
+    } for kpi in kpis.to_dict('records')]
+
+
+def report_fields(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Map computed metrics to the client_data fields the report sections read"""
+    fields: Dict[str, Any] = {}
+    if not metrics['kpis'].empty:
+        fields['kpis'] = _kpi_definitions(metrics['kpis'])
+    if 'total_revenue' not in metrics:
+        return fields
+
+    fields.update({
+        'data_description': f"{metrics['revenue_rows']:,} revenue records and "
+                            f"{metrics['customer_rows']:,} customer records",
+        'record_count': f"{metrics['revenue_rows'] + metrics['customer_rows']:,} records",
+        'time_period': f"{metrics['start_date']:%B %d, %Y} - {metrics['end_date']:%B %d, %Y}",
+        'variables': 'Revenue, cost, profit, product line, region, customer segment, sales channel',
+        'key_metric': f"{_percent(metrics['margin'])} profit margin on {_money(metrics['total_revenue'])} revenue",
+        'trend_analysis': _trend_analysis(metrics),
+        'segmentation': _segmentation(metrics),
+    })
+
+    if 'by_product_line' in metrics and not metrics['by_product_line'].empty:
+        top = metrics['by_product_line'].iloc[0]
+        fields['key_insight_1'] = (f"{metrics['by_product_line'].index[0]} generates "
+                                   f"{_percent(top['Share'])} of revenue at a {_percent(top['Margin'])} margin")
+    if 'by_region' in metrics and not metrics['by_region'].empty:
+        weakest = metrics['by_region']['Margin'].idxmin()
+        fields['main_recommendation'] = (f"Improve margins in {weakest} "
+                                         f"({_percent(metrics['by_region'].loc[weakest, 'Margin'])})")
+    return fields
+
+
+def _analyse(source: DatasetSource) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """(metrics, report fields) for a dataset; results for files are cached until the file changes"""
+    if not isinstance(source, (str, Path)):
+        metrics = compute_metrics(load_dataset(source))
+        return metrics, report_fields(metrics)
+
+    path = Path(source).resolve()
+    key = (str(path), path.stat().st_mtime_ns)
+    with _ANALYSIS_LOCK:
+        analysis = _ANALYSIS_CACHE.get(key)
+        if analysis is not None:
+            _ANALYSIS_CACHE.move_to_end(key)
+            return analysis
+
+    # Computed outside the lock so one slow dataset does not serialise the others
+    metrics = compute_metrics(load_dataset(path))
+    analysis = (metrics, report_fields(metrics))
+    with _ANALYSIS_LOCK:
+        analysis = _ANALYSIS_CACHE.setdefault(key, analysis)
+        _ANALYSIS_CACHE.move_to_end(key)
+        while len(_ANALYSIS_CACHE) > _ANALYSIS_CACHE_SIZE:
+            _ANALYSIS_CACHE.popitem(last=False)
+    return analysis
+
+
+def dataset_metrics(source: DatasetSource) -> Dict[str, Any]:
+    """Computed metrics for a dataset (see compute_metrics)"""
+    return _analyse(source)[0]
+
+
+def dataset_report_fields(source: DatasetSource) -> Dict[str, Any]:
+    """Report fields for a dataset (see report_fields)"""
+    return _analyse(source)[1]
+
+
+def main():
+    """Print the data-driven report fields for a dataset (sample_data.json by default)"""
+    import sys
+    source = sys.argv[1] if len(sys.argv) > 1 else 'sample_data.json'
+    print(f"📈 Report Analytics: {source}")
+    print("=" * 50)
+    fields = dataset_report_fields(source)
+    for name in ('data_description', 'time_period', 'key_insight_1', 'key_metric', 'main_recommendation'):
+        if name in fields:
+            print(f"{name}: {fields[name]}")
+    print(fields.get('trend_analysis', ''))
+    print(fields.get('segmentation', ''))
+
+if __name__ == "__main__":
+    main()
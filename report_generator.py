@@ -5,19 +5,177 @@ Generates professional reports using templates and client data
 """
 
 import os
+import re
+import argparse
 import json
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, Iterable, Iterator, Tuple, TextIO, Union
 import logging
 
+import report_html
+
+try:
+    import report_analytics
+except ImportError:  # data-driven sections need pandas/numpy
+    report_analytics = None
+
 logger = logging.getLogger(__name__)
 
+# A section renderer turns client data into one Markdown section, either as a
+# string or as a generator of chunks for sections that can grow large
+SectionRenderer = Callable[[Dict[str, Any]], Union[str, Iterable[str]]]
+
+_MISSING = object()
+_DIGEST_ENCODER = json.JSONEncoder(sort_keys=True, default=str, ensure_ascii=False)
+
+
+class _KeyRecorder:
+    """Read-only view of client data that records every key a renderer looks at"""
+    __slots__ = ('data', 'keys')
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self.keys = set()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self.keys.add(key)
+        return self.data.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        self.keys.add(key)
+        return self.data[key]
+
+    def __contains__(self, key: str) -> bool:
+        self.keys.add(key)
+        return key in self.data
+
+
+class SectionCache:
+    """LRU cache of rendered report sections, optionally persisted to a JSON file.
+
+    Entries are keyed by report type, section name and a hash of the values of
+    exactly the ``client_data`` keys the section read when it was rendered
+    (plus today's date, which headers and footers print). Because renderers are
+    deterministic in the keys they read, a later report whose values match on
+    those keys gets the identical section without rendering it again.
+    Delete the persisted file after changing the section renderers.
+    """
+
+    def __init__(self, max_entries: int = 1024, path: str = None):
+        self.max_entries = max_entries
+        self.path = Path(path) if path else None
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        # Distinct key sets each section has been seen to read
+        self._key_sets: Dict[Tuple[str, str], List[Tuple[str, ...]]] = {}
+        self._lock = threading.Lock()
+        if self.path and self.path.exists():
+            self.load()
+
+    @staticmethod
+    def _digest(keys: Tuple[str, ...], client_data: Dict[str, Any]) -> str:
+        values = [datetime.now().strftime('%Y-%m-%d')]
+        for key in keys:
+            value = client_data.get(key, _MISSING)
+            values.append([key, False] if value is _MISSING else [key, True, value])
+        # Hash the JSON encoding piece by piece so large lists are never serialised whole
+        digest = hashlib.sha256()
+        for piece in _DIGEST_ENCODER.iterencode(values):
+            digest.update(piece.encode('utf-8'))
+        return digest.hexdigest()
+
+    def lookup(self, report_type: str, section: str, client_data: Dict[str, Any]) -> Optional[str]:
+        """Return the cached section for this data, or None"""
+        with self._lock:
+            for keys in self._key_sets.get((report_type, section), ()):
+                entry_key = (report_type, section, self._digest(keys, client_data))
+                text = self._entries.get(entry_key)
+                if text is not None:
+                    self._entries.move_to_end(entry_key)
+                    self.hits += 1
+                    return text
+            self.misses += 1
+            return None
+
+    def store(self, report_type: str, section: str, keys: Iterable[str],
+              client_data: Dict[str, Any], text: str):
+        """Cache a freshly rendered section under the keys it read"""
+        if self.max_entries <= 0:
+            return
+        keys = tuple(sorted(keys))
+        with self._lock:
+            known = self._key_sets.setdefault((report_type, section), [])
+            if keys not in known:
+                known.append(keys)
+            entry_key = (report_type, section, self._digest(keys, client_data))
+            self._entries[entry_key] = text
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, report_type: str = None):
+        """Drop cached sections of one report type, or everything"""
+        with self._lock:
+            if report_type is None:
+                self._entries.clear()
+                self._key_sets.clear()
+                return
+            for key in [key for key in self._entries if key[0] == report_type]:
+                del self._entries[key]
+            for key in [key for key in self._key_sets if key[0] == report_type]:
+                del self._key_sets[key]
+
+    def load(self):
+        """Load entries from ``path``; a missing or corrupt file leaves the cache empty"""
+        if self.max_entries <= 0:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable section cache {self.path}: {e}")
+            return
+        with self._lock:
+            for report_type, section, keys in data.get('key_sets', []):
+                self._key_sets.setdefault((report_type, section), []).append(tuple(keys))
+            for report_type, section, digest, text in data.get('entries', [])[-self.max_entries:]:
+                self._entries[(report_type, section, digest)] = text
+
+    def save(self):
+        """Write the cache to ``path`` atomically (no-op without a path)"""
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                'key_sets': [[report_type, section, list(keys)]
+                             for (report_type, section), key_sets in self._key_sets.items()
+                             for keys in key_sets],
+                'entries': [[*key, text] for key, text in self._entries.items()]
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
 class ReportGenerator:
-    def __init__(self, templates_dir: str = "customized_templates"):
+    # Streamed sections larger than this are not kept in the section cache
+    MAX_CACHED_SECTION_CHARS = 64 * 1024
+    
+    def __init__(self, templates_dir: str = "customized_templates", cache_size: int = 256,
+                 cache_path: str = None, output_dir: str = "generated_reports"):
         self.templates_dir = Path(templates_dir)
-        self.output_dir = Path("generated_reports")
-        self.output_dir.mkdir(exist_ok=True)
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
         
         # Report templates for different service types
         self.report_templates = {
@@ -70,10 +228,193 @@ class ReportGenerator:
                 'default_length': '25-40 pages'
             }
         }
+        
+        # Rendered sections are reused across reports that share the inputs
+        # those sections read; cache_size=0 disables caching
+        self.section_cache = SectionCache(cache_size, cache_path)
+        
+        # Section renderers per report type, resolved once at registration so
+        # generate_report is a single dict lookup followed by one call per section
+        self._layouts: Dict[str, List[Tuple[str, SectionRenderer]]] = {}
+        self._register_builtin_report_types()
+    
+    def _register_builtin_report_types(self):
+        """Register the renderers for the report types declared in report_templates"""
+        self.register_report_type('market_research', {
+            'header': self._market_research_header,
+            'executive_summary': self._market_research_executive_summary,
+            'methodology': self._market_research_methodology,
+            'market_overview': self._market_research_market_overview,
+            'competitive_analysis': self._market_research_competitive_analysis,
+            'consumer_insights': self._market_research_consumer_insights,
+            'recommendations': self._market_research_recommendations,
+            'appendix': self._market_research_appendix,
+            'footer': self._market_research_footer
+        })
+        self.register_report_type('data_analysis', {
+            'header': self._data_analysis_header,
+            'executive_summary': self._data_analysis_executive_summary,
+            'data_overview': self._data_analysis_data_overview,
+            'analysis_methodology': self._data_analysis_methodology,
+            'key_findings': self._data_analysis_key_findings,
+            'statistical_analysis': self._data_analysis_statistical_analysis,
+            'insights_and_trends': self._data_analysis_insights,
+            'recommendations': self._data_analysis_recommendations,
+            'technical_appendix': self._data_analysis_technical_appendix,
+            'footer': self._data_analysis_footer
+        })
+        self.register_report_type('bi_dashboard', {
+            'header': self._bi_dashboard_header,
+            'dashboard_overview': self._bi_dashboard_overview,
+            'kpi_definitions': self._bi_dashboard_kpi_definitions,
+            'data_sources': self._bi_dashboard_data_sources,
+            'visualization_guide': self._bi_dashboard_visualization_guide,
+            'user_manual': self._bi_dashboard_user_manual,
+            'maintenance_guide': self._bi_dashboard_maintenance_guide,
+            'footer': self._contact_footer
+        })
+        self.register_report_type('strategic_consulting', {
+            'header': self._strategic_consulting_header,
+            'executive_summary': self._strategic_consulting_executive_summary,
+            'current_state_assessment': self._strategic_consulting_current_state,
+            'strategic_analysis': self._strategic_consulting_analysis,
+            'recommendations': self._strategic_consulting_recommendations,
+            'implementation_roadmap': self._strategic_consulting_roadmap,
+            'risk_assessment': self._strategic_consulting_risk_assessment,
+            'success_metrics': self._strategic_consulting_success_metrics,
+            'footer': self._contact_footer
+        })
+    
+    def register_report_type(self, report_type: str, renderers: Dict[str, SectionRenderer],
+                             sections: List[str] = None, default_length: str = None):
+        """Register (or replace) a report type and its section renderers.
+
+        ``sections`` defaults to the layout declared in ``report_templates``.
+        Every section needs a renderer; optional ``header`` and ``footer``
+        renderers frame the report.
+        """
+        declared = self.report_templates.get(report_type, {})
+        sections = list(sections or declared.get('sections', []))
+        missing = [name for name in sections if name not in renderers]
+        if missing:
+            raise ValueError(f"Report type {report_type} has no renderer for sections: {', '.join(missing)}")
+
+        self.report_templates[report_type] = {
+            'sections': sections,
+            'default_length': default_length or declared.get('default_length')
+        }
+        layout = [name for name in ('header',) if name in renderers] + sections
+        layout += [name for name in ('footer',) if name in renderers]
+        if report_type in self._layouts:
+            # Sections rendered by the replaced renderers are stale
+            self.section_cache.invalidate(report_type)
+        self._layouts[report_type] = [(name, renderers[name]) for name in layout]
+    
+    def _layout(self, report_type: str) -> List[Tuple[str, SectionRenderer]]:
+        try:
+            return self._layouts[report_type]
+        except KeyError:
+            raise ValueError(f"Unsupported report type: {report_type}") from None
+    
+    def report_sections(self, report_type: str) -> List[str]:
+        """Section names in render order, including header and footer"""
+        return [name for name, _ in self._layout(report_type)]
+    
+    def apply_dataset(self, client_data: Dict[str, Any], dataset: Any = None) -> Dict[str, Any]:
+        """Fill client_data fields from a sample_data.json-style dataset.
+        
+        ``dataset`` (or ``client_data['dataset']``) is a path or dict with
+        ``kpi_metrics``, ``revenue_data`` and ``customer_data``. Key findings,
+        performance trends, segmentation and KPI definitions are computed from
+        it; values set explicitly in client_data take precedence.
+        """
+        dataset = client_data.get('dataset') if dataset is None else dataset
+        if dataset is None:
+            return client_data
+        if report_analytics is None:
+            raise RuntimeError("Data-driven reports require pandas and numpy (pip install pandas)")
+        fields = dict(report_analytics.dataset_report_fields(dataset))
+        fields.update((key, value) for key, value in client_data.items() if key != 'dataset')
+        return fields
+    
+    def render_section(self, report_type: str, section: str, client_data: Dict[str, Any]) -> str:
+        """Render a single section of a report"""
+        client_data = self.apply_dataset(client_data)
+        for name, renderer in self._layout(report_type):
+            if name == section:
+                return self._render_cached(report_type, name, renderer, client_data)
+        raise ValueError(f"Report type {report_type} has no section {section}")
+    
+    def iter_sections(self, report_type: str, client_data: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+        """Yield (section name, Markdown) pairs in report order"""
+        client_data = self.apply_dataset(client_data)
+        for name, renderer in self._layout(report_type):
+            yield name, self._render_cached(report_type, name, renderer, client_data)
+    
+    def iter_chunks(self, report_type: str, client_data: Dict[str, Any]) -> Iterator[str]:
+        """Yield the report as Markdown text chunks, section by section.
+        
+        Generator sections are passed through chunk by chunk, so the full
+        document is never held in memory and the first chunk is available
+        before the rest of the report is rendered.
+        """
+        layout = self._layout(report_type)
+        client_data = self.apply_dataset(client_data)
+        for name, renderer in layout:
+            yield from self._iter_section_chunks(report_type, name, renderer, client_data)
+    
+    def _render_cached(self, report_type: str, section: str, renderer: SectionRenderer,
+                       client_data: Dict[str, Any]) -> str:
+        return ''.join(self._iter_section_chunks(report_type, section, renderer, client_data))
+    
+    def _iter_section_chunks(self, report_type: str, section: str, renderer: SectionRenderer,
+                             client_data: Dict[str, Any]) -> Iterator[str]:
+        text = self.section_cache.lookup(report_type, section, client_data)
+        if text is not None:
+            yield text
+            return
+        
+        recorder = _KeyRecorder(client_data)
+        result = renderer(recorder)
+        if isinstance(result, str):
+            self.section_cache.store(report_type, section, recorder.keys, client_data, result)
+            yield result
+            return
+        
+        # Stream the chunks, keeping a copy only while the section stays small
+        buffered: Optional[List[str]] = []
+        size = 0
+        for chunk in result:
+            yield chunk
+            if buffered is not None:
+                size += len(chunk)
+                if size > self.MAX_CACHED_SECTION_CHARS:
+                    buffered = None
+                else:
+                    buffered.append(chunk)
+        if buffered is not None:
+            self.section_cache.store(report_type, section, recorder.keys, client_data, ''.join(buffered))
     
     def generate_market_research_report(self, client_data: Dict[str, Any]) -> str:
         """Generate a market research report"""
-        report_content = f"""# {client_data.get('industry', 'Industry')} Market Research Report
+        return self.generate_report('market_research', client_data)
+    
+    def generate_data_analysis_report(self, client_data: Dict[str, Any]) -> str:
+        """Generate a data analysis report"""
+        return self.generate_report('data_analysis', client_data)
+    
+    def generate_bi_dashboard_report(self, client_data: Dict[str, Any]) -> str:
+        """Generate BI dashboard documentation"""
+        return self.generate_report('bi_dashboard', client_data)
+    
+    def generate_strategic_consulting_report(self, client_data: Dict[str, Any]) -> str:
+        """Generate a strategic consulting report"""
+        return self.generate_report('strategic_consulting', client_data)
+    
+    # Market research sections
+    
+    def _market_research_header(self, client_data: Dict[str, Any]) -> str:
+        return f"""# {client_data.get('industry', 'Industry')} Market Research Report
 
 **Prepared for:** {client_data.get('client_name', 'Client Name')}  
 **Prepared by:** {client_data.get('analyst_name', 'Data Analytics Expert')}  
@@ -82,7 +423,10 @@ class ReportGenerator:
 
 ---
 
-## Executive Summary
+"""
+    
+    def _market_research_executive_summary(self, client_data: Dict[str, Any]) -> str:
+        return f"""## Executive Summary
 
 This comprehensive market research report provides strategic insights into the {client_data.get('industry', 'target industry')} market, including competitive landscape analysis, consumer behavior patterns, and growth opportunities.
 
@@ -99,7 +443,10 @@ This comprehensive market research report provides strategic insights into the {
 
 ---
 
-## Methodology
+"""
+    
+    def _market_research_methodology(self, client_data: Dict[str, Any]) -> str:
+        return """## Methodology
 
 Our research methodology combines primary and secondary research approaches:
 
@@ -118,7 +465,10 @@ Our research methodology combines primary and secondary research approaches:
 
 ---
 
-## Market Overview
+"""
+    
+    def _market_research_market_overview(self, client_data: Dict[str, Any]) -> str:
+        return f"""## Market Overview
 
 ### Market Size and Growth
 The {client_data.get('industry', 'target industry')} market is valued at approximately {client_data.get('market_size', '$X.X billion')} and is expected to grow at a CAGR of {client_data.get('growth_rate', 'X.X%')} over the next five years.
@@ -136,10 +486,15 @@ The {client_data.get('industry', 'target industry')} market is valued at approxi
 
 ---
 
-## Competitive Analysis
+"""
+    
+    def _market_research_competitive_analysis(self, client_data: Dict[str, Any]) -> Iterator[str]:
+        yield """## Competitive Analysis
 
 ### Market Leaders:
-{self._generate_competitor_analysis(client_data.get('competitors', []))}
+"""
+        yield from self._iter_competitor_analysis(client_data.get('competitors', []))
+        yield f"""
 
 ### Competitive Landscape:
 - **Market concentration:** {client_data.get('concentration', 'Moderately concentrated')}
@@ -148,7 +503,10 @@ The {client_data.get('industry', 'target industry')} market is valued at approxi
 
 ---
 
-## Consumer Insights
+"""
+    
+    def _market_research_consumer_insights(self, client_data: Dict[str, Any]) -> str:
+        return f"""## Consumer Insights
 
 ### Target Demographics:
 - **Primary segment:** {client_data.get('primary_segment', 'Adults 25-45')}
@@ -162,7 +520,10 @@ The {client_data.get('industry', 'target industry')} market is valued at approxi
 
 ---
 
-## Strategic Recommendations
+"""
+    
+    def _market_research_recommendations(self, client_data: Dict[str, Any]) -> str:
+        return f"""## Strategic Recommendations
 
 ### 1. Market Entry Strategy
 {client_data.get('detailed_entry_strategy', '''
@@ -245,7 +606,10 @@ The {client_data.get('industry', 'target industry')} market is valued at approxi
 
 ---
 
-## Appendix
+"""
+    
+    def _market_research_appendix(self, client_data: Dict[str, Any]) -> str:
+        return """## Appendix
 
 ### Data Sources and References
 - Industry Research Reports
@@ -262,7 +626,10 @@ The {client_data.get('industry', 'target industry')} market is valued at approxi
 
 ---
 
-**Disclaimer:** This report is based on available information and analysis as of {datetime.now().strftime('%B %Y')}. Market conditions may change, and recommendations should be evaluated in the context of current business environment.
+"""
+    
+    def _market_research_footer(self, client_data: Dict[str, Any]) -> str:
+        return f"""**Disclaimer:** This report is based on available information and analysis as of {datetime.now().strftime('%B %Y')}. Market conditions may change, and recommendations should be evaluated in the context of current business environment.
 
 **Contact Information:**  
 For questions or additional analysis, please contact:  
@@ -270,11 +637,11 @@ For questions or additional analysis, please contact:
 {client_data.get('analyst_email', 'your-email@domain.com')}  
 {client_data.get('analyst_phone', '+1-XXX-XXX-XXXX')}
 """
-        return report_content
     
-    def generate_data_analysis_report(self, client_data: Dict[str, Any]) -> str:
-        """Generate a data analysis report"""
-        report_content = f"""# Data Analysis Report: {client_data.get('analysis_title', 'Business Performance Analysis')}
+    # Data analysis sections
+    
+    def _data_analysis_header(self, client_data: Dict[str, Any]) -> str:
+        return f"""# Data Analysis Report: {client_data.get('analysis_title', 'Business Performance Analysis')}
 
 **Client:** {client_data.get('client_name', 'Client Name')}  
 **Analyst:** {client_data.get('analyst_name', 'Data Analytics Expert')}  
@@ -283,7 +650,10 @@ For questions or additional analysis, please contact:
 
 ---
 
-## Executive Summary
+"""
+    
+    def _data_analysis_executive_summary(self, client_data: Dict[str, Any]) -> str:
+        return f"""## Executive Summary
 
 This data analysis report examines {client_data.get('data_description', 'business performance data')} to identify trends, patterns, and opportunities for improvement.
 
@@ -294,7 +664,10 @@ This data analysis report examines {client_data.get('data_description', 'busines
 
 ---
 
-## Data Overview
+"""
+    
+    def _data_analysis_data_overview(self, client_data: Dict[str, Any]) -> str:
+        return f"""## Data Overview
 
 ### Dataset Description:
 - **Data Source:** {client_data.get('data_source', 'Client business systems')}
@@ -309,7 +682,10 @@ This data analysis report examines {client_data.get('data_description', 'busines
 
 ---
 
-## Analysis Methodology
+"""
+    
+    def _data_analysis_methodology(self, client_data: Dict[str, Any]) -> str:
+        return """## Analysis Methodology
 
 ### Statistical Techniques Used:
 - Descriptive statistics
@@ -326,7 +702,10 @@ This data analysis report examines {client_data.get('data_description', 'busines
 
 ---
 
-## Key Findings
+"""
+    
+    def _data_analysis_key_findings(self, client_data: Dict[str, Any]) -> str:
+        return f"""## Key Findings
 
 ### 1. Performance Trends
 {client_data.get('trend_analysis', '''
@@ -354,7 +733,10 @@ This data analysis report examines {client_data.get('data_description', 'busines
 - Growth opportunities: Categories 1, 2, 3
 ''')}
 
-### 3. Statistical Insights
+"""
+    
+    def _data_analysis_statistical_analysis(self, client_data: Dict[str, Any]) -> str:
+        return f"""### 3. Statistical Insights
 {client_data.get('statistical_insights', '''
 **Correlation Analysis:**
 - Strong positive correlation between marketing spend and revenue (r=0.XX)
@@ -369,14 +751,20 @@ This data analysis report examines {client_data.get('data_description', 'busines
 
 ---
 
-## Insights and Recommendations
+"""
+    
+    def _data_analysis_insights(self, client_data: Dict[str, Any]) -> str:
+        return f"""## Insights and Recommendations
 
 ### Strategic Insights:
 1. **Opportunity Area 1:** {client_data.get('opportunity_1', 'Customer retention improvement')}
 2. **Opportunity Area 2:** {client_data.get('opportunity_2', 'Product mix optimization')}
 3. **Opportunity Area 3:** {client_data.get('opportunity_3', 'Market expansion potential')}
 
-### Actionable Recommendations:
+"""
+    
+    def _data_analysis_recommendations(self, client_data: Dict[str, Any]) -> str:
+        return f"""### Actionable Recommendations:
 
 #### Immediate Actions (0-30 days):
 - {client_data.get('immediate_1', 'Implement customer feedback system')}
@@ -429,7 +817,10 @@ This data analysis report examines {client_data.get('data_description', 'busines
 
 ---
 
-## Technical Appendix
+"""
+    
+    def _data_analysis_technical_appendix(self, client_data: Dict[str, Any]) -> str:
+        return """## Technical Appendix
 
 ### Data Processing Steps:
 1. Data extraction and cleaning
@@ -446,23 +837,304 @@ This data analysis report examines {client_data.get('data_description', 'busines
 
 ---
 
-**Next Steps:**
+"""
+    
+    def _data_analysis_footer(self, client_data: Dict[str, Any]) -> str:
+        return f"""**Next Steps:**
 1. Review findings with stakeholders
 2. Prioritize recommendations
 3. Develop implementation timeline
 4. Set up monitoring systems
 
-**Contact for Follow-up:**  
+{self._contact_footer(client_data)}"""
+    
+    # BI dashboard sections
+    
+    def _bi_dashboard_header(self, client_data: Dict[str, Any]) -> str:
+        return f"""# {client_data.get('dashboard_name', 'Business Intelligence Dashboard')} Documentation
+
+**Client:** {client_data.get('client_name', 'Client Name')}  
+**Prepared by:** {client_data.get('analyst_name', 'Data Analytics Expert')}  
+**Platform:** {client_data.get('platform', 'Power BI')}  
+**Date:** {datetime.now().strftime('%B %d, %Y')}  
+
+---
+
+"""
+    
+    def _bi_dashboard_overview(self, client_data: Dict[str, Any]) -> str:
+        return f"""## Dashboard Overview
+
+This dashboard gives {client_data.get('audience', 'executives and team leads')} a single view of {client_data.get('business_area', 'business performance')}, refreshed {client_data.get('refresh_frequency', 'daily')}.
+
+### Dashboard Pages:
+{client_data.get('dashboard_pages', '''
+- **Executive Summary:** Headline KPIs and period-over-period change
+- **Revenue Analysis:** Revenue by product line, region and channel
+- **Customer Insights:** Segments, retention and lifetime value
+- **Operations:** Fulfilment, costs and efficiency metrics
+''')}
+
+### Business Questions Answered:
+- {client_data.get('question_1', 'How are we performing against target this period?')}
+- {client_data.get('question_2', 'Which products, regions and segments drive growth?')}
+- {client_data.get('question_3', 'Where should we focus to improve margins?')}
+
+---
+
+"""
+    
+    def _bi_dashboard_kpi_definitions(self, client_data: Dict[str, Any]) -> Iterator[str]:
+        yield "## KPI Definitions\n\n"
+        yield from self._iter_kpi_definitions(client_data.get('kpis', []))
+        yield "\n---\n\n"
+    
+    def _bi_dashboard_data_sources(self, client_data: Dict[str, Any]) -> str:
+        return f"""## Data Sources
+
+### Connected Sources:
+{client_data.get('data_sources', '''
+- **Sales system:** Orders, revenue and product data
+- **CRM:** Customer profiles, segments and activity
+- **Finance system:** Costs, budgets and targets
+''')}
+
+### Data Model:
+- **Fact tables:** {client_data.get('fact_tables', 'Sales transactions, customer activity')}
+- **Dimension tables:** {client_data.get('dimension_tables', 'Date, product, region, customer')}
+- **Refresh schedule:** {client_data.get('refresh_frequency', 'daily')} at {client_data.get('refresh_time', '06:00')}
+
+---
+
+"""
+    
+    def _bi_dashboard_visualization_guide(self, client_data: Dict[str, Any]) -> str:
+        return """## Visualization Guide
+
+### Reading the Visuals:
+- **KPI cards:** Current value with change versus the previous period
+- **Trend lines:** Monthly values; hover for exact figures
+- **Bar charts:** Ranked comparisons across categories
+- **Maps:** Regional performance, shaded by value
+
+### Colour Conventions:
+- Green: on or above target
+- Amber: within 10% of target
+- Red: more than 10% below target
+
+---
+
+"""
+    
+    def _bi_dashboard_user_manual(self, client_data: Dict[str, Any]) -> str:
+        return f"""## User Manual
+
+### Accessing the Dashboard:
+1. Open {client_data.get('dashboard_url', 'the shared dashboard link')}
+2. Sign in with your organisation account
+3. Select a page from the navigation pane
+
+### Filtering and Drill-down:
+- Use the slicers at the top of each page to filter by date, region and product
+- Click any chart element to cross-filter the page
+- Right-click a data point and choose **Drill through** for detail pages
+
+### Exporting:
+- Export visuals to Excel or CSV from the visual's **More options** menu
+- Subscribe to email snapshots for scheduled delivery
+
+---
+
+"""
+    
+    def _bi_dashboard_maintenance_guide(self, client_data: Dict[str, Any]) -> str:
+        return f"""## Maintenance Guide
+
+### Routine Tasks:
+- Monitor scheduled refresh status and failure notifications
+- Review row-level security roles when team members change
+- Archive unused reports and visuals quarterly
+
+### Troubleshooting:
+- **Refresh failed:** Check data source credentials and gateway status
+- **Slow visuals:** Reduce visual count per page and review DAX measures
+- **Unexpected numbers:** Verify filters and the latest refresh time
+
+### Support:
+{client_data.get('support_terms', 'Includes 30 days of post-delivery support for fixes and minor adjustments.')}
+
+---
+
+"""
+    
+    # Strategic consulting sections
+    
+    def _strategic_consulting_header(self, client_data: Dict[str, Any]) -> str:
+        return f"""# Strategic Consulting Report: {client_data.get('engagement_title', 'Growth Strategy Review')}
+
+**Prepared for:** {client_data.get('client_name', 'Client Name')}  
+**Prepared by:** {client_data.get('analyst_name', 'Data Analytics Expert')}  
+**Date:** {datetime.now().strftime('%B %d, %Y')}  
+**Engagement Type:** {client_data.get('package_type', 'Standard')} Strategic Consulting Package
+
+---
+
+"""
+    
+    def _strategic_consulting_executive_summary(self, client_data: Dict[str, Any]) -> str:
+        return f"""## Executive Summary
+
+This report assesses {client_data.get('client_name', 'the client')}'s current position in the {client_data.get('industry', 'target industry')} market and sets out a prioritised strategy to {client_data.get('strategic_goal', 'accelerate sustainable growth')}.
+
+### Key Conclusions:
+- **Current position:** {client_data.get('current_position', 'Solid core business with untapped growth potential')}
+- **Main opportunity:** {client_data.get('main_opportunity', 'Expansion into adjacent customer segments')}
+- **Critical gap:** {client_data.get('critical_gap', 'Limited data-driven decision making')}
+
+### Priority Recommendations:
+1. {client_data.get('priority_1', 'Focus investment on the highest-margin segments')}
+2. {client_data.get('priority_2', 'Build an analytics capability to track performance')}
+3. {client_data.get('priority_3', 'Streamline operations to fund growth initiatives')}
+
+---
+
+"""
+    
+    def _strategic_consulting_current_state(self, client_data: Dict[str, Any]) -> str:
+        return f"""## Current State Assessment
+
+### Business Performance:
+- **Revenue:** {client_data.get('current_revenue', '$X.X million')}
+- **Growth:** {client_data.get('current_growth', 'X% year-over-year')}
+- **Profitability:** {client_data.get('current_margin', 'X% operating margin')}
+
+### Strengths:
+- {client_data.get('strength_1', 'Loyal customer base')}
+- {client_data.get('strength_2', 'Strong product quality')}
+- {client_data.get('strength_3', 'Experienced leadership team')}
+
+### Weaknesses:
+- {client_data.get('weakness_1', 'Limited digital presence')}
+- {client_data.get('weakness_2', 'Manual reporting processes')}
+- {client_data.get('weakness_3', 'Concentration in a few key accounts')}
+
+---
+
+"""
+    
+    def _strategic_consulting_analysis(self, client_data: Dict[str, Any]) -> Iterator[str]:
+        yield f"""## Strategic Analysis
+
+### Market Position:
+{client_data.get('market_position', '''
+The company competes in a growing but fragmented market. Competitors are
+differentiating on service and technology, while price competition is
+increasing in the lower tiers.
+''')}
+
+### Strategic Options:
+{client_data.get('strategic_options', '''
+- **Option A - Deepen:** Grow share with existing customers through upselling
+- **Option B - Extend:** Enter adjacent segments with the current offering
+- **Option C - Transform:** Launch a digital channel and new service lines
+''')}
+
+### Competitive Landscape:
+"""
+        yield from self._iter_competitor_analysis(client_data.get('competitors', []))
+        yield "\n---\n\n"
+    
+    def _strategic_consulting_recommendations(self, client_data: Dict[str, Any]) -> str:
+        return f"""## Recommendations
+
+{client_data.get('detailed_recommendations', '''
+### 1. Focus the Portfolio
+Concentrate sales and marketing on the segments with the highest margin
+and growth potential.
+
+### 2. Build Analytics Capability
+Introduce a KPI dashboard and monthly performance reviews so decisions are
+based on current data.
+
+### 3. Improve Operational Efficiency
+Automate manual processes to free capacity and reduce cost-to-serve.
+''')}
+
+---
+
+"""
+    
+    def _strategic_consulting_roadmap(self, client_data: Dict[str, Any]) -> str:
+        return """## Implementation Roadmap
+
+### Phase 1: Mobilise (0-3 months):
+- [ ] Agree strategic priorities with leadership
+- [ ] Assign owners and budgets for each initiative
+- [ ] Establish baseline KPIs
+
+### Phase 2: Execute (3-9 months):
+- [ ] Launch priority initiatives
+- [ ] Roll out reporting and performance reviews
+- [ ] Track progress against milestones
+
+### Phase 3: Scale (9-18 months):
+- [ ] Expand successful initiatives
+- [ ] Reallocate resources from underperforming areas
+- [ ] Refresh strategy based on results
+
+---
+
+"""
+    
+    def _strategic_consulting_risk_assessment(self, client_data: Dict[str, Any]) -> str:
+        return f"""## Risk Assessment
+
+### Key Risks:
+- **Execution capacity:** {client_data.get('execution_risk', 'Medium risk - Initiatives compete with day-to-day operations')}
+- **Market response:** {client_data.get('market_risk', 'Medium risk - Competitors may respond on price')}
+- **Investment return:** {client_data.get('investment_risk', 'Low risk - Phased investment limits exposure')}
+
+### Mitigation Strategies:
+- Stage investments behind clear milestones
+- Review progress monthly with leadership
+- Keep a pipeline of fallback initiatives
+
+---
+
+"""
+    
+    def _strategic_consulting_success_metrics(self, client_data: Dict[str, Any]) -> str:
+        return f"""## Success Metrics
+
+### Key Performance Indicators:
+- **Revenue Growth:** {client_data.get('target_growth', 'Target +X% year-over-year')}
+- **Margin:** {client_data.get('target_margin', 'Target X% operating margin')}
+- **Customer Retention:** {client_data.get('target_retention', 'Target X% retention rate')}
+
+### Review Cadence:
+- Monthly KPI reviews
+- Quarterly strategy checkpoints
+- Annual strategy refresh
+
+---
+
+"""
+    
+    def _contact_footer(self, client_data: Dict[str, Any]) -> str:
+        return f"""**Contact for Follow-up:**  
 {client_data.get('analyst_name', 'Your Name')}  
 {client_data.get('analyst_email', 'your-email@domain.com')}  
 {client_data.get('analyst_phone', '+1-XXX-XXX-XXXX')}
 """
-        return report_content
     
     def _generate_competitor_analysis(self, competitors: List[Dict[str, Any]]) -> str:
         """Generate competitor analysis section"""
+        return ''.join(self._iter_competitor_analysis(competitors))
+    
+    def _iter_competitor_analysis(self, competitors: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """Yield the competitor analysis one competitor at a time"""
         if not competitors:
-            return """
+            yield """
 **Competitor 1:** Market Leader Inc.
 - Market share: 25%
 - Strengths: Brand recognition, distribution network
@@ -478,31 +1150,75 @@ This data analysis report examines {client_data.get('data_description', 'busines
 - Strengths: Cost leadership, operational efficiency
 - Weaknesses: Limited differentiation, quality concerns
 """
-        
-        analysis = ""
+            return
+
         for i, competitor in enumerate(competitors, 1):
-            analysis += f"""
+            yield f"""
 **Competitor {i}:** {competitor.get('name', f'Competitor {i}')}
 - Market share: {competitor.get('market_share', 'X%')}
 - Strengths: {competitor.get('strengths', 'Strong market position')}
 - Weaknesses: {competitor.get('weaknesses', 'Limited innovation')}
 """
-        return analysis
+    
+    def _iter_kpi_definitions(self, kpis: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """Yield the KPI definition table for dashboard documentation row by row"""
+        if not kpis:
+            kpis = [
+                {'name': 'Total Revenue', 'definition': 'Sum of invoiced sales', 'target': 'Monthly budget'},
+                {'name': 'Profit Margin', 'definition': 'Profit divided by revenue', 'target': '25%'},
+                {'name': 'Customer Retention', 'definition': 'Share of customers active in both periods', 'target': '90%'},
+                {'name': 'Average Order Value', 'definition': 'Revenue divided by order count', 'target': 'Prior period +5%'}
+            ]
+
+        yield "| KPI | Definition | Target |\n|-----|------------|--------|\n"
+        for kpi in kpis:
+            yield f"| {kpi.get('name', 'KPI')} | {kpi.get('definition', '-')} | {kpi.get('target', '-')} |\n"
     
     def generate_report(self, report_type: str, client_data: Dict[str, Any]) -> str:
         """Generate a report based on type and client data"""
-        if report_type == 'market_research':
-            return self.generate_market_research_report(client_data)
-        elif report_type == 'data_analysis':
-            return self.generate_data_analysis_report(client_data)
-        else:
-            raise ValueError(f"Unsupported report type: {report_type}")
+        return ''.join(self.iter_chunks(report_type, client_data))
+    
+    def write_report(self, report_type: str, client_data: Dict[str, Any], stream: TextIO) -> int:
+        """Render a report straight into a text stream (file, socket file, HTTP response)
+        
+        Returns the number of characters written.
+        """
+        written = 0
+        for chunk in self.iter_chunks(report_type, client_data):
+            stream.write(chunk)
+            written += len(chunk)
+        return written
+    
+    def generate_html_report(self, report_type: str, client_data: Dict[str, Any],
+                             template_path: str = None) -> str:
+        """Generate a report as a standalone HTML page styled like the monthly report template"""
+        markdown_text = self.generate_report(report_type, client_data)
+        title = markdown_text.split('\n', 1)[0].lstrip('# ').strip() or report_type
+        return report_html.markdown_document(markdown_text, title, template_path)
     
     def save_report(self, report_content: str, filename: str) -> str:
-        """Save report to file"""
+        """Save report to file.
+        
+        The report is written to a temporary file and renamed into place, so a
+        crash never leaves a truncated report behind.
+        """
+        return self._write_atomic(filename, (report_content,))
+    
+    def stream_report(self, report_type: str, client_data: Dict[str, Any], filename: str) -> str:
+        """Render a report directly to a file without building it in memory"""
+        return self._write_atomic(filename, self.iter_chunks(report_type, client_data))
+    
+    def _write_atomic(self, filename: str, chunks: Iterable[str]) -> str:
         output_path = self.output_dir / filename
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(report_content)
+        tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.writelines(chunks)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
         return str(output_path)
     
     def create_client_questionnaire(self, service_type: str) -> str:
@@ -597,7 +1313,213 @@ Please provide access to relevant data sources and return this questionnaire wit
         
         return questionnaires.get(service_type, "Questionnaire not available for this service type.")
 
-def main():
+# Batch generation: each worker process keeps one generator (and its section cache)
+_batch_generator: Optional[ReportGenerator] = None
+
+
+def _init_batch_worker(output_dir: str):
+    global _batch_generator
+    _batch_generator = ReportGenerator(output_dir=output_dir)
+
+
+def _render_batch(jobs: List[Tuple[str, str, str, Dict[str, Any]]]) -> List[Tuple[str, float, Optional[str]]]:
+    """Render and save a chunk of (filename, report type, format, client_data) jobs;
+    returns (filename, seconds, error or None) per job"""
+    results = []
+    for filename, report_type, fmt, client_data in jobs:
+        started = time.perf_counter()
+        error = None
+        try:
+            if fmt == 'html':
+                _batch_generator.save_report(_batch_generator.generate_html_report(report_type, client_data),
+                                             filename)
+            else:
+                _batch_generator.stream_report(report_type, client_data, filename)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        results.append((filename, time.perf_counter() - started, error))
+    return results
+
+
+def _slug(value: Any) -> str:
+    return re.sub(r'[^A-Za-z0-9]+', '_', str(value)).strip('_').lower() or 'client'
+
+
+def iter_client_records(path: str, fmt: str = 'md') -> Iterator[Dict[str, Any]]:
+    """Yield client_data records from a JSON Lines file or a JSON list.
+    
+    Records that do not set ``format`` are rendered as ``fmt``.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if Path(path).suffix.lower() == '.json':
+            records = json.load(f)
+        else:
+            records = (json.loads(line) for line in f if line.strip())
+        for record in records:
+            record.setdefault('format', fmt)
+            yield record
+
+
+# Free-text project types used in the workflow database (after _slug), mapped
+# to the built-in report types
+REPORT_TYPE_ALIASES = {
+    'market_research': 'market_research',
+    'market_analysis': 'market_research',
+    'research': 'market_research',
+    'data_analysis': 'data_analysis',
+    'data_analytics': 'data_analysis',
+    'analysis': 'data_analysis',
+    'analytics': 'data_analysis',
+    'bi_dashboard': 'bi_dashboard',
+    'business_intelligence': 'bi_dashboard',
+    'bi_dashboard_development': 'bi_dashboard',
+    'dashboard': 'bi_dashboard',
+    'dashboard_development': 'bi_dashboard',
+    'strategic_consulting': 'strategic_consulting',
+    'business_consulting': 'strategic_consulting',
+    'consulting': 'strategic_consulting',
+    'strategy': 'strategic_consulting'
+}
+
+
+def resolve_report_type(project_type: Any, default: str = 'data_analysis') -> str:
+    """Map a project type such as "Market Research" to a report type key, else ``default``"""
+    return REPORT_TYPE_ALIASES.get(_slug(project_type), default)
+
+
+def iter_project_records(db_path: str, status: str = None, report_type: str = 'data_analysis',
+                         fmt: str = 'md') -> Iterator[Dict[str, Any]]:
+    """Yield client_data records for the projects in the workflow database.
+    
+    Each project's type is mapped to a report type (see REPORT_TYPE_ALIASES);
+    projects whose type has no match use ``report_type``. Raises
+    FileNotFoundError straight away if ``db_path`` does not exist, rather than
+    creating an empty database.
+    """
+    if not Path(db_path).is_file():
+        raise FileNotFoundError(f"Workflow database not found: {db_path}")
+    return _iter_project_rows(db_path, status, report_type, fmt)
+
+
+def _iter_project_rows(db_path: str, status: str, report_type: str, fmt: str) -> Iterator[Dict[str, Any]]:
+    from workflow_automation import FiverrWorkflowAutomation
+
+    automation = FiverrWorkflowAutomation(db_path)
+    query = '''
+        SELECT p.id, p.project_type, p.title, p.package_type, c.name, c.email
+        FROM projects p
+        JOIN clients c ON p.client_id = c.id
+    '''
+    params = ()
+    if status:
+        query += ' WHERE p.status = ?'
+        params = (status,)
+    try:
+        cursor = automation.db.connection().execute(query + ' ORDER BY p.id', params)
+        for project_id, project_type, title, package_type, client_name, client_email in cursor:
+            record_type = resolve_report_type(project_type, report_type)
+            yield {
+                'report_type': record_type,
+                'filename': f"project_{project_id}_{record_type}.{fmt}",
+                'format': fmt,
+                'client_name': client_name,
+                'client_email': client_email,
+                'analysis_title': title,
+                'engagement_title': title,
+                'package_type': (package_type or 'standard').title()
+            }
+    finally:
+        automation.close()
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, round(percent / 100 * (len(sorted_values) - 1)))]
+
+
+def generate_reports_batch(records: Iterable[Dict[str, Any]], output_dir: str = "generated_reports",
+                           report_type: str = 'data_analysis', workers: int = None,
+                           chunk_size: int = 8, max_pending: int = None,
+                           resume: bool = True, fmt: str = 'md') -> Dict[str, Any]:
+    """Render many reports across a process pool and save each one atomically.
+    
+    Records may set ``report_type``, ``format`` and ``filename``; otherwise
+    ``report_type`` and ``fmt`` are used and the filename is derived from the record's position and client
+    name, so re-running over the same input maps to the same files. With
+    ``resume`` reports whose file already exists are skipped, which makes a
+    crashed run restartable. At most ``max_pending`` chunks are in flight, so
+    memory stays bounded however long the input is. Format ``'html'`` writes
+    styled HTML pages instead of Markdown.
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    existing = {entry.name for entry in os.scandir(output_path)} if resume else set()
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    registered = ReportGenerator(output_dir=output_dir).report_templates
+
+    stats: Dict[str, Any] = {'written': 0, 'skipped': 0, 'failed': 0, 'errors': []}
+    latencies: List[float] = []
+
+    def jobs() -> Iterator[Tuple[str, str, str, Dict[str, Any]]]:
+        for index, client_data in enumerate(records, 1):
+            record_type = client_data.get('report_type', report_type)
+            record_fmt = client_data.get('format', fmt)
+            filename = client_data.get('filename') or \
+                f"{index:06d}_{record_type}_{_slug(client_data.get('client_name', 'client'))}.{record_fmt}"
+            if filename in existing:
+                stats['skipped'] += 1
+            elif record_type not in registered:
+                stats['failed'] += 1
+                stats['errors'].append((filename, f"Unsupported report type: {record_type}"))
+            elif record_fmt not in ('md', 'html'):
+                stats['failed'] += 1
+                stats['errors'].append((filename, f"Unsupported report format: {record_fmt}"))
+            else:
+                yield filename, record_type, record_fmt, client_data
+
+    def collect(futures):
+        for future in futures:
+            for filename, seconds, error in future.result():
+                latencies.append(seconds)
+                if error:
+                    stats['failed'] += 1
+                    stats['errors'].append((filename, error))
+                else:
+                    stats['written'] += 1
+
+    started = time.perf_counter()
+    job_iter = jobs()
+    pending = set()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                             initargs=(str(output_path),)) as executor:
+        while True:
+            chunk = list(islice(job_iter, chunk_size))
+            if not chunk:
+                break
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending.add(executor.submit(_render_batch, chunk))
+        collect(wait(pending)[0])
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    stats.update({
+        'elapsed': elapsed,
+        'workers': workers,
+        'reports_per_second': stats['written'] / elapsed if elapsed else 0.0,
+        'p50_ms': _percentile(latencies, 50) * 1000,
+        'p95_ms': _percentile(latencies, 95) * 1000,
+        'p99_ms': _percentile(latencies, 99) * 1000
+    })
+    for filename, error in stats['errors']:
+        logger.error(f"Report {filename} failed: {error}")
+    return stats
+
+
+def run_demo():
     """Demo of the report generator"""
     print("📊 Automated Report Generator Demo")
     print("=" * 50)
@@ -636,6 +1558,22 @@ def main():
     data_file = generator.save_report(data_report, 'sample_data_analysis_report.md')
     print(f"✅ Data analysis report generated: {data_file}")
     
+    # Findings computed from a dataset instead of hand-typed values
+    if report_analytics is not None and Path('sample_data.json').exists():
+        dataset_report = generator.generate_report('data_analysis', {
+            'client_name': 'RetailCorp',
+            'analysis_title': 'Revenue and Customer Performance',
+            'dataset': 'sample_data.json'
+        })
+        dataset_file = generator.save_report(dataset_report, 'sample_dataset_analysis_report.md')
+        print(f"✅ Data-driven analysis report generated: {dataset_file}")
+    
+    # Dashboard documentation and strategy reports use the same section registry
+    for report_type in ('bi_dashboard', 'strategic_consulting'):
+        report = generator.generate_report(report_type, {'client_name': 'RetailCorp'})
+        report_file = generator.save_report(report, f'sample_{report_type}_report.md')
+        print(f"✅ {report_type.replace('_', ' ').title()} report generated: {report_file}")
+    
     # Generate questionnaires
     mr_questionnaire = generator.create_client_questionnaire('market_research')
     mr_q_file = generator.save_report(mr_questionnaire, 'market_research_questionnaire.md')
@@ -648,6 +1586,46 @@ def main():
     print("\n🎯 Report generation demo completed!")
     print("All files saved to: generated_reports/")
 
+def main():
+    """Command-line entry point: batch generation, or the demo without a data source"""
+    parser = argparse.ArgumentParser(description="Generate client reports")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--input', help="JSON Lines (or JSON list) file of client_data records")
+    source.add_argument('--db', help="Workflow database; one report per project")
+    parser.add_argument('--status', help="With --db, only projects in this status")
+    parser.add_argument('--report-type', default='data_analysis',
+                        help="Report type for records that do not set report_type and for "
+                             "--db projects whose type has no matching report type")
+    parser.add_argument('--output-dir', default='generated_reports')
+    parser.add_argument('--workers', type=int, help="Worker processes (default: all cores)")
+    parser.add_argument('--chunk-size', type=int, default=8, help="Reports per work unit")
+    parser.add_argument('--format', dest='fmt', choices=('md', 'html'), default='md')
+    parser.add_argument('--no-resume', action='store_true', help="Regenerate reports that already exist")
+    args = parser.parse_args()
+
+    if not args.input and not args.db:
+        run_demo()
+        return
+
+    if args.input:
+        records = iter_client_records(args.input, args.fmt)
+    else:
+        try:
+            records = iter_project_records(args.db, args.status, args.report_type, args.fmt)
+        except FileNotFoundError as e:
+            parser.error(str(e))
+    print("📊 Batch Report Generation")
+    print("=" * 50)
+    stats = generate_reports_batch(records, args.output_dir, args.report_type, args.workers,
+                                   args.chunk_size, resume=not args.no_resume, fmt=args.fmt)
+
+    print(f"✅ Written: {stats['written']}  Skipped (already done): {stats['skipped']}  Failed: {stats['failed']}")
+    print(f"Throughput: {stats['reports_per_second']:.1f} reports/s on {stats['workers']} workers "
+          f"({stats['elapsed']:.2f}s)")
+    print(f"Latency per report: p50 {stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms, "
+          f"p99 {stats['p99_ms']:.1f} ms")
+    print(f"Reports saved to: {args.output_dir}/")
+
 if __name__ == "__main__":
     main()
 
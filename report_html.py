@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+HTML/PDF Rendering for the Automated Report Generator
+Fills monthly_report_template.html from computed metrics and converts Markdown reports to styled HTML
+"""
+
+import os
+import re
+import html
+import argparse
+import json
+import math
+import shutil
+import subprocess
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+import logging
+
+try:
+    import markdown as markdown_lib
+except ImportError:  # fall back to the built-in converter below
+    markdown_lib = None
+
+try:
+    import report_analytics
+except ImportError:  # metrics need pandas/numpy
+    report_analytics = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TEMPLATE = Path(__file__).with_name('monthly_report_template.html')
+
+PLACEHOLDER_PATTERN = re.compile(r'\{\{(\w+)\}\}')
+STYLE_PATTERN = re.compile(r'<style[^>]*>(.*?)</style>', re.S | re.I)
+
+
+class CompiledHTMLTemplate:
+    """An HTML template split once into literal text and placeholder names.
+
+    Rendering is a single join over the pre-split parts, so a batch of
+    clients never re-scans the template text.
+    """
+
+    __slots__ = ('path', 'parts', 'placeholders', 'css')
+
+    def __init__(self, text: str, path: str = None):
+        self.path = path
+        # Even indexes hold literal HTML, odd indexes placeholder names
+        self.parts = PLACEHOLDER_PATTERN.split(text)
+        self.placeholders = frozenset(self.parts[1::2])
+        match = STYLE_PATTERN.search(text)
+        self.css = match.group(1).strip() if match else ''
+
+    def render(self, values: Dict[str, str]) -> str:
+        """Fill placeholders with (already escaped) HTML; unknown ones render empty"""
+        missing = self.placeholders - values.keys()
+        if missing:
+            logger.warning(f"No values for template placeholders: {', '.join(sorted(missing))}")
+        parts = list(self.parts)
+        for i in range(1, len(parts), 2):
+            parts[i] = values.get(parts[i], '')
+        return ''.join(parts)
+
+
+_template_cache: Dict[str, Tuple[int, CompiledHTMLTemplate]] = {}
+_template_lock = threading.Lock()
+
+
+def load_template(path: str = None) -> CompiledHTMLTemplate:
+    """Return the compiled template at ``path``, re-parsing only when the file changes"""
+    path = str(Path(path or DEFAULT_TEMPLATE).resolve())
+    mtime = os.stat(path).st_mtime_ns
+    with _template_lock:
+        cached = _template_cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+    with open(path, 'r', encoding='utf-8') as f:
+        template = CompiledHTMLTemplate(f.read(), path)
+    with _template_lock:
+        _template_cache[path] = (mtime, template)
+    return template
+
+
+# Minimal Markdown support for the constructs the report sections use; the
+# ``markdown`` package is used instead when it is installed
+_INLINE_RULES = [
+    (re.compile(r'\*\*(.+?)\*\*'), r'<strong>\1</strong>'),
+    (re.compile(r'(?<!\*)\*(?!\s)(.+?)\*'), r'<em>\1</em>'),
+    (re.compile(r'`([^`]+)`'), r'<code>\1</code>'),
+]
+_HEADING = re.compile(r'^(#{1,6})\s+(.*)$')
+_LIST_ITEM = re.compile(r'^\s*(?:[-*]|(\d+)\.)\s+(.*)$')
+_CHECKBOX = re.compile(r'^\[( |x)\]\s+')
+
+
+def _inline(text: str) -> str:
+    text = html.escape(text, quote=False)
+    for pattern, replacement in _INLINE_RULES:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def _simple_markdown(text: str) -> str:
+    out: List[str] = []
+    paragraph: List[str] = []
+    list_tag: Optional[str] = None
+    table: List[List[str]] = []
+
+    def flush():
+        nonlocal list_tag, table
+        if paragraph:
+            out.append(f"<p>{'<br>'.join(_inline(line) for line in paragraph)}</p>")
+            paragraph.clear()
+        if list_tag:
+            out.append(f"</{list_tag}>")
+            list_tag = None
+        if table:
+            head, *body = table
+            out.append('<table class="kpi-table"><thead><tr>' +
+                       ''.join(f"<th>{_inline(cell)}</th>" for cell in head) + '</tr></thead><tbody>')
+            out.extend('<tr>' + ''.join(f"<td>{_inline(cell)}</td>" for cell in row) + '</tr>' for row in body)
+            out.append('</tbody></table>')
+            table = []
+
+    for raw in text.splitlines():
+        line = raw.rstrip()
+        stripped = line.strip()
+        if not stripped:
+            flush()
+            continue
+        if stripped.startswith('|') and stripped.endswith('|'):
+            cells = [cell.strip() for cell in stripped.strip('|').split('|')]
+            if all(re.fullmatch(r':?-{3,}:?', cell) for cell in cells):
+                continue
+            if not table:
+                flush()
+            table.append(cells)
+            continue
+        heading = _HEADING.match(stripped)
+        if heading:
+            flush()
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+            continue
+        if re.fullmatch(r'-{3,}', stripped):
+            flush()
+            out.append('<hr>')
+            continue
+        item = _LIST_ITEM.match(line)
+        if item:
+            tag = 'ol' if item.group(1) else 'ul'
+            if paragraph or table or list_tag != tag:
+                flush()
+                out.append(f"<{tag}>")
+                list_tag = tag
+            content = item.group(2)
+            checkbox = _CHECKBOX.match(content)
+            if checkbox:
+                checked = ' checked' if checkbox.group(1) == 'x' else ''
+                content = content[checkbox.end():]
+                out.append(f'<li><input type="checkbox" disabled{checked}> {_inline(content)}</li>')
+            else:
+                out.append(f"<li>{_inline(content)}</li>")
+            continue
+        if list_tag or table:
+            flush()
+        paragraph.append(stripped)
+    flush()
+    return '\n'.join(out)
+
+
+def markdown_to_html(text: str) -> str:
+    """Convert report Markdown to an HTML fragment in one pass"""
+    if markdown_lib is not None:
+        return markdown_lib.markdown(text, extensions=['tables'])
+    return _simple_markdown(text)
+
+
+def markdown_document(markdown_text: str, title: str, template_path: str = None) -> str:
+    """Wrap a converted Markdown report in a standalone page styled with the template's CSS"""
+    css = load_template(template_path).css
+    return (f'<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="UTF-8">\n'
+            f'<title>{html.escape(title)}</title>\n<style>\n{css}\n</style>\n</head>\n'
+            f'<body>\n{markdown_to_html(markdown_text)}\n</body>\n</html>\n')
+
+
+def _bar_chart(labels: List[str], values: List[float], value_format: str = '{:,.0f}',
+               width: int = 640, height: int = 260) -> str:
+    """Inline SVG bar chart; negative values are drawn below the axis in red"""
+    if not values:
+        return ''
+    # Non-finite values would put nan coordinates into the SVG
+    values = [value if math.isfinite(value) else 0.0 for value in values]
+    top = max(max(values), 0.0)
+    bottom = min(min(values), 0.0)
+    span = (top - bottom) or 1.0
+    plot_height = height - 40
+    zero_y = 10 + plot_height * top / span
+    slot = width / len(values)
+    bars = []
+    for i, (label, value) in enumerate(zip(labels, values)):
+        bar_height = plot_height * abs(value) / span
+        y = zero_y - bar_height if value >= 0 else zero_y
+        x = i * slot + slot * 0.15
+        colour = '#0078D4' if value >= 0 else '#d9534f'
+        bars.append(
+            f'<rect x="{x:.1f}" y="{y:.1f}" width="{slot * 0.7:.1f}" height="{bar_height:.1f}" fill="{colour}">'
+            f'<title>{html.escape(label)}: {value_format.format(value)}</title></rect>'
+            f'<text x="{x + slot * 0.35:.1f}" y="{height - 8}" font-size="11" text-anchor="middle">'
+            f'{html.escape(label)}</text>')
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" width="100%" height="100%">'
+            f'<line x1="0" y1="{zero_y:.1f}" x2="{width}" y2="{zero_y:.1f}" stroke="#999"/>'
+            f"{''.join(bars)}</svg>")
+
+
+def _trend_label(change: float) -> str:
+    if change > 0:
+        return '<span style="color:#2e7d32">▲ Up</span>'
+    if change < 0:
+        return '<span style="color:#c62828">▼ Down</span>'
+    return '► Flat'
+
+
+def _kpi_rows(metrics: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    kpis = metrics.get('kpis')
+    if kpis is None or kpis.empty:
+        return {}
+    return {row['MetricName']: row for row in kpis.to_dict('records')}
+
+
+def _metric_values(metrics: Dict[str, Any]) -> Dict[str, str]:
+    """Placeholder values derived from dataset metrics alone (shared by every client of a dataset)"""
+    values: Dict[str, str] = {}
+    kpis = _kpi_rows(metrics)
+    for name, prefix, scale, fmt in (('Revenue', 'Revenue', 1, '{:,.0f}'),
+                                     ('Customer Satisfaction', 'Satisfaction', 1, '{:.1f}'),
+                                     ('Market Share', 'MarketShare', 100, '{:.1f}')):
+        row = kpis.get(name)
+        if row is None:
+            continue
+        current, previous = row['CurrentValue'] * scale, row['PreviousValue'] * scale
+        change = current - previous
+        values[f'Current{prefix}'] = fmt.format(current)
+        values[f'Previous{prefix}'] = fmt.format(previous)
+        values[f'{prefix}Change'] = (f"{change / previous:+.1%}" if prefix == 'Revenue' and previous
+                                     else f"{change:+.1f}")
+        values[f'{prefix}Trend'] = _trend_label(change)
+
+    monthly = metrics.get('monthly_revenue')
+    if monthly is not None and len(monthly) > 0:
+        labels = [period.strftime('%b %y') for period in monthly.index]
+        values['PerformanceChart'] = _bar_chart(labels, [float(v) for v in monthly.values], '${:,.0f}')
+        # Growth after a zero-revenue month is undefined (±inf, or NaN for 0/0); show it as 0
+        growth = (monthly.pct_change() * 100).iloc[1:].replace([math.inf, -math.inf], math.nan).fillna(0.0)
+        if len(growth) > 0:
+            values['GrowthChart'] = _bar_chart(labels[1:], [float(v) for v in growth.values], '{:+.1f}%')
+            current = float(growth.iloc[-1])
+            previous = float(growth.iloc[-2]) if len(growth) > 1 else 0.0
+            values['CurrentGrowth'] = f"{current:.1f}"
+            values['PreviousGrowth'] = f"{previous:.1f}"
+            values['GrowthChange'] = f"{current - previous:+.1f}"
+            values['GrowthTrend'] = _trend_label(current - previous)
+        values['ReportPeriod'] = monthly.index[-1].strftime('%B %Y')
+
+    fields = report_analytics.report_fields(metrics) if report_analytics else {}
+    summary = [fields[key] for key in ('key_insight_1', 'key_metric') if key in fields]
+    if summary:
+        values['ExecutiveSummary'] = '<br>'.join(html.escape(line) for line in summary)
+    values['AIInsights'] = markdown_to_html(fields.get('trend_analysis', ''))
+    recommendations = [fields['main_recommendation']] if 'main_recommendation' in fields else []
+    churn = metrics.get('churn_mix')
+    if churn is not None and churn.get('High', 0.0) > 0:
+        recommendations.append(f"Run a retention campaign for the {churn['High']:.0%} of customers "
+                               f"at high churn risk")
+    by_product = metrics.get('by_product_line')
+    if by_product is not None and not by_product.empty:
+        recommendations.append(f"Keep investing in {by_product.index[0]}, the largest product line")
+    values['Recommendations'] = markdown_to_html('\n'.join(f"- {item}" for item in recommendations))
+    return values
+
+
+# Metric-derived values per metrics object; report_analytics caches the metrics
+# of dataset files, so every client of the same dataset shares one entry
+_metric_values_cache: Dict[int, Tuple[Dict[str, Any], Dict[str, str]]] = {}
+
+
+def _cached_metric_values(metrics: Dict[str, Any]) -> Dict[str, str]:
+    cached = _metric_values_cache.get(id(metrics))
+    if cached is None or cached[0] is not metrics:
+        if len(_metric_values_cache) >= 32:
+            _metric_values_cache.clear()
+        cached = _metric_values_cache[id(metrics)] = (metrics, _metric_values(metrics))
+    return cached[1]
+
+
+def monthly_report_values(client_data: Dict[str, Any], metrics: Dict[str, Any] = None) -> Dict[str, str]:
+    """HTML values for every placeholder in monthly_report_template.html.
+
+    Figures come from dataset ``metrics`` (see report_analytics.compute_metrics)
+    when given; any placeholder name set in ``client_data`` overrides them.
+    """
+    values = {
+        'ClientName': html.escape(str(client_data.get('client_name', 'Client Name'))),
+        'ReportDate': datetime.now().strftime('%B %d, %Y'),
+        'ReportPeriod': datetime.now().strftime('%B %Y'),
+        'NextStep1': 'Review findings with stakeholders',
+        'NextStep2': 'Prioritize recommendations',
+        'NextStep3': 'Set up monitoring for the key metrics',
+        'ExecutiveSummary': html.escape(str(client_data.get('key_insight_1', ''))),
+        'AIInsights': '',
+        'Recommendations': '',
+        'PerformanceChart': '',
+        'GrowthChart': '',
+    }
+    for prefix in ('Revenue', 'Growth', 'Satisfaction', 'MarketShare'):
+        values.update({f'Current{prefix}': 'N/A', f'Previous{prefix}': 'N/A',
+                       f'{prefix}Change': 'N/A', f'{prefix}Trend': 'N/A'})
+    if metrics:
+        values.update(_cached_metric_values(metrics))
+    if 'analysis_period' in client_data:
+        values['ReportPeriod'] = html.escape(str(client_data['analysis_period']))
+
+    for name in values:
+        if name in client_data:
+            values[name] = html.escape(str(client_data[name]))
+    return values
+
+
+def render_monthly_report(client_data: Dict[str, Any], template_path: str = None) -> str:
+    """Fill the monthly HTML template for one client.
+
+    ``client_data['dataset']`` (a sample_data.json-style path or dict) supplies
+    the metrics; this needs pandas/numpy.
+    """
+    metrics = None
+    if client_data.get('dataset') is not None:
+        if report_analytics is None:
+            raise RuntimeError("Dataset metrics require pandas and numpy (pip install pandas)")
+        metrics = report_analytics.dataset_metrics(client_data['dataset'])
+    return load_template(template_path).render(monthly_report_values(client_data, metrics))
+
+
+def html_to_pdf(html_text: str, output_path: str) -> str:
+    """Convert HTML to PDF with a local engine (WeasyPrint, else wkhtmltopdf)"""
+    try:
+        from weasyprint import HTML
+    except ImportError:
+        HTML = None
+    if HTML is not None:
+        HTML(string=html_text).write_pdf(output_path)
+        return output_path
+
+    engine = shutil.which('wkhtmltopdf')
+    if engine is None:
+        raise RuntimeError("PDF output needs WeasyPrint (pip install weasyprint) or wkhtmltopdf on PATH")
+    subprocess.run([engine, '--quiet', '-', output_path], input=html_text.encode('utf-8'), check=True)
+    return output_path
+
+
+def render_monthly_reports(records: Iterable[Dict[str, Any]], output_dir: str = 'generated_reports',
+                           template_path: str = None, pdf: bool = False) -> List[str]:
+    """Render the monthly HTML (and optionally PDF) report for each record; returns the output paths"""
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for client_data in records:
+        name = re.sub(r'[^A-Za-z0-9]+', '_', str(client_data.get('client_name', 'client'))).strip('_').lower()
+        page = render_monthly_report(client_data, template_path)
+        target = output / f"monthly_report_{name or 'client'}.html"
+        tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(page)
+        os.replace(tmp_path, target)
+        paths.append(str(target))
+        if pdf:
+            paths.append(html_to_pdf(page, str(target.with_suffix('.pdf'))))
+    return paths
+
+
+def main():
+    """Render monthly HTML reports for one client or a JSON Lines file of clients"""
+    parser = argparse.ArgumentParser(description="Fill monthly_report_template.html from computed metrics")
+    parser.add_argument('--client', default='RetailCorp', help="Client name for a single report")
+    parser.add_argument('--dataset', default='sample_data.json', help="sample_data.json-style dataset")
+    parser.add_argument('--input', help="JSON Lines file of client records (client_name, dataset, ...)")
+    parser.add_argument('--template', help="HTML template (default: monthly_report_template.html)")
+    parser.add_argument('--output-dir', default='generated_reports')
+    parser.add_argument('--pdf', action='store_true', help="Also write a PDF next to each HTML file")
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, 'r', encoding='utf-8') as f:
+            records = [dict({'dataset': args.dataset}, **json.loads(line)) for line in f if line.strip()]
+    else:
+        records = [{'client_name': args.client, 'dataset': args.dataset}]
+
+    print("🖨️ Monthly HTML Report Rendering")
+    print("=" * 50)
+    for path in render_monthly_reports(records, args.output_dir, args.template, args.pdf):
+        print(f"✅ {path}")
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,175 @@ Fiverr Template Customization Tool
 Automatically personalizes all Fiverr templates with user information
 """
 
+import argparse
 import os
 import json
 import re
+import hashlib
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+import logging
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # Watch mode falls back to polling
+    INotify = None
+    inotify_flags = None
+
+logger = logging.getLogger(__name__)
+
+# Placeholder shapes recognised in templates: {{var}}, {var}, [VAR] and [var]
+PLACEHOLDER_PATTERN = r'\{\{[A-Za-z_]\w*\}\}|\{[A-Za-z_]\w*\}|\[[A-Za-z_]\w*\]'
+
+# Build manifest kept in the output directory; bump the version when the
+# substitution rules change so existing outputs are rebuilt
+MANIFEST_NAME = '.customization_manifest.json'
+MANIFEST_VERSION = 1
+
+# Sample-persona text in the source templates and the variable that replaces it
+# (None keeps the text as a placeholder for the buyer to fill in)
+KNOWN_LITERALS = {
+    'Michelle Alexander': 'seller_name',
+    'DataPro Analytics': 'company_name',
+    'yourdomain.com': 'website_domain',
+    'your-email@domain.com': 'email_address',
+    '[Client Name]': None,
+    '[Your Name]': 'seller_name'
+}
+
+
+def _is_placeholder(token: str) -> bool:
+    """Whether an unmatched token looks like a template variable rather than Markdown text"""
+    if token.startswith('{'):
+        return True
+    name = token[1:-1]
+    # [x] checkboxes and similar short bracketed words are ordinary Markdown
+    return '_' in name or (len(name) > 1 and name.isupper())
+
+
+class SubstitutionEngine:
+    """Rewrites every placeholder form of every variable in one regex pass.
+
+    All forms and known literals share one alternation, so a document is scanned
+    once regardless of how many variables there are. Placeholder-shaped tokens
+    with no value are left in place and reported.
+    """
+
+    def __init__(self, template_vars: Dict[str, Any]):
+        table: Dict[str, str] = {}
+        variables: Dict[str, str] = {}
+        for name, value in template_vars.items():
+            value = str(value)
+            for form in (f'{{{{{name}}}}}', f'{{{name}}}', f'[{name.upper()}]', f'[{name}]'):
+                if form not in table:
+                    table[form] = value
+                    variables[form] = name
+        for literal, name in KNOWN_LITERALS.items():
+            table[literal] = str(template_vars[name]) if name else literal
+            variables.pop(literal, None)
+            if name:
+                variables[literal] = name
+        self.table = table
+        # Token -> variable it reads, for dependency tracking
+        self.variables = variables
+
+        # Longer literals first so a literal is never shadowed by one of its prefixes
+        literals = sorted(KNOWN_LITERALS, key=len, reverse=True)
+        self.pattern = re.compile('|'.join([re.escape(literal) for literal in literals] + [PLACEHOLDER_PATTERN]))
+
+    def substitute(self, content: str, used: set = None) -> Tuple[str, List[str]]:
+        """Return the customized content and the unknown placeholders left in it.
+
+        If ``used`` is given, the names of the variables the content read are added to it.
+        """
+        table = self.table
+        unknown: Dict[str, None] = {}
+        matched: Dict[str, None] = {}
+
+        def replace(match):
+            token = match.group()
+            value = table.get(token)
+            if value is None:
+                if _is_placeholder(token):
+                    unknown[token] = None
+                return token
+            matched[token] = None
+            return value
+
+        customized = self.pattern.sub(replace, content)
+        if used is not None:
+            used.update(self.variables[token] for token in matched if token in self.variables)
+        return customized, list(unknown)
+
+
+def _hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _vars_hash(template_vars: Dict[str, Any], names: List[str]) -> str:
+    """Hash of the values of the named variables only, so unrelated config edits do not invalidate a file"""
+    return _hash_text(json.dumps([[name, str(template_vars.get(name))] for name in sorted(names)],
+                                 ensure_ascii=False))
+
+
+def _read_template(path: Path) -> str:
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _write_atomic(path: Path, content: str):
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+
+
+def _var_items(template_vars: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    return tuple((name, str(value)) for name, value in template_vars.items())
+
+
+@lru_cache(maxsize=64)
+def _compiled_engine(var_items: Tuple[Tuple[str, str], ...]) -> SubstitutionEngine:
+    return SubstitutionEngine(dict(var_items))
+
+
+def compile_substitutions(template_vars: Dict[str, Any]) -> SubstitutionEngine:
+    """Substitution engine for a variable set, compiled once and reused while the values are unchanged"""
+    return _compiled_engine(_var_items(template_vars))
+
+
+def _customize_chunk(jobs: List[Tuple[str, str, str]], var_items: Tuple[Tuple[str, str], ...]
+                     ) -> List[Tuple[str, float, Optional[str], str, List[str], List[str]]]:
+    """Customize a chunk of (name, source, output) jobs.
+
+    Returns (name, seconds, error or None, source hash, variables read,
+    unknown placeholders) per job. The engine comes from the per-process
+    cache, so a pool worker compiles each variable set once.
+    """
+    engine = _compiled_engine(var_items)
+    results = []
+    for name, source, output in jobs:
+        started = time.perf_counter()
+        try:
+            content = _read_template(Path(source))
+            used: set = set()
+            customized_content, unknown = engine.substitute(content, used)
+            _write_atomic(Path(output), customized_content)
+            results.append((name, time.perf_counter() - started, None, _hash_text(content), sorted(used), unknown))
+        except Exception as e:
+            results.append((name, time.perf_counter() - started, f"{type(e).__name__}: {e}", '', [], []))
+    return results
+
 
 class FiverrTemplateCustomizer:
     def __init__(self, templates_dir: str, output_dir: str):
@@ -34,6 +198,7 @@ class FiverrTemplateCustomizer:
             'phone_number': '+1-XXX-XXX-XXXX',
             'location': 'Your City, State'
         }
+        self._default_vars = dict(self.template_vars)
     
     def load_user_config(self, config_file: str) -> Dict[str, Any]:
         """Load user configuration from JSON file"""
@@ -50,66 +215,145 @@ class FiverrTemplateCustomizer:
             if key in self.template_vars:
                 self.template_vars[key] = value
     
+    def reload_user_config(self, config_file: str) -> List[str]:
+        """Re-apply a config file on top of the defaults; returns the names of variables whose value changed"""
+        previous = dict(self.template_vars)
+        self.template_vars = dict(self._default_vars)
+        self.update_template_vars(self.load_user_config(config_file))
+        return [name for name, value in self.template_vars.items() if previous.get(name) != value]
+    
+    def substitution_engine(self) -> SubstitutionEngine:
+        """Compiled substitution engine for the current template variables"""
+        return compile_substitutions(self.template_vars)
+    
     def customize_template(self, template_content: str) -> str:
         """Replace template variables in content"""
-        customized_content = template_content
-        
-        # Replace all template variables
-        for var_name, var_value in self.template_vars.items():
-            # Replace various formats: {var_name}, [VAR_NAME], {{var_name}}
-            patterns = [
-                f'{{{var_name}}}',
-                f'[{var_name.upper()}]',
-                f'{{{{{var_name}}}}}',
-                f'[{var_name}]'
-            ]
-            
-            for pattern in patterns:
-                customized_content = customized_content.replace(pattern, str(var_value))
-        
-        # Replace specific known placeholders
-        replacements = {
-            'Michelle Alexander': self.template_vars['seller_name'],
-            'DataPro Analytics': self.template_vars['company_name'],
-            'yourdomain.com': self.template_vars['website_domain'],
-            'your-email@domain.com': self.template_vars['email_address'],
-            '[Client Name]': '[Client Name]',  # Keep this as placeholder
-            '[Your Name]': self.template_vars['seller_name']
-        }
-        
-        for old_text, new_text in replacements.items():
-            customized_content = customized_content.replace(old_text, new_text)
-        
+        customized_content, unknown = self.substitution_engine().substitute(template_content)
+        if unknown:
+            logger.warning(f"Unknown placeholders left in template: {', '.join(unknown)}")
         return customized_content
     
-    def process_all_templates(self):
-        """Process all template files in the templates directory"""
-        processed_files = []
+    def load_manifest(self) -> Dict[str, Any]:
+        """Load the build manifest from the output directory (empty if missing or unreadable)"""
+        try:
+            with open(self.output_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {'version': MANIFEST_VERSION, 'variables': [], 'files': {}}
+        manifest.setdefault('files', {})
+        return manifest
+    
+    def save_manifest(self, manifest: Dict[str, Any]):
+        """Write the build manifest atomically"""
+        _write_atomic(self.output_dir / MANIFEST_NAME, json.dumps(manifest, indent=2, ensure_ascii=False))
+    
+    def _entry_current(self, entry: Dict[str, Any], template_file: Path, stat: os.stat_result) -> bool:
+        """Whether a manifest entry still matches the source file and the variables it read"""
+        if entry['vars_hash'] != _vars_hash(self.template_vars, entry['variables']):
+            return False
+        if not (self.output_dir / entry['output']).exists():
+            return False
+        # Unchanged size and mtime are trusted; otherwise compare content hashes
+        if entry.get('mtime_ns') == stat.st_mtime_ns and entry.get('size') == stat.st_size:
+            return True
+        return entry['source_hash'] == _hash_text(_read_template(template_file))
+    
+    def _run_jobs(self, jobs: List[Tuple[str, str, str]], workers: int, chunk_size: int,
+                  use_threads: bool) -> List[Tuple[str, float, Optional[str], str, List[str], List[str]]]:
+        """Customize jobs serially or across a pool; results come back in job order"""
+        var_items = _var_items(self.template_vars)
+        if workers <= 1 or len(jobs) <= chunk_size:
+            return _customize_chunk(jobs, var_items)
+        
+        chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+        pool = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+        with pool(max_workers=workers) as executor:
+            return [result for chunk_results in executor.map(_customize_chunk, chunks, repeat(var_items))
+                    for result in chunk_results]
+    
+    def build_templates(self, force: bool = False, workers: int = 1, chunk_size: int = 16,
+                        use_threads: bool = False) -> Dict[str, Any]:
+        """Customize templates whose source or variables changed since the last build.
+
+        Outputs whose manifest entry still matches are skipped, outputs whose
+        source template disappeared are deleted. With ``workers`` > 1 the stale
+        templates are customized in chunks of ``chunk_size`` across a process
+        pool (or a thread pool with ``use_threads``). Returns the output paths
+        that were rebuilt, skipped, deleted or failed, each in source order,
+        plus (output path, seconds) timings for every customized file.
+        """
+        manifest = self.load_manifest()
+        previous = manifest['files']
+        variable_names = sorted(self.template_vars)
+        # Entries from another manifest version or variable set cannot be trusted
+        reusable = previous if (not force and manifest.get('version') == MANIFEST_VERSION
+                                and manifest.get('variables') == variable_names) else {}
+        entries: Dict[str, Dict[str, Any]] = {}
+        report: Dict[str, Any] = {'rebuilt': [], 'skipped': [], 'deleted': [], 'failed': [], 'timings': []}
+        jobs: List[Tuple[str, str, str]] = []
+        stats: Dict[str, os.stat_result] = {}
         
-        for template_file in self.templates_dir.glob('*.md'):
+        for template_file in sorted(self.templates_dir.glob('*.md')):
+            output_file = self.output_dir / f"customized_{template_file.name}"
             try:
-                # Read template content
-                with open(template_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Customize content
-                customized_content = self.customize_template(content)
-                
-                # Write to output directory
-                output_file = self.output_dir / f"customized_{template_file.name}"
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(customized_content)
-                
-                processed_files.append(str(output_file))
-                print(f"✅ Processed: {template_file.name} -> {output_file.name}")
-                
+                stat = template_file.stat()
+                entry = reusable.get(template_file.name)
+                if entry and entry['output'] == output_file.name and self._entry_current(entry, template_file, stat):
+                    entries[template_file.name] = dict(entry, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                    report['skipped'].append(str(output_file))
+                    continue
             except Exception as e:
+                report['failed'].append(str(output_file))
                 print(f"❌ Error processing {template_file.name}: {str(e)}")
+                continue
+            stats[template_file.name] = stat
+            jobs.append((template_file.name, str(template_file), str(output_file)))
         
-        return processed_files
+        results = self._run_jobs(jobs, workers, chunk_size, use_threads) if jobs else []
+        for (name, _, output_file), (_, seconds, error, source_hash, used, unknown) in zip(jobs, results):
+            report['timings'].append((output_file, seconds))
+            if error:
+                report['failed'].append(output_file)
+                print(f"❌ Error processing {name}: {error}")
+                continue
+            
+            entries[name] = {
+                'output': Path(output_file).name,
+                'source_hash': source_hash,
+                'mtime_ns': stats[name].st_mtime_ns,
+                'size': stats[name].st_size,
+                'variables': used,
+                'vars_hash': _vars_hash(self.template_vars, used)
+            }
+            report['rebuilt'].append(output_file)
+            print(f"✅ Processed: {name} -> {Path(output_file).name}")
+            if unknown:
+                print(f"⚠️ Unknown placeholders in {name}: {', '.join(unknown)}")
+        
+        # Remove outputs whose source template no longer exists
+        for name, entry in previous.items():
+            if name in entries or (self.templates_dir / name).exists():
+                continue
+            orphan = self.output_dir / entry['output']
+            if orphan.exists():
+                orphan.unlink()
+                report['deleted'].append(str(orphan))
+                print(f"🗑️ Removed: {orphan.name} (source {name} deleted)")
+        
+        updated = {'version': MANIFEST_VERSION, 'variables': variable_names, 'files': entries}
+        if updated != manifest:
+            self.save_manifest(updated)
+        print(f"📦 Templates: {len(report['rebuilt'])} rebuilt, {len(report['skipped'])} up to date, "
+              f"{len(report['deleted'])} deleted, {len(report['failed'])} failed")
+        return report
     
-    def generate_fiverr_gig_files(self):
-        """Generate separate files for each Fiverr gig"""
+    def process_all_templates(self, force: bool = False, workers: int = 1) -> List[str]:
+        """Process all template files in the templates directory, skipping up-to-date outputs"""
+        report = self.build_templates(force, workers)
+        return sorted(report['rebuilt'] + report['skipped'])
+    
+    def gig_files(self) -> Dict[str, str]:
+        """Gig file contents keyed by filename"""
         gig_templates = {
             'market_research_gig.md': {
                 'title': 'I will create comprehensive market research reports with competitive analysis and industry insights',
@@ -133,8 +377,11 @@ class FiverrTemplateCustomizer:
             }
         }
         
-        for filename, gig_info in gig_templates.items():
-            gig_content = self.generate_gig_template(gig_info)
+        return {filename: self.generate_gig_template(gig_info) for filename, gig_info in gig_templates.items()}
+    
+    def generate_fiverr_gig_files(self):
+        """Generate separate files for each Fiverr gig"""
+        for filename, gig_content in self.gig_files().items():
             output_file = self.output_dir / filename
             
             with open(output_file, 'w', encoding='utf-8') as f:
@@ -213,9 +460,9 @@ A: All packages include revisions, and I work with you until you're 100% satisfi
 *Contact me before placing an order to discuss your specific requirements and ensure the best results!*
 """
     
-    def generate_quick_responses(self):
-        """Generate Fiverr quick response templates"""
-        quick_responses = {
+    def quick_responses(self) -> Dict[str, str]:
+        """Quick response template contents keyed by filename"""
+        return {
             'initial_inquiry.txt': f"""Hi [Buyer Name],
 
 Thank you for your interest in my {'{service_type}'} services! I'm excited to help you achieve your business goals.
@@ -282,24 +529,381 @@ Best regards,
 {self.template_vars['seller_name']}
 {self.template_vars['seller_title']}"""
         }
-        
+    
+    def generate_quick_responses(self):
+        """Generate Fiverr quick response templates"""
         responses_dir = self.output_dir / 'quick_responses'
         responses_dir.mkdir(exist_ok=True)
         
-        for filename, content in quick_responses.items():
+        for filename, content in self.quick_responses().items():
             with open(responses_dir / filename, 'w', encoding='utf-8') as f:
                 f.write(content)
             print(f"✅ Generated quick response: {filename}")
+    
+    def customization_summary(self, file_names: List[str]) -> str:
+        """Markdown summary of the configuration used and the files generated"""
+        return f"""# Template Customization Summary
+
+## Configuration Used:
+- Seller Name: {self.template_vars['seller_name']}
+- Company: {self.template_vars['company_name']}
+- Experience: {self.template_vars['years_experience']} years
+- Credentials: {self.template_vars['mba_credential']}
+
+## Files Generated:
+{chr(10).join([f"- {name}" for name in file_names])}
+
+## Next Steps:
+1. Review all customized templates
+2. Update user_config.json with your actual information
+3. Re-run the script to regenerate with your details
+4. Upload gig templates to Fiverr
+5. Set up quick responses in Fiverr inbox
+
+## Support:
+If you need to modify any templates, edit the source files and re-run this script.
+"""
+    
+    def write_summary(self, processed_files: List[str]) -> Path:
+        """Write customization_summary.md for the given output files"""
+        summary_file = self.output_dir / "customization_summary.md"
+        with open(summary_file, 'w') as f:
+            f.write(self.customization_summary([Path(name).name for name in processed_files]))
+        return summary_file
+    
+    def iter_seller_files(self, templates: List[Tuple[str, str]]) -> Iterator[Tuple[str, str, List[str]]]:
+        """Yield (archive path, content, unknown placeholders) for a seller's full output tree.
+
+        ``templates`` are already-loaded (name, content) pairs (see load_template_set),
+        so many sellers can share one read of the source templates.
+        """
+        engine = self.substitution_engine()
+        names = []
+        for name, content in templates:
+            customized_content, unknown = engine.substitute(content)
+            names.append(f"customized_{name}")
+            yield names[-1], customized_content, unknown
+        for filename, content in self.gig_files().items():
+            yield filename, content, []
+        for filename, content in self.quick_responses().items():
+            yield f"quick_responses/{filename}", content, []
+        yield "customization_summary.md", self.customization_summary(names), []
+    
+    def write_seller_archive(self, templates: List[Tuple[str, str]], archive_path: str) -> Dict[str, Any]:
+        """Stream a seller's output tree into a zip archive, one entry at a time.
+
+        The archive is written to a temporary file and renamed into place, so
+        a crashed run never leaves a truncated archive behind.
+        """
+        archive_path = Path(archive_path)
+        tmp_path = archive_path.with_name(f".{archive_path.name}.{os.getpid()}.tmp")
+        files = 0
+        unknown: Dict[str, None] = {}
+        try:
+            with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                for name, content, missing in self.iter_seller_files(templates):
+                    archive.writestr(name, content)
+                    files += 1
+                    unknown.update(dict.fromkeys(missing))
+            os.replace(tmp_path, archive_path)
+        except BaseException:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
+        return {'archive': str(archive_path), 'files': files, 'unknown_placeholders': list(unknown)}
+
+
+BatchJob = Tuple[str, Dict[str, Any]]
+
+
+def load_template_set(templates_dir: str) -> List[Tuple[str, str]]:
+    """Read every source template once, as sorted (name, content) pairs"""
+    return [(path.name, _read_template(path)) for path in sorted(Path(templates_dir).glob('*.md'))]
+
+
+def _seller_id(config: Dict[str, Any], default: str) -> str:
+    seller_id = config.get('seller_id') or default
+    return re.sub(r'[^A-Za-z0-9]+', '_', str(seller_id)).strip('_').lower() or 'seller'
+
+
+def iter_user_configs(source: str) -> Iterator[BatchJob]:
+    """Yield (seller id, user config) pairs from a directory of *.json files or a JSONL file.
+
+    Configs may set ``seller_id``; otherwise the file stem (directory input)
+    or the line number and seller name (JSONL input) is used.
+    """
+    path = Path(source)
+    if path.is_dir():
+        for config_file in sorted(path.glob('*.json')):
+            with open(config_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            yield _seller_id(config, config_file.stem), config
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for index, line in enumerate(f, 1):
+            if line.strip():
+                config = json.loads(line)
+                yield _seller_id(config, f"{index:04d}_{config.get('seller_name', 'seller')}"), config
+
+
+_shared_templates: List[Tuple[str, str]] = []
+
+
+def _init_seller_worker(templates: List[Tuple[str, str]]):
+    global _shared_templates
+    _shared_templates = templates
+
+
+def _build_seller(job: BatchJob, output_dir: str, templates: List[Tuple[str, str]] = None) -> Dict[str, Any]:
+    """Render one seller's archive; never raises, errors are returned in the result"""
+    seller_id, config = job
+    started = time.perf_counter()
+    try:
+        customizer = FiverrTemplateCustomizer(templates_dir='.', output_dir=output_dir)
+        customizer.update_template_vars(config)
+        result = customizer.write_seller_archive(templates if templates is not None else _shared_templates,
+                                                 str(Path(output_dir) / f"{seller_id}.zip"))
+        result['error'] = None
+    except Exception as e:
+        result = {'archive': None, 'files': 0, 'unknown_placeholders': [], 'error': f"{type(e).__name__}: {e}"}
+    result.update({'seller_id': seller_id, 'seconds': time.perf_counter() - started})
+    return result
+
+
+def customize_sellers(configs: Iterable[BatchJob], templates_dir: str, output_dir: str,
+                      workers: int = 1) -> List[Dict[str, Any]]:
+    """Render templates, gig files and quick responses for many sellers, one zip archive each.
+
+    The source templates are read once and shared by every seller; with
+    ``workers`` > 1 they are handed to each pool process once at start-up.
+    Returns one result per seller in input order.
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    templates = load_template_set(templates_dir)
+    jobs: List[BatchJob] = []
+    seen: Dict[str, int] = {}
+    taken: set = set()
+    for seller_id, config in configs:
+        # Keep archives of sellers that resolve to the same id apart; a suffixed id
+        # must not collide with another seller's own id either
+        unique_id = seller_id
+        while unique_id in taken:
+            seen[seller_id] = seen.get(seller_id, 1) + 1
+            unique_id = f"{seller_id}_{seen[seller_id]}"
+        taken.add(unique_id)
+        jobs.append((unique_id, config))
+    
+    if workers <= 1 or len(jobs) <= 1:
+        results = [_build_seller(job, output_dir, templates) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_seller_worker,
+                                 initargs=(templates,)) as executor:
+            results = list(executor.map(_build_seller, jobs, repeat(output_dir)))
+    
+    for result in results:
+        if result['error']:
+            logger.error(f"Seller {result['seller_id']} failed: {result['error']}")
+    return results
+
+
+def run_batch(sellers: str, templates_dir: str, output_dir: str, workers: int = 1):
+    """Command-line batch mode: one archive per seller config"""
+    print(f"📁 Processing templates from: {templates_dir}")
+    print(f"📁 Seller configs: {sellers}")
+    print()
+    
+    started = time.perf_counter()
+    results = customize_sellers(iter_user_configs(sellers), templates_dir, output_dir, workers)
+    for result in results:
+        if result['error']:
+            print(f"❌ {result['seller_id']}: {result['error']}")
+            continue
+        print(f"✅ {result['seller_id']}: {result['files']} files -> {Path(result['archive']).name} "
+              f"({result['seconds'] * 1000:.0f} ms)")
+        if result['unknown_placeholders']:
+            print(f"⚠️ Unknown placeholders: {', '.join(result['unknown_placeholders'])}")
+    
+    built = sum(1 for result in results if not result['error'])
+    print(f"\n✅ Built {built}/{len(results)} seller archives in {time.perf_counter() - started:.2f}s")
+    print(f"📁 Archives saved to: {output_dir}")
+
+
+class TemplateWatcher:
+    """Regenerates customized outputs as source templates and the user config change.
+
+    Uses inotify when inotify_simple is installed and falls back to polling
+    file modification times otherwise. Bursts of events are debounced: a
+    rebuild starts once nothing has changed for ``debounce`` seconds. Template
+    edits rebuild just that template's output (via the build manifest); config
+    edits rebuild only the templates that read a changed variable, plus the
+    gig files, quick responses and summary.
+    """
+
+    def __init__(self, customizer: FiverrTemplateCustomizer, config_file: str = None,
+                 debounce: float = 0.2, poll_interval: float = 0.5, use_inotify: bool = True,
+                 workers: int = 1):
+        self.customizer = customizer
+        self.config_file = Path(config_file).resolve() if config_file else None
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.workers = workers
+        self._running = False
+        self._inotify = None
+        self._watched_dirs: Dict[int, Path] = {}
+        if use_inotify and INotify is not None:
+            self._start_inotify()
+        self._snapshot_state = self._snapshot() if self._inotify is None else {}
+    
+    @property
+    def backend(self) -> str:
+        return 'inotify' if self._inotify is not None else 'polling'
+    
+    def _is_relevant(self, path: Path) -> bool:
+        if self.config_file is not None and path == self.config_file:
+            return True
+        return (path.parent == self.customizer.templates_dir.resolve() and path.suffix == '.md'
+                and not path.name.startswith('.'))
+    
+    def _start_inotify(self):
+        self._inotify = INotify()
+        mask = (inotify_flags.CLOSE_WRITE | inotify_flags.CREATE | inotify_flags.DELETE
+                | inotify_flags.MOVED_FROM | inotify_flags.MOVED_TO)
+        # Watch directories rather than files so editors that save by rename are still seen
+        directories = {self.customizer.templates_dir.resolve()}
+        if self.config_file is not None:
+            directories.add(self.config_file.parent)
+        for directory in directories:
+            self._watched_dirs[self._inotify.add_watch(str(directory), mask)] = directory
+    
+    def _read_inotify(self, timeout: Optional[float]) -> set:
+        events = self._inotify.read(timeout=None if timeout is None else int(timeout * 1000))
+        changed = set()
+        for event in events:
+            directory = self._watched_dirs.get(event.wd)
+            if directory is not None and event.name:
+                path = directory / event.name
+                if self._is_relevant(path):
+                    changed.add(path)
+        return changed
+    
+    def _snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        paths = list(self.customizer.templates_dir.resolve().glob('*.md'))
+        if self.config_file is not None:
+            paths.append(self.config_file)
+        snapshot = {}
+        for path in paths:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if self._is_relevant(path):
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+    
+    def _poll(self) -> set:
+        current = self._snapshot()
+        previous, self._snapshot_state = self._snapshot_state, current
+        return {path for path in current.keys() | previous.keys() if current.get(path) != previous.get(path)}
+    
+    def wait_for_changes(self, timeout: Optional[float] = None) -> set:
+        """Block until a burst of changes has settled; returns the changed paths (empty on timeout)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed: set = set()
+        while not changed:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return changed
+            if self._inotify is not None:
+                changed = self._read_inotify(remaining if remaining is not None else 1.0)
+            else:
+                time.sleep(self.poll_interval if remaining is None else min(self.poll_interval, remaining))
+                changed = self._poll()
+        
+        # Debounce: keep collecting until the files have been quiet for a full interval
+        while True:
+            if self._inotify is not None:
+                more = self._read_inotify(self.debounce)
+            else:
+                time.sleep(self.debounce)
+                more = self._poll()
+            if not more:
+                return changed
+            changed |= more
+    
+    def regenerate(self, changed: set) -> Dict[str, Any]:
+        """Rebuild the outputs affected by the changed paths"""
+        started = time.perf_counter()
+        changed_vars: List[str] = []
+        if self.config_file is not None and self.config_file in changed:
+            changed_vars = self.customizer.reload_user_config(str(self.config_file))
+            if changed_vars:
+                print(f"🔧 Config changed: {', '.join(changed_vars)}")
+        
+        report = self.customizer.build_templates(workers=self.workers)
+        if changed_vars:
+            self.customizer.generate_fiverr_gig_files()
+            self.customizer.generate_quick_responses()
+        if changed_vars or report['rebuilt'] or report['deleted']:
+            self.customizer.write_summary(sorted(report['rebuilt'] + report['skipped']))
+        report['changed_vars'] = changed_vars
+        report['seconds'] = time.perf_counter() - started
+        print(f"⚡ Regenerated in {report['seconds'] * 1000:.0f} ms")
+        return report
+    
+    def run(self, max_cycles: int = None):
+        """Watch and regenerate until stopped (Ctrl+C) or ``max_cycles`` rebuilds have run"""
+        self._running = True
+        cycles = 0
+        print(f"👀 Watching {self.customizer.templates_dir}"
+              f"{f' and {self.config_file}' if self.config_file else ''} ({self.backend})")
+        try:
+            while self._running and (max_cycles is None or cycles < max_cycles):
+                changed = self.wait_for_changes(timeout=1.0)
+                if changed:
+                    print(f"\n📝 Changed: {', '.join(sorted(path.name for path in changed))}")
+                    self.regenerate(changed)
+                    cycles += 1
+        except KeyboardInterrupt:
+            print("\n👋 Watch mode stopped")
+        finally:
+            self.stop()
+    
+    def stop(self):
+        """Stop the watch loop and release the inotify handle"""
+        self._running = False
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
 
 def main():
     """Main function to run the template customizer"""
+    parser = argparse.ArgumentParser(description="Personalize Fiverr templates with seller information")
+    parser.add_argument('--templates-dir', default="/home/ubuntu/upload/extracted_files")
+    parser.add_argument('--output-dir', default="/home/ubuntu/fiverr_automation_system/customized_templates")
+    parser.add_argument('--config', default="/home/ubuntu/fiverr_automation_system/user_config.json",
+                        help="Seller config for a single run")
+    parser.add_argument('--sellers', help="Directory of seller *.json configs or a JSONL file; "
+                                          "writes one zip archive per seller to --output-dir")
+    parser.add_argument('--workers', type=int, default=1, help="Processes used to customize in parallel")
+    parser.add_argument('--force', action='store_true', help="Rebuild outputs even if they are up to date")
+    parser.add_argument('--watch', action='store_true',
+                        help="Keep running and regenerate outputs when templates or the config change")
+    parser.add_argument('--debounce', type=float, default=0.2, help="Seconds of quiet before a watch rebuild")
+    parser.add_argument('--poll', action='store_true', help="Watch by polling even if inotify is available")
+    args = parser.parse_args()
+    
     print("🚀 Fiverr Template Customization Tool")
     print("=" * 50)
     
+    if args.sellers:
+        run_batch(args.sellers, args.templates_dir, args.output_dir, args.workers)
+        return
+    
     # Set up paths
-    templates_dir = "/home/ubuntu/upload/extracted_files"
-    output_dir = "/home/ubuntu/fiverr_automation_system/customized_templates"
-    config_file = "/home/ubuntu/fiverr_automation_system/user_config.json"
+    templates_dir = args.templates_dir
+    output_dir = args.output_dir
+    config_file = args.config
     
     # Initialize customizer
     customizer = FiverrTemplateCustomizer(templates_dir, output_dir)
@@ -313,7 +917,7 @@ def main():
     print()
     
     # Process all templates
-    processed_files = customizer.process_all_templates()
+    processed_files = customizer.process_all_templates(args.force, args.workers)
     
     # Generate Fiverr-specific files
     print("\n🎯 Generating Fiverr gig templates...")
@@ -327,31 +931,13 @@ def main():
     print(f"📁 All customized files saved to: {output_dir}")
     
     # Generate summary report
-    summary_file = Path(output_dir) / "customization_summary.md"
-    with open(summary_file, 'w') as f:
-        f.write(f"""# Template Customization Summary
-
-## Configuration Used:
-- Seller Name: {customizer.template_vars['seller_name']}
-- Company: {customizer.template_vars['company_name']}
-- Experience: {customizer.template_vars['years_experience']} years
-- Credentials: {customizer.template_vars['mba_credential']}
-
-## Files Generated:
-{chr(10).join([f"- {Path(f).name}" for f in processed_files])}
-
-## Next Steps:
-1. Review all customized templates
-2. Update user_config.json with your actual information
-3. Re-run the script to regenerate with your details
-4. Upload gig templates to Fiverr
-5. Set up quick responses in Fiverr inbox
-
-## Support:
-If you need to modify any templates, edit the source files and re-run this script.
-""")
+    summary_file = customizer.write_summary(processed_files)
     
     print(f"📋 Summary report saved to: {summary_file}")
+    
+    if args.watch:
+        TemplateWatcher(customizer, config_file, debounce=args.debounce, use_inotify=not args.poll,
+                        workers=args.workers).run()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,168 @@
+"""
+Tests for the outbox delivery worker against a local SMTP server (aiosmtpd)
+"""
+
+import socket
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip('aiosmtpd')
+from aiosmtpd.controller import Controller
+
+from outbox_worker import OutboxDeliveryWorker, SMTPConnectionPool
+from workflow_automation import FiverrWorkflowAutomation
+
+REJECTED = 'reject@example.com'
+
+
+class RecordingHandler:
+    """Accepts every message except those addressed to REJECTED (temporary failure)"""
+
+    def __init__(self):
+        self.messages = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address == REJECTED:
+            return '451 Temporary failure, try again later'
+        envelope.rcpt_tos.append(address)
+        return '250 OK'
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((envelope.mail_from, list(envelope.rcpt_tos), envelope.content))
+        return '250 Message accepted for delivery'
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname='127.0.0.1', port=_free_port())
+    controller.start()
+    try:
+        yield controller, handler
+    finally:
+        controller.stop()
+
+
+@pytest.fixture
+def automation(tmp_path):
+    automation = FiverrWorkflowAutomation(str(tmp_path / 'outbox.db'))
+    try:
+        yield automation
+    finally:
+        automation.close()
+
+
+def _worker(automation, controller, **options) -> OutboxDeliveryWorker:
+    pool = SMTPConnectionPool(controller.hostname, controller.port, max_connections=2, timeout=5.0)
+    options.setdefault('rate_per_second', 0)
+    return OutboxDeliveryWorker(automation.db, pool, sender='seller@example.com', max_workers=2, **options)
+
+
+def _enqueue(automation, recipient: str, subject: str = 'Hello') -> int:
+    with automation.db.transaction() as conn:
+        automation._enqueue_outbox(conn, [(None, None, 'test', recipient, subject, 'Body text',
+                                           datetime.now().isoformat())])
+        return conn.execute('SELECT MAX(id) FROM outbox').fetchone()[0]
+
+
+def _row(automation, outbox_id: int):
+    return automation.db.connection().execute(
+        'SELECT status, attempts, next_attempt_at, last_error, sent_date FROM outbox WHERE id = ?',
+        (outbox_id,)).fetchone()
+
+
+def test_claim_send_marks_sent(automation, smtp_server):
+    controller, handler = smtp_server
+    outbox_id = _enqueue(automation, 'buyer@example.com', 'Project kickoff')
+    worker = _worker(automation, controller)
+
+    claimed = worker.claim_batch()
+    assert [row[0] for row in claimed] == [outbox_id]
+    assert _row(automation, outbox_id)[0] == 'sending'
+    assert worker.claim_batch() == []
+
+    counts = worker._record_results(claimed, dict(map(worker._deliver, claimed)))
+    worker.smtp_pool.close_all()
+
+    assert counts == {'sent': 1, 'retry': 0, 'failed': 0}
+    status, attempts, _, last_error, sent_date = _row(automation, outbox_id)
+    assert (status, attempts, last_error) == ('sent', 1, None)
+    assert sent_date is not None
+    assert len(handler.messages) == 1
+    mail_from, recipients, content = handler.messages[0]
+    assert mail_from == 'seller@example.com'
+    assert recipients == ['buyer@example.com']
+    assert b'Subject: Project kickoff' in content
+
+
+def test_failed_delivery_retries_with_backoff(automation, smtp_server):
+    controller, handler = smtp_server
+    outbox_id = _enqueue(automation, REJECTED)
+    worker = _worker(automation, controller, backoff_base=60.0, max_attempts=2)
+
+    before = datetime.now()
+    assert worker.run_once() == {'sent': 0, 'retry': 1, 'failed': 0}
+    status, attempts, next_attempt_at, last_error, _ = _row(automation, outbox_id)
+    assert (status, attempts) == ('pending', 1)
+    assert '451' in last_error
+    # First retry waits backoff_base seconds, with +/-20% jitter
+    delay = (datetime.fromisoformat(next_attempt_at) - before).total_seconds()
+    assert 48.0 <= delay <= 73.0
+    # Not due yet, so nothing is claimed
+    assert worker.run_once() == {'sent': 0, 'retry': 0, 'failed': 0}
+
+    with automation.db.transaction() as conn:
+        conn.execute('UPDATE outbox SET next_attempt_at = ? WHERE id = ?', (before.isoformat(), outbox_id))
+    assert worker.run_once() == {'sent': 0, 'retry': 0, 'failed': 1}
+    worker.smtp_pool.close_all()
+
+    status, attempts, _, _, _ = _row(automation, outbox_id)
+    assert (status, attempts) == ('failed', 2)
+    assert handler.messages == []
+
+
+def test_stale_sending_lease_is_reclaimed(automation, smtp_server):
+    controller, handler = smtp_server
+    stale_id = _enqueue(automation, 'stale@example.com')
+    fresh_id = _enqueue(automation, 'fresh@example.com')
+    worker = _worker(automation, controller, lease_seconds=60.0)
+
+    now = datetime.now()
+    with automation.db.transaction() as conn:
+        # One row abandoned by a crashed worker long ago, one still held by a live worker
+        conn.execute("UPDATE outbox SET status = 'sending', claimed_at = ? WHERE id = ?",
+                     ((now - timedelta(seconds=600)).isoformat(), stale_id))
+        conn.execute("UPDATE outbox SET status = 'sending', claimed_at = ? WHERE id = ?",
+                     (now.isoformat(), fresh_id))
+
+    assert worker.drain() == {'sent': 1, 'retry': 0, 'failed': 0}
+    worker.smtp_pool.close_all()
+
+    # The expired lease counts as one attempt, the delivery as another
+    assert _row(automation, stale_id)[:2] == ('sent', 2)
+    assert _row(automation, fresh_id)[0] == 'sending'
+    assert [recipients for _, recipients, _ in handler.messages] == [['stale@example.com']]
+
+
+def test_repeatedly_expired_lease_is_given_up(automation, smtp_server):
+    controller, handler = smtp_server
+    outbox_id = _enqueue(automation, 'poison@example.com')
+    worker = _worker(automation, controller, lease_seconds=60.0, max_attempts=3)
+
+    expired = (datetime.now() - timedelta(seconds=600)).isoformat()
+    with automation.db.transaction() as conn:
+        # Two earlier claims already died with this row
+        conn.execute("UPDATE outbox SET status = 'sending', claimed_at = ?, attempts = 2 WHERE id = ?",
+                     (expired, outbox_id))
+
+    assert worker.claim_batch() == []
+    status, attempts, _, last_error, _ = _row(automation, outbox_id)
+    assert (status, attempts, last_error) == ('failed', 3, 'delivery lease expired')
+    assert handler.messages == []
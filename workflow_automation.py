@@ -5,146 +5,117 @@ Automates client communication, project tracking, and report generation
 """
 
 import os
+import re
+import argparse
+import functools
 import json
+import queue
+import random
+import time
+import string
 import sqlite3
-import smtplib
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator, Iterable, Tuple, Union, Callable
 import logging
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class FiverrWorkflowAutomation:
-    def __init__(self, db_path: str = "fiverr_business.db"):
-        self.db_path = db_path
-        self.init_database()
-        self.templates_dir = Path("customized_templates")
-        
-    def init_database(self):
-        """Initialize SQLite database for tracking projects and clients"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create clients table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS clients (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                email TEXT NOT NULL,
-                fiverr_username TEXT,
-                first_contact_date TEXT,
-                total_projects INTEGER DEFAULT 0,
-                total_revenue REAL DEFAULT 0,
-                satisfaction_rating INTEGER,
-                notes TEXT
-            )
-        ''')
-        
-        # Create projects table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS projects (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                client_id INTEGER,
-                project_type TEXT NOT NULL,
-                title TEXT NOT NULL,
-                description TEXT,
-                status TEXT DEFAULT 'pending',
-                start_date TEXT,
-                due_date TEXT,
-                completion_date TEXT,
-                package_type TEXT,
-                price REAL,
-                requirements TEXT,
-                deliverables TEXT,
-                notes TEXT,
-                FOREIGN KEY (client_id) REFERENCES clients (id)
-            )
-        ''')
-        
-        # Create communications table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS communications (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                project_id INTEGER,
-                client_id INTEGER,
-                message_type TEXT,
-                subject TEXT,
-                content TEXT,
-                sent_date TEXT,
-                response_required BOOLEAN DEFAULT 0,
-                FOREIGN KEY (project_id) REFERENCES projects (id),
-                FOREIGN KEY (client_id) REFERENCES clients (id)
-            )
-        ''')
-        
-        # Create templates table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS templates (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                category TEXT,
-                subject TEXT,
-                content TEXT,
-                variables TEXT,
-                usage_count INTEGER DEFAULT 0
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
-        logger.info("Database initialized successfully")
+# Bound parameters per statement; SQLite builds before 3.32 reject more than 999
+MAX_SQL_PARAMS = 900
+
+
+def _chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of up to ``size`` items without materialising the whole iterable"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _create_base_tables(conn: sqlite3.Connection):
+    """Migration 1: the original workflow tables"""
+    cursor = conn.cursor()
     
-    def add_client(self, name: str, email: str, fiverr_username: str = None) -> int:
-        """Add a new client to the database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO clients (name, email, fiverr_username, first_contact_date)
-            VALUES (?, ?, ?, ?)
-        ''', (name, email, fiverr_username, datetime.now().isoformat()))
-        
-        client_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        logger.info(f"Added new client: {name} (ID: {client_id})")
-        return client_id
+    # Create clients table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS clients (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT NOT NULL,
+            fiverr_username TEXT,
+            first_contact_date TEXT,
+            total_projects INTEGER DEFAULT 0,
+            total_revenue REAL DEFAULT 0,
+            satisfaction_rating INTEGER,
+            notes TEXT
+        )
+    ''')
     
-    def create_project(self, client_id: int, project_type: str, title: str, 
-                      package_type: str, price: float, due_days: int = 7) -> int:
-        """Create a new project"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        start_date = datetime.now()
-        due_date = start_date + timedelta(days=due_days)
-        
-        cursor.execute('''
-            INSERT INTO projects (client_id, project_type, title, package_type, 
-                                price, start_date, due_date, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, 'active')
-        ''', (client_id, project_type, title, package_type, price, 
-              start_date.isoformat(), due_date.isoformat()))
-        
-        project_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        logger.info(f"Created new project: {title} (ID: {project_id})")
-        return project_id
+    # Create projects table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS projects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            client_id INTEGER,
+            project_type TEXT NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT,
+            status TEXT DEFAULT 'pending',
+            start_date TEXT,
+            due_date TEXT,
+            completion_date TEXT,
+            package_type TEXT,
+            price REAL,
+            requirements TEXT,
+            deliverables TEXT,
+            notes TEXT,
+            FOREIGN KEY (client_id) REFERENCES clients (id)
+        )
+    ''')
     
-    def get_template(self, template_name: str) -> Optional[Dict[str, Any]]:
-        """Get a communication template"""
-        templates = {
-            'initial_inquiry': {
-                'subject': 'Thank you for your interest in my {service_type} services',
-                'content': '''Hi {client_name},
+    # Create communications table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS communications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER,
+            client_id INTEGER,
+            message_type TEXT,
+            subject TEXT,
+            content TEXT,
+            sent_date TEXT,
+            response_required BOOLEAN DEFAULT 0,
+            FOREIGN KEY (project_id) REFERENCES projects (id),
+            FOREIGN KEY (client_id) REFERENCES clients (id)
+        )
+    ''')
+    
+    # Create templates table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS templates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            category TEXT,
+            subject TEXT,
+            content TEXT,
+            variables TEXT,
+            usage_count INTEGER DEFAULT 0
+        )
+    ''')
+
+
+# Built-in client communication templates, seeded into the templates table
+DEFAULT_MESSAGE_TEMPLATES: Dict[str, Dict[str, str]] = {
+    'initial_inquiry': {
+        'subject': 'Thank you for your interest in my {service_type} services',
+        'content': '''Hi {client_name},
 
 Thank you for your interest in my {service_type} services! I'm excited to help you achieve your business goals.
 
@@ -162,10 +133,10 @@ Looking forward to working with you!
 
 Best regards,
 {seller_name}'''
-            },
-            'project_kickoff': {
-                'subject': 'Project Kickoff - {project_title}',
-                'content': '''Hi {client_name},
+    },
+    'project_kickoff': {
+        'subject': 'Project Kickoff - {project_title}',
+        'content': '''Hi {client_name},
 
 Great! I'm excited to start working on your {project_type} project. Here's what happens next:
 
@@ -192,10 +163,10 @@ Let's create something amazing together!
 
 Best regards,
 {seller_name}'''
-            },
-            'progress_update': {
-                'subject': 'Progress Update - {project_title}',
-                'content': '''Hi {client_name},
+    },
+    'progress_update': {
+        'subject': 'Progress Update - {project_title}',
+        'content': '''Hi {client_name},
 
 I wanted to provide you with a quick update on your {project_type} project.
 
@@ -214,10 +185,10 @@ If you have any questions or need clarification on anything, please don't hesita
 
 Best regards,
 {seller_name}'''
-            },
-            'delivery_notification': {
-                'subject': 'Project Complete - {project_title}',
-                'content': '''Hi {client_name},
+    },
+    'delivery_notification': {
+        'subject': 'Project Complete - {project_title}',
+        'content': '''Hi {client_name},
 
 Excellent news! Your {project_type} project is now complete and ready for delivery.
 
@@ -238,10 +209,10 @@ Thank you for choosing my services!
 
 Best regards,
 {seller_name}'''
-            },
-            'follow_up': {
-                'subject': 'Following up on your {project_type} project',
-                'content': '''Hi {client_name},
+    },
+    'follow_up': {
+        'subject': 'Following up on your {project_type} project',
+        'content': '''Hi {client_name},
 
 I hope you've had a chance to review the {project_type} deliverables I sent last week.
 
@@ -260,77 +231,1201 @@ I'm here to support your continued success. Please let me know if there's anythi
 
 Best regards,
 {seller_name}'''
-            }
+    }
+}
+
+
+def _template_fields(text: str) -> set:
+    """Return the root names of every ``{field}`` used in a str.format template"""
+    fields = set()
+    for _, field_name, _, _ in string.Formatter().parse(text):
+        if field_name is None:
+            continue
+        root = re.split(r'[.\[]', field_name, 1)[0]
+        if not root or root.isdigit():
+            raise ValueError(f"Positional placeholder '{{{field_name}}}' is not allowed in templates")
+        fields.add(root)
+    return fields
+
+
+def _seed_default_templates(conn: sqlite3.Connection):
+    """Insert the built-in templates that are not already in the templates table"""
+    for name, template in DEFAULT_MESSAGE_TEMPLATES.items():
+        variables = sorted(_template_fields(template['subject']) | _template_fields(template['content']))
+        conn.execute('''
+            INSERT INTO templates (name, category, subject, content, variables)
+            SELECT ?, ?, ?, ?, ?
+            WHERE NOT EXISTS (SELECT 1 FROM templates WHERE name = ?)
+        ''', (name, 'client_communication', template['subject'], template['content'],
+              json.dumps(variables), name))
+
+
+class InvalidTransitionError(ValueError):
+    """Raised when a project status change is not allowed by PROJECT_LIFECYCLE"""
+
+
+# Project lifecycle: status -> statuses it may move to. Re-entering the current
+# status is always allowed.
+PROJECT_LIFECYCLE: Dict[str, Tuple[str, ...]] = {
+    'pending': ('active', 'on_hold', 'cancelled'),
+    'active': ('in_progress', 'review', 'completed', 'on_hold', 'cancelled'),
+    'in_progress': ('review', 'completed', 'on_hold', 'cancelled'),
+    'review': ('revision', 'in_progress', 'completed'),
+    'revision': ('review', 'in_progress', 'completed'),
+    'on_hold': ('active', 'in_progress', 'cancelled'),
+    'completed': ('revision',),
+    'cancelled': (),
+}
+
+# Projects with no status, or a legacy/imported one outside PROJECT_LIFECYCLE,
+# may be moved into the lifecycle through these statuses
+UNKNOWN_STATUS_TARGETS: Tuple[str, ...] = ('pending', 'in_progress')
+
+# Side effects of entering a status: a message template (with extra variables)
+# and optionally a follow-up scheduled some days later.
+STATUS_ACTIONS: Dict[str, Dict[str, Any]] = {
+    'active': {
+        'template': 'project_kickoff'
+    },
+    'in_progress': {
+        'template': 'progress_update',
+        'custom_vars': {
+            'progress_percentage': '50',
+            'current_task': 'Data analysis and insights generation',
+            'completed_tasks': '• Initial research completed\\n• Data collection finalized',
+            'next_steps': '• Complete analysis\\n• Generate recommendations\\n• Prepare final report'
         }
+    },
+    'completed': {
+        'template': 'delivery_notification',
+        'custom_vars': {
+            'deliverables_list': '• Comprehensive analysis report\\n• Executive summary\\n• Data visualizations\\n• Strategic recommendations',
+            'key_findings': 'Key insights and actionable recommendations included in the full report.'
+        },
+        'follow_up_days': 7
+    },
+}
+
+
+def _rebuild_dashboard_summary(conn: sqlite3.Connection):
+    """Recompute the dashboard summary tables from projects and clients"""
+    conn.execute('DELETE FROM project_status_summary')
+    conn.execute('''
+        INSERT INTO project_status_summary (status, project_count, total_price)
+        SELECT IFNULL(status, ''), COUNT(*), IFNULL(SUM(price), 0)
+        FROM projects
+        GROUP BY IFNULL(status, '')
+    ''')
+    conn.execute('''
+        INSERT OR REPLACE INTO client_summary (id, client_count)
+        SELECT 1, COUNT(*) FROM clients
+    ''')
+
+
+def _create_search_index(conn: sqlite3.Connection):
+    """Create trigger-maintained FTS5 indexes over communications and projects"""
+    try:
+        conn.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS communications_fts
+            USING fts5(subject, content, content='communications', content_rowid='id')
+        ''')
+    except sqlite3.OperationalError as e:
+        # Some SQLite builds ship without FTS5; search is then unavailable
+        logger.warning(f"Full-text search disabled: {e}")
+        return
+    
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts
+        USING fts5(title, description, requirements, content='projects', content_rowid='id')
+    ''')
+    
+    # External-content FTS tables are kept in sync by triggers on every write path
+    for statement in (
+        '''CREATE TRIGGER IF NOT EXISTS trg_communications_fts_insert AFTER INSERT ON communications
+           BEGIN
+               INSERT INTO communications_fts (rowid, subject, content)
+               VALUES (NEW.id, NEW.subject, NEW.content);
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_communications_fts_delete AFTER DELETE ON communications
+           BEGIN
+               INSERT INTO communications_fts (communications_fts, rowid, subject, content)
+               VALUES ('delete', OLD.id, OLD.subject, OLD.content);
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_communications_fts_update
+           AFTER UPDATE OF subject, content ON communications
+           BEGIN
+               INSERT INTO communications_fts (communications_fts, rowid, subject, content)
+               VALUES ('delete', OLD.id, OLD.subject, OLD.content);
+               INSERT INTO communications_fts (rowid, subject, content)
+               VALUES (NEW.id, NEW.subject, NEW.content);
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_projects_fts_insert AFTER INSERT ON projects
+           BEGIN
+               INSERT INTO projects_fts (rowid, title, description, requirements)
+               VALUES (NEW.id, NEW.title, NEW.description, NEW.requirements);
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_projects_fts_delete AFTER DELETE ON projects
+           BEGIN
+               INSERT INTO projects_fts (projects_fts, rowid, title, description, requirements)
+               VALUES ('delete', OLD.id, OLD.title, OLD.description, OLD.requirements);
+           END''',
+        # Status changes do not touch the indexed text, so they do not reindex
+        '''CREATE TRIGGER IF NOT EXISTS trg_projects_fts_update
+           AFTER UPDATE OF title, description, requirements ON projects
+           BEGIN
+               INSERT INTO projects_fts (projects_fts, rowid, title, description, requirements)
+               VALUES ('delete', OLD.id, OLD.title, OLD.description, OLD.requirements);
+               INSERT INTO projects_fts (rowid, title, description, requirements)
+               VALUES (NEW.id, NEW.title, NEW.description, NEW.requirements);
+           END''',
+    ):
+        conn.execute(statement)
+    
+    # Index rows that existed before this migration
+    conn.execute("INSERT INTO communications_fts (communications_fts) VALUES ('rebuild')")
+    conn.execute("INSERT INTO projects_fts (projects_fts) VALUES ('rebuild')")
+
+
+def _fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching all of its words (prefix match on the last)"""
+    terms = [term.replace('"', '""') for term in text.split()]
+    if not terms:
+        return ''
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def _rebuild_revenue_rollups(conn: sqlite3.Connection):
+    """Recompute clients.total_projects/total_revenue and monthly_revenue from projects"""
+    conn.execute('''
+        UPDATE clients SET
+            total_projects = (SELECT COUNT(*) FROM projects p WHERE p.client_id = clients.id),
+            total_revenue = (SELECT IFNULL(SUM(p.price), 0) FROM projects p
+                             WHERE p.client_id = clients.id AND p.status = 'completed')
+    ''')
+    conn.execute('DELETE FROM monthly_revenue')
+    conn.execute('''
+        INSERT INTO monthly_revenue (month, completed_projects, revenue)
+        SELECT substr(COALESCE(completion_date, start_date, ''), 1, 7), COUNT(*), IFNULL(SUM(price), 0)
+        FROM projects
+        WHERE status = 'completed'
+        GROUP BY 1
+    ''')
+
+
+# Ordered schema migrations: (version, description, steps). A step is either an
+# SQL statement or a callable taking the connection. Versions are append-only;
+# never edit a migration that has shipped, add a new one instead.
+Migration = Tuple[int, str, List[Union[str, Callable[[sqlite3.Connection], None]]]]
+
+SCHEMA_MIGRATIONS: List[Migration] = [
+    (1, 'base tables', [_create_base_tables]),
+    (2, 'indexes for dashboard, report and dedupe access paths', [
+        # Status counts and completed-revenue sums are answered from the index alone
+        'CREATE INDEX IF NOT EXISTS idx_projects_status_price ON projects (status, price)',
+        # Recent-projects listing (ORDER BY start_date DESC LIMIT n)
+        'CREATE INDEX IF NOT EXISTS idx_projects_start_date ON projects (start_date)',
+        'CREATE INDEX IF NOT EXISTS idx_projects_client_id ON projects (client_id)',
+        # Project report: WHERE project_id = ? ORDER BY sent_date, covering the selected columns
+        '''CREATE INDEX IF NOT EXISTS idx_communications_project_sent
+           ON communications (project_id, sent_date, message_type, subject)''',
+        # Bulk import deduplication
+        'CREATE INDEX IF NOT EXISTS idx_clients_email_lower ON clients (lower(email))',
+        'CREATE INDEX IF NOT EXISTS idx_clients_fiverr_username ON clients (fiverr_username)',
+        'CREATE INDEX IF NOT EXISTS idx_templates_name ON templates (name)',
+    ]),
+    (3, 'trigger-maintained dashboard summary tables', [
+        # One row per project status; NULL statuses are folded into ''
+        '''CREATE TABLE IF NOT EXISTS project_status_summary (
+               status TEXT PRIMARY KEY,
+               project_count INTEGER NOT NULL DEFAULT 0,
+               total_price REAL NOT NULL DEFAULT 0
+           )''',
+        '''CREATE TABLE IF NOT EXISTS client_summary (
+               id INTEGER PRIMARY KEY CHECK (id = 1),
+               client_count INTEGER NOT NULL DEFAULT 0
+           )''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_projects_summary_insert AFTER INSERT ON projects
+           BEGIN
+               INSERT INTO project_status_summary (status, project_count, total_price)
+               VALUES (IFNULL(NEW.status, ''), 1, IFNULL(NEW.price, 0))
+               ON CONFLICT (status) DO UPDATE SET
+                   project_count = project_count + 1,
+                   total_price = total_price + excluded.total_price;
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_projects_summary_delete AFTER DELETE ON projects
+           BEGIN
+               UPDATE project_status_summary
+               SET project_count = project_count - 1,
+                   total_price = total_price - IFNULL(OLD.price, 0)
+               WHERE status = IFNULL(OLD.status, '');
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_projects_summary_update AFTER UPDATE OF status, price ON projects
+           WHEN IFNULL(OLD.status, '') IS NOT IFNULL(NEW.status, '') OR OLD.price IS NOT NEW.price
+           BEGIN
+               UPDATE project_status_summary
+               SET project_count = project_count - 1,
+                   total_price = total_price - IFNULL(OLD.price, 0)
+               WHERE status = IFNULL(OLD.status, '');
+               INSERT INTO project_status_summary (status, project_count, total_price)
+               VALUES (IFNULL(NEW.status, ''), 1, IFNULL(NEW.price, 0))
+               ON CONFLICT (status) DO UPDATE SET
+                   project_count = project_count + 1,
+                   total_price = total_price + excluded.total_price;
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_clients_summary_insert AFTER INSERT ON clients
+           BEGIN
+               UPDATE client_summary SET client_count = client_count + 1 WHERE id = 1;
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_clients_summary_delete AFTER DELETE ON clients
+           BEGIN
+               UPDATE client_summary SET client_count = client_count - 1 WHERE id = 1;
+           END''',
+        _rebuild_dashboard_summary,
+    ]),
+    (4, 'template catalogue revision tracking and built-in templates', [
+        # Bumped on every template edit so cached compilations can be invalidated
+        '''CREATE TABLE IF NOT EXISTS template_catalog (
+               id INTEGER PRIMARY KEY CHECK (id = 1),
+               revision INTEGER NOT NULL DEFAULT 0
+           )''',
+        'INSERT OR IGNORE INTO template_catalog (id, revision) VALUES (1, 0)',
+        '''CREATE TRIGGER IF NOT EXISTS trg_templates_revision_insert AFTER INSERT ON templates
+           BEGIN
+               UPDATE template_catalog SET revision = revision + 1 WHERE id = 1;
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_templates_revision_update
+           AFTER UPDATE OF name, subject, content, variables ON templates
+           BEGIN
+               UPDATE template_catalog SET revision = revision + 1 WHERE id = 1;
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_templates_revision_delete AFTER DELETE ON templates
+           BEGIN
+               UPDATE template_catalog SET revision = revision + 1 WHERE id = 1;
+           END''',
+        _seed_default_templates,
+    ]),
+    (5, 'email outbox for background delivery', [
+        '''CREATE TABLE IF NOT EXISTS outbox (
+               id INTEGER PRIMARY KEY AUTOINCREMENT,
+               project_id INTEGER,
+               client_id INTEGER,
+               message_type TEXT,
+               recipient TEXT NOT NULL,
+               subject TEXT,
+               content TEXT,
+               status TEXT NOT NULL DEFAULT 'pending',
+               attempts INTEGER NOT NULL DEFAULT 0,
+               next_attempt_at TEXT NOT NULL,
+               claimed_at TEXT,
+               last_error TEXT,
+               created_date TEXT,
+               sent_date TEXT
+           )''',
+        # Delivery worker claims pending rows in due order
+        'CREATE INDEX IF NOT EXISTS idx_outbox_status_due ON outbox (status, next_attempt_at)',
+    ]),
+    (6, 'persistent scheduled tasks', [
+        '''CREATE TABLE IF NOT EXISTS scheduled_tasks (
+               id INTEGER PRIMARY KEY AUTOINCREMENT,
+               task_type TEXT NOT NULL,
+               project_id INTEGER,
+               payload TEXT,
+               due_at TEXT NOT NULL,
+               status TEXT NOT NULL DEFAULT 'pending',
+               created_date TEXT,
+               completed_date TEXT,
+               last_error TEXT,
+               FOREIGN KEY (project_id) REFERENCES projects (id)
+           )''',
+        # Partial index: the runner only ever asks "what is the next pending task"
+        '''CREATE INDEX IF NOT EXISTS idx_scheduled_tasks_pending_due
+           ON scheduled_tasks (due_at) WHERE status = 'pending'
+        ''',
+    ]),
+    (7, 'full-text search over communications and projects', [_create_search_index]),
+    (8, 'client lifetime and monthly revenue rollups', [
+        # Revenue is booked in the month a project was completed
+        '''CREATE TABLE IF NOT EXISTS monthly_revenue (
+               month TEXT PRIMARY KEY,
+               completed_projects INTEGER NOT NULL DEFAULT 0,
+               revenue REAL NOT NULL DEFAULT 0
+           )''',
+        'CREATE INDEX IF NOT EXISTS idx_clients_total_revenue ON clients (total_revenue DESC)',
+        '''CREATE TRIGGER IF NOT EXISTS trg_projects_rollup_insert AFTER INSERT ON projects
+           BEGIN
+               UPDATE clients
+               SET total_projects = IFNULL(total_projects, 0) + 1,
+                   total_revenue = IFNULL(total_revenue, 0)
+                       + CASE WHEN NEW.status = 'completed' THEN IFNULL(NEW.price, 0) ELSE 0 END
+               WHERE id = NEW.client_id;
+               INSERT INTO monthly_revenue (month, completed_projects, revenue)
+               SELECT substr(COALESCE(NEW.completion_date, NEW.start_date, ''), 1, 7), 1, IFNULL(NEW.price, 0)
+               WHERE NEW.status = 'completed'
+               ON CONFLICT (month) DO UPDATE SET
+                   completed_projects = completed_projects + 1,
+                   revenue = revenue + excluded.revenue;
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_projects_rollup_delete AFTER DELETE ON projects
+           BEGIN
+               UPDATE clients
+               SET total_projects = IFNULL(total_projects, 0) - 1,
+                   total_revenue = IFNULL(total_revenue, 0)
+                       - CASE WHEN OLD.status = 'completed' THEN IFNULL(OLD.price, 0) ELSE 0 END
+               WHERE id = OLD.client_id;
+               UPDATE monthly_revenue
+               SET completed_projects = completed_projects - 1,
+                   revenue = revenue - IFNULL(OLD.price, 0)
+               WHERE OLD.status = 'completed'
+                 AND month = substr(COALESCE(OLD.completion_date, OLD.start_date, ''), 1, 7);
+           END''',
+        # Fires only when a change can move revenue or project counts between rows
+        '''CREATE TRIGGER IF NOT EXISTS trg_projects_rollup_update
+           AFTER UPDATE OF status, price, client_id, completion_date, start_date ON projects
+           WHEN OLD.client_id IS NOT NEW.client_id
+             OR ((OLD.status = 'completed' OR NEW.status = 'completed')
+                 AND (OLD.status IS NOT NEW.status OR OLD.price IS NOT NEW.price
+                      OR OLD.completion_date IS NOT NEW.completion_date
+                      OR OLD.start_date IS NOT NEW.start_date))
+           BEGIN
+               UPDATE clients
+               SET total_projects = IFNULL(total_projects, 0) - 1,
+                   total_revenue = IFNULL(total_revenue, 0)
+                       - CASE WHEN OLD.status = 'completed' THEN IFNULL(OLD.price, 0) ELSE 0 END
+               WHERE id = OLD.client_id;
+               UPDATE clients
+               SET total_projects = IFNULL(total_projects, 0) + 1,
+                   total_revenue = IFNULL(total_revenue, 0)
+                       + CASE WHEN NEW.status = 'completed' THEN IFNULL(NEW.price, 0) ELSE 0 END
+               WHERE id = NEW.client_id;
+               UPDATE monthly_revenue
+               SET completed_projects = completed_projects - 1,
+                   revenue = revenue - IFNULL(OLD.price, 0)
+               WHERE OLD.status = 'completed'
+                 AND month = substr(COALESCE(OLD.completion_date, OLD.start_date, ''), 1, 7);
+               INSERT INTO monthly_revenue (month, completed_projects, revenue)
+               SELECT substr(COALESCE(NEW.completion_date, NEW.start_date, ''), 1, 7), 1, IFNULL(NEW.price, 0)
+               WHERE NEW.status = 'completed'
+               ON CONFLICT (month) DO UPDATE SET
+                   completed_projects = completed_projects + 1,
+                   revenue = revenue + excluded.revenue;
+           END''',
+        _rebuild_revenue_rollups,
+    ]),
+    (9, 'whitespace-insensitive client email dedupe index', [
+        # add_clients_bulk matches stored emails on lower(trim(email))
+        'CREATE INDEX IF NOT EXISTS idx_clients_email_normalized ON clients (lower(trim(email)))',
+        'DROP INDEX IF EXISTS idx_clients_email_lower',
+    ]),
+]
+
+
+def _is_busy_error(error: sqlite3.OperationalError) -> bool:
+    """Whether an OperationalError is SQLITE_BUSY/SQLITE_LOCKED ("database is locked")"""
+    code = getattr(error, 'sqlite_errorcode', None)
+    if code is not None:
+        return code & 0xff in (5, 6)
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+
+class DatabaseConnectionManager:
+    """Keeps one long-lived SQLite connection per thread and groups work into transactions.
+
+    Connections are opened lazily, switched to WAL mode and tuned once, and then
+    reused for every call made from the same thread. ``transaction()`` may be
+    nested: the outermost block owns BEGIN/COMMIT and inner blocks become
+    savepoints, so several workflow operations can share a single commit.
+
+    For multi-process use, outermost transactions take the write lock up front
+    (BEGIN IMMEDIATE), wait up to ``timeout`` seconds via ``busy_timeout``, and
+    then retry with jittered exponential backoff before giving up. Retries are
+    counted in ``stats['busy_retries']``.
+    """
+
+    DEFAULT_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64000,        # negative value = KiB, i.e. ~64 MB page cache
+        'mmap_size': 268435456,      # 256 MB memory-mapped I/O
+        'temp_store': 'MEMORY',
+    }
+
+    def __init__(self, db_path: str, timeout: float = 30.0, pragmas: Dict[str, Any] = None,
+                 max_busy_retries: int = 5, retry_backoff: float = 0.05):
+        self.db_path = db_path
+        self.timeout = timeout
+        self.pragmas = dict(self.DEFAULT_PRAGMAS)
+        self.pragmas['busy_timeout'] = int(timeout * 1000)
+        if pragmas:
+            self.pragmas.update(pragmas)
+        self.max_busy_retries = max_busy_retries
+        self.retry_backoff = retry_backoff
+        self.stats = {'transactions': 0, 'busy_retries': 0}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._pid = os.getpid()
+
+    def _open(self) -> sqlite3.Connection:
+        # isolation_level=None disables the sqlite3 module's implicit BEGINs so
+        # transaction boundaries are controlled explicitly by transaction().
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout,
+                               isolation_level=None, check_same_thread=False)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it on first use"""
+        if os.getpid() != self._pid:
+            # Connections must never be shared across a fork; start a fresh pool.
+            self._local = threading.local()
+            self._connections = []
+            self._pid = os.getpid()
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            self._local.depth = 0
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _begin(self, conn: sqlite3.Connection, statement: str):
+        """BEGIN, retrying with jittered backoff while another process holds the write lock"""
+        for attempt in range(self.max_busy_retries + 1):
+            try:
+                conn.execute(statement)
+                return
+            except sqlite3.OperationalError as e:
+                if not _is_busy_error(e) or attempt == self.max_busy_retries:
+                    raise
+                with self._lock:
+                    self.stats['busy_retries'] += 1
+                time.sleep(min(self.retry_backoff * (2 ** attempt), 2.0) * random.uniform(0.5, 1.5))
+
+    @contextmanager
+    def transaction(self, immediate: bool = True) -> Iterator[sqlite3.Connection]:
+        """Run a block atomically; nested blocks join the outer transaction via savepoints.
+
+        Outermost blocks default to BEGIN IMMEDIATE: taking the write lock up
+        front avoids the unrecoverable SQLITE_BUSY a deferred transaction hits
+        when it upgrades from reader to writer under concurrency. Pass
+        ``immediate=False`` for read-mostly blocks.
+        """
+        conn = self.connection()
+        depth = self._local.depth
+        savepoint = f"sp_{depth}"
+
+        if depth == 0:
+            self._begin(conn, "BEGIN IMMEDIATE" if immediate else "BEGIN")
+            with self._lock:
+                self.stats['transactions'] += 1
+        else:
+            conn.execute(f"SAVEPOINT {savepoint}")
+        self._local.depth = depth + 1
+        try:
+            yield conn
+        except BaseException:
+            self._local.depth = depth
+            if depth == 0:
+                conn.execute("ROLLBACK")
+            else:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+            raise
+        else:
+            self._local.depth = depth
+            if depth == 0:
+                try:
+                    conn.execute("COMMIT")
+                except sqlite3.Error:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    raise
+            else:
+                conn.execute(f"RELEASE {savepoint}")
+
+    def in_transaction(self) -> bool:
+        """Whether the calling thread is inside a transaction() block"""
+        return getattr(self._local, 'depth', 0) > 0
+
+    def close(self):
+        """Close the calling thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            with self._lock:
+                if conn in self._connections:
+                    self._connections.remove(conn)
+            conn.close()
+            self._local.conn = None
+            self._local.depth = 0
+
+    def close_all(self):
+        """Close every pooled connection (call at shutdown, with no transactions open)"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+class SingleWriterQueue:
+    """Serializes all writes of a process through one thread with its own connection.
+
+    Callers block on a Future while their reads keep running on their own
+    connections (WAL lets readers proceed during a write). Writes that queue up
+    while a commit is in progress are grouped into the next transaction, each
+    in its own savepoint so one failing job does not undo the others.
+    """
+
+    def __init__(self, db: DatabaseConnectionManager, max_batch: int = 64):
+        self.db = db
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Optional[Tuple]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='sqlite-writer', daemon=True)
+        self._thread.start()
+
+    def is_writer_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Queue ``fn(*args, **kwargs)`` to run on the writer thread"""
+        future: Future = Future()
+        self._queue.put((fn, args, kwargs, future))
+        return future
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            batch = [job]
+            while len(batch) < self.max_batch:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    self._execute(batch)
+                    self.db.close()
+                    return
+                batch.append(job)
+            self._execute(batch)
+        self.db.close()
+
+    def _execute(self, batch: List[Tuple]):
+        outcomes = []
+        try:
+            with self.db.transaction():
+                for fn, args, kwargs, future in batch:
+                    try:
+                        with self.db.transaction():
+                            outcomes.append((future, fn(*args, **kwargs), None))
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+        except Exception as e:
+            # BEGIN or COMMIT failed: nothing in the batch was applied
+            for _, _, _, future in batch:
+                future.set_exception(e)
+            return
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def close(self):
+        """Finish queued writes and stop the writer thread"""
+        self._queue.put(None)
+        self._thread.join()
+
+
+def _write_operation(method: Callable) -> Callable:
+    """Route a public write method through the single-writer queue when it is enabled.
+
+    Calls made inside an open transaction, or from the writer thread itself,
+    run directly so they stay part of the caller's transaction.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        writer = self.writer
+        if writer is None or writer.is_writer_thread() or self.db.in_transaction():
+            return method(self, *args, **kwargs)
+        return writer.submit(method, self, *args, **kwargs).result()
+    return wrapper
+
+
+class Record:
+    """Base for compact, slot-based row records.
+
+    Subclasses list their attributes in ``__slots__`` and map attributes that
+    do not come from the record's own table to SQL expressions in
+    ``EXPRESSIONS``. Queries select only the fields they need; the remaining
+    slots are None.
+    """
+
+    __slots__ = ()
+    ALIAS = ''
+    EXPRESSIONS: Dict[str, str] = {}
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def select(cls, fields: Iterable[str]) -> str:
+        """SQL projection for ``fields``, e.g. ``p.id, p.title, c.name``"""
+        return ', '.join(cls.EXPRESSIONS.get(name, f'{cls.ALIAS}.{name}') for name in fields)
+
+    @classmethod
+    def row_factory(cls, fields: Iterable[str]) -> Callable[[sqlite3.Cursor, Tuple], 'Record']:
+        """A sqlite3 row factory building records straight from row tuples"""
+        fields = tuple(fields)
+        unset = tuple(name for name in cls.__slots__ if name not in fields)
+        new = object.__new__
+
+        def build(cursor: sqlite3.Cursor, row: Tuple) -> 'Record':
+            record = new(cls)
+            for name, value in zip(fields, row):
+                setattr(record, name, value)
+            for name in unset:
+                setattr(record, name, None)
+            return record
+        return build
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        values = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__
+                           if getattr(self, name) is not None)
+        return f'{type(self).__name__}({values})'
+
+
+class Client(Record):
+    __slots__ = ('id', 'name', 'email', 'fiverr_username', 'first_contact_date',
+                 'total_projects', 'total_revenue', 'satisfaction_rating', 'notes')
+    ALIAS = 'c'
+
+
+class Project(Record):
+    """A projects row, optionally carrying its client's name and email from a join"""
+
+    __slots__ = ('id', 'client_id', 'project_type', 'title', 'description', 'status',
+                 'start_date', 'due_date', 'completion_date', 'package_type', 'price',
+                 'requirements', 'deliverables', 'notes', 'client_name', 'client_email')
+    ALIAS = 'p'
+    EXPRESSIONS = {'client_name': 'c.name', 'client_email': 'c.email'}
+
+
+class Communication(Record):
+    __slots__ = ('id', 'project_id', 'client_id', 'message_type', 'subject', 'content',
+                 'sent_date', 'response_required')
+    ALIAS = 'm'
+
+
+class CompiledTemplate:
+    """A validated message template with its required variables resolved once"""
+
+    __slots__ = ('name', 'subject', 'content', 'variables', '_render_subject', '_render_content')
+
+    def __init__(self, name: str, subject: str, content: str, declared_variables: List[str] = None):
+        self.name = name
+        self.subject = subject or ''
+        self.content = content or ''
+        self.variables = frozenset(_template_fields(self.subject) | _template_fields(self.content))
+        if declared_variables is not None:
+            undeclared = self.variables.difference(declared_variables)
+            if undeclared:
+                raise ValueError(f"Template '{name}' uses undeclared variables: {', '.join(sorted(undeclared))}")
+        self._render_subject = self.subject.format_map
+        self._render_content = self.content.format_map
+
+    def render(self, values: Dict[str, Any]) -> Tuple[str, str]:
+        """Return (subject, content); raises KeyError naming every missing variable"""
+        missing = self.variables.difference(values)
+        if missing:
+            raise KeyError(', '.join(sorted(missing)))
+        return self._render_subject(values), self._render_content(values)
+
+
+class TemplateRegistry:
+    """Loads message templates from the templates table once and caches them compiled.
+
+    Edits made through ``save_template`` update the cache directly once committed;
+    edits made inside an enclosing transaction only invalidate it, and are never
+    cached until that transaction has finished. Edits made by other connections
+    bump ``template_catalog.revision`` via triggers, which the registry checks at
+    most every ``check_interval`` seconds.
+    """
+
+    def __init__(self, db: DatabaseConnectionManager, check_interval: float = 5.0):
+        self.db = db
+        self.check_interval = check_interval
+        self._cache: Optional[Dict[str, CompiledTemplate]] = None
+        self._revision = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        # Per thread: whether save_template wrote inside a still-open outer transaction
+        self._uncommitted = threading.local()
+
+    def _current_revision(self) -> int:
+        row = self.db.connection().execute(
+            'SELECT revision FROM template_catalog WHERE id = 1').fetchone()
+        return row[0] if row else 0
+
+    def _load(self, store: bool = True) -> Dict[str, CompiledTemplate]:
+        revision = self._current_revision()
+        compiled = {}
+        rows = self.db.connection().execute(
+            'SELECT name, subject, content, variables FROM templates ORDER BY id')
+        for name, subject, content, variables in rows:
+            try:
+                declared = json.loads(variables) if variables else None
+                compiled[name] = CompiledTemplate(name, subject, content, declared)
+            except (ValueError, TypeError) as e:
+                logger.error(f"Skipping invalid template {name}: {e}")
+        if store:
+            self._cache = compiled
+            self._revision = revision
+            self._checked_at = time.monotonic()
+            logger.info(f"Loaded {len(compiled)} message templates")
+        return compiled
+
+    def _ensure_fresh(self) -> Dict[str, CompiledTemplate]:
+        if getattr(self._uncommitted, 'active', False):
+            if self.db.in_transaction():
+                # Our uncommitted edits are visible to this connection only and may
+                # still roll back, so read them without caching
+                return self._load(store=False)
+            # The outer transaction has committed or rolled back; reload whichever it was
+            self._uncommitted.active = False
+            self.invalidate()
+        with self._lock:
+            if self._cache is None:
+                self._load()
+            elif time.monotonic() - self._checked_at >= self.check_interval:
+                self._checked_at = time.monotonic()
+                if self._current_revision() != self._revision:
+                    self._load()
+            return self._cache
+
+    def get(self, name: str) -> Optional[CompiledTemplate]:
+        """Return the compiled template, or None if it does not exist"""
+        return self._ensure_fresh().get(name)
+
+    def names(self) -> List[str]:
+        """Names of all loaded templates"""
+        return list(self._ensure_fresh())
+
+    def invalidate(self):
+        """Drop the cache; the next lookup reloads from the database"""
+        with self._lock:
+            self._cache = None
+
+    def save_template(self, name: str, subject: str, content: str, category: str = None) -> CompiledTemplate:
+        """Validate and store a template, replacing any existing one with the same name"""
+        compiled = CompiledTemplate(name, subject, content)
+        variables = json.dumps(sorted(compiled.variables))
+        with self.db.transaction() as conn:
+            cursor = conn.execute('''
+                UPDATE templates SET subject = ?, content = ?, variables = ?,
+                                     category = COALESCE(?, category)
+                WHERE name = ?
+            ''', (subject, content, variables, category, name))
+            if cursor.rowcount == 0:
+                conn.execute('''
+                    INSERT INTO templates (name, category, subject, content, variables)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (name, category, subject, content, variables))
+            revision = conn.execute('SELECT revision FROM template_catalog WHERE id = 1').fetchone()[0]
+        if self.db.in_transaction():
+            # Nothing is committed until the outermost transaction ends, and it may roll back
+            self._uncommitted.active = True
+            self.invalidate()
+            return compiled
+        with self._lock:
+            if self._cache is not None:
+                if revision == self._revision + 1:
+                    # Only our own write happened since the cache was loaded
+                    self._cache[name] = compiled
+                    self._revision = revision
+                else:
+                    # Another connection also edited templates; reload everything
+                    self._cache = None
+        return compiled
+
+    def load_from_file(self, path: str, category: str = None) -> List[str]:
+        """Import templates from JSON.
+
+        Accepts ``{name: {"subject": ..., "content": ...}}`` or the
+        ``email_templates.json`` form ``{name: "Subject: ...\\n\\nbody"}``.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
         
-        return templates.get(template_name)
+        saved = []
+        with self.db.transaction():
+            for name, template in data.items():
+                if isinstance(template, str):
+                    text = template.strip()
+                    subject, content = '', text
+                    if text.startswith('Subject:'):
+                        subject, _, content = text.partition('\n')
+                        subject = subject[len('Subject:'):].strip()
+                        content = content.strip()
+                    template = {'subject': subject, 'content': content}
+                self.save_template(name, template.get('subject', ''), template.get('content', ''),
+                                   template.get('category', category))
+                saved.append(name)
+        return saved
+
+    def record_usage(self, name: str, count: int = 1):
+        """Add ``count`` to the template's usage_count (joins the caller's transaction)"""
+        with self.db.transaction() as conn:
+            conn.execute('UPDATE templates SET usage_count = usage_count + ? WHERE name = ?', (count, name))
+
+
+class FiverrWorkflowAutomation:
+    def __init__(self, db_path: str = "fiverr_business.db", single_writer: bool = False):
+        self.db_path = db_path
+        self.db = DatabaseConnectionManager(db_path)
+        # Optional in-process write serialization; see SingleWriterQueue
+        self.writer: Optional[SingleWriterQueue] = None
+        self.init_database()
+        if single_writer:
+            self.writer = SingleWriterQueue(self.db)
+        self.templates = TemplateRegistry(self.db)
+        self.templates_dir = Path("customized_templates")
+    
+    def transaction(self):
+        """Group several workflow operations into a single atomic commit"""
+        return self.db.transaction()
+    
+    def close(self):
+        """Stop the writer thread (if any) and close all pooled database connections"""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        self.db.close_all()
+        
+    def init_database(self):
+        """Initialize SQLite database for tracking projects and clients"""
+        self.migrate()
+        logger.info("Database initialized successfully")
+    
+    @_write_operation
+    def rebuild_rollups(self):
+        """Recompute every write-maintained aggregate: dashboard summary, client totals, monthly revenue"""
+        with self.db.transaction(immediate=True) as conn:
+            _rebuild_dashboard_summary(conn)
+            _rebuild_revenue_rollups(conn)
+        logger.info("Dashboard summary and revenue rollups rebuilt")
+    
+    @_write_operation
+    def rebuild_dashboard_summary(self):
+        """Recompute the dashboard summary tables from scratch (repair tool)"""
+        with self.db.transaction(immediate=True) as conn:
+            _rebuild_dashboard_summary(conn)
+        logger.info("Dashboard summary rebuilt")
+    
+    def get_schema_version(self) -> int:
+        """Return the highest applied migration version (0 for a fresh database)"""
+        conn = self.db.connection()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT,
+                applied_date TEXT
+            )
+        ''')
+        return conn.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version').fetchone()[0]
+    
+    def migrate(self, target_version: int = None) -> int:
+        """Apply pending schema migrations in order, each in its own transaction"""
+        current = self.get_schema_version()
+        for version, description, steps in SCHEMA_MIGRATIONS:
+            if version <= current or (target_version is not None and version > target_version):
+                continue
+            # BEGIN IMMEDIATE so concurrent processes cannot apply the same step twice
+            with self.db.transaction(immediate=True) as conn:
+                applied = conn.execute('SELECT 1 FROM schema_version WHERE version = ?', (version,)).fetchone()
+                if applied:
+                    continue
+                for step in steps:
+                    if callable(step):
+                        step(conn)
+                    else:
+                        conn.execute(step)
+                conn.execute('''
+                    INSERT INTO schema_version (version, description, applied_date)
+                    VALUES (?, ?, ?)
+                ''', (version, description, datetime.now().isoformat()))
+            current = version
+            logger.info(f"Applied schema migration {version}: {description}")
+        return current
+    
+    @_write_operation
+    def add_client(self, name: str, email: str, fiverr_username: str = None) -> int:
+        """Add a new client to the database"""
+        with self.db.transaction() as conn:
+            cursor = conn.execute('''
+                INSERT INTO clients (name, email, fiverr_username, first_contact_date)
+                VALUES (?, ?, ?, ?)
+            ''', (name, email, fiverr_username, datetime.now().isoformat()))
+            client_id = cursor.lastrowid
+        
+        logger.info(f"Added new client: {name} (ID: {client_id})")
+        return client_id
+    
+    @_write_operation
+    def create_project(self, client_id: int, project_type: str, title: str, 
+                      package_type: str, price: float, due_days: int = 7) -> int:
+        """Create a new project"""
+        start_date = datetime.now()
+        due_date = start_date + timedelta(days=due_days)
+        
+        with self.db.transaction() as conn:
+            cursor = conn.execute('''
+                INSERT INTO projects (client_id, project_type, title, package_type, 
+                                    price, start_date, due_date, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 'active')
+            ''', (client_id, project_type, title, package_type, price, 
+                  start_date.isoformat(), due_date.isoformat()))
+            project_id = cursor.lastrowid
+        
+        logger.info(f"Created new project: {title} (ID: {project_id})")
+        return project_id
+    
+    @_write_operation
+    def add_clients_bulk(self, clients: Iterable[Dict[str, Any]], chunk_size: int = 500) -> List[int]:
+        """Insert many clients, deduplicating on email / fiverr_username.
+        
+        ``clients`` may be any iterable (including a generator) of dicts with
+        ``name``, ``email`` and optionally ``fiverr_username`` and
+        ``first_contact_date``. Returns one client ID per input record, in input
+        order; duplicates (within the input or already stored) map to the
+        existing client's ID.
+        """
+        client_ids: List[int] = []
+        by_email: Dict[str, int] = {}
+        by_username: Dict[str, int] = {}
+        inserted = 0
+        
+        for chunk in _chunked(clients, chunk_size):
+            emails = {c['email'].strip().lower() for c in chunk} - by_email.keys()
+            usernames = {c['fiverr_username'] for c in chunk if c.get('fiverr_username')} - by_username.keys()
+            
+            with self.db.transaction() as conn:
+                # Resolve clients that already exist in the database, one IN list per
+                # column so no statement binds more than MAX_SQL_PARAMS values
+                lookups = [('lower(trim(email))', values) for values in _chunked(sorted(emails), MAX_SQL_PARAMS)]
+                lookups += [('fiverr_username', values) for values in _chunked(sorted(usernames), MAX_SQL_PARAMS)]
+                for column, values in lookups:
+                    rows = conn.execute(f'''
+                        SELECT id, email, fiverr_username FROM clients
+                        WHERE {column} IN ({','.join('?' * len(values))})
+                    ''', values)
+                    for existing_id, email, username in rows:
+                        by_email.setdefault(email.strip().lower(), existing_id)
+                        if username:
+                            by_username.setdefault(username, existing_id)
+                
+                # Unresolved records are inserted; a negative placeholder -(n + 1)
+                # stands for the n-th new row until its real ID is known
+                new_rows = []
+                pending_keys = []
+                positions = []
+                for client in chunk:
+                    email = client['email'].strip().lower()
+                    username = client.get('fiverr_username')
+                    client_id = by_email.get(email) or (by_username.get(username) if username else None)
+                    if client_id is None:
+                        client_id = -(len(new_rows) + 1)
+                        by_email[email] = client_id
+                        pending_keys.append((by_email, email))
+                        if username:
+                            by_username[username] = client_id
+                            pending_keys.append((by_username, username))
+                        new_rows.append((client['name'], client['email'], username,
+                                         client.get('first_contact_date') or datetime.now().isoformat()))
+                    positions.append(client_id)
+                
+                if new_rows:
+                    conn.executemany('''
+                        INSERT INTO clients (name, email, fiverr_username, first_contact_date)
+                        VALUES (?, ?, ?, ?)
+                    ''', new_rows)
+                    # Inside one write transaction AUTOINCREMENT ids are consecutive
+                    last_id = conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+                    first_id = last_id - len(new_rows) + 1
+                    for mapping, key in pending_keys:
+                        mapping[key] = first_id - mapping[key] - 1
+                    positions = [first_id - cid - 1 if cid < 0 else cid for cid in positions]
+                    inserted += len(new_rows)
+            
+            client_ids.extend(positions)
+        
+        logger.info(f"Bulk client import: {inserted} inserted, {len(client_ids) - inserted} deduplicated")
+        return client_ids
+    
+    @_write_operation
+    def create_projects_bulk(self, projects: Iterable[Dict[str, Any]], chunk_size: int = 1000) -> List[int]:
+        """Insert many projects with executemany in chunked transactions.
+        
+        Each record needs ``client_id``, ``project_type``, ``title``,
+        ``package_type`` and ``price``. Historical orders may also carry
+        ``start_date``, ``due_date``, ``completion_date`` and ``status``;
+        otherwise the dates follow ``create_project`` (``due_days`` defaults to 7).
+        Returns the new project IDs in input order.
+        """
+        project_ids: List[int] = []
+        
+        for chunk in _chunked(projects, chunk_size):
+            rows = []
+            for project in chunk:
+                start_date = project.get('start_date') or datetime.now().isoformat()
+                due_date = project.get('due_date') or (
+                    datetime.fromisoformat(start_date) + timedelta(days=project.get('due_days', 7))
+                ).isoformat()
+                rows.append((project['client_id'], project['project_type'], project['title'],
+                             project['package_type'], project['price'], start_date, due_date,
+                             project.get('completion_date'), project.get('status', 'active')))
+            
+            with self.db.transaction() as conn:
+                conn.executemany('''
+                    INSERT INTO projects (client_id, project_type, title, package_type, 
+                                        price, start_date, due_date, completion_date, status)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', rows)
+                last_id = conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+            project_ids.extend(range(last_id - len(rows) + 1, last_id + 1))
+        
+        logger.info(f"Bulk project import: {len(project_ids)} projects created")
+        return project_ids
+    
+    def get_template(self, template_name: str) -> Optional[Dict[str, Any]]:
+        """Get a communication template"""
+        template = self.templates.get(template_name)
+        if template is None:
+            return None
+        return {'subject': template.subject, 'content': template.content}
+    
+    def _fetch(self, record_type: type, fields: Tuple[str, ...], sql: str,
+               params: Iterable[Any] = (), suffix: str = '') -> sqlite3.Cursor:
+        """Run ``sql`` (with ``{fields}`` in its SELECT list) yielding record_type objects.
+        
+        ``suffix`` is appended verbatim after the field list is filled in, so
+        caller-supplied SQL there is never passed through str.format.
+        """
+        cursor = self.db.connection().cursor()
+        cursor.row_factory = record_type.row_factory(fields)
+        return cursor.execute(sql.format(fields=record_type.select(fields)) + suffix, tuple(params))
+    
+    # Only the columns a message render needs; shared by the single and bulk paths
+    MESSAGE_FIELDS = ('id', 'client_id', 'project_type', 'title', 'package_type', 'due_date',
+                      'client_name', 'client_email')
+    MESSAGE_CONTEXT_QUERY = '''
+        SELECT {fields}
+        FROM projects p 
+        JOIN clients c ON p.client_id = c.id 
+    '''
     
+    def _message_context(self, project: Project, custom_vars: Dict[str, str] = None) -> Dict[str, Any]:
+        """Map a project (with client name/email) to template variables"""
+        project_data = {
+            'project_id': project.id,
+            'client_id': project.client_id,
+            'project_type': project.project_type,
+            'project_title': project.title,
+            'package_type': project.package_type,
+            'due_date': project.due_date,
+            'client_name': project.client_name,
+            'client_email': project.client_email,
+            # Default seller information
+            'seller_name': 'Your Name',
+            'service_type': project.project_type
+        }
+        if custom_vars:
+            project_data.update(custom_vars)
+        return project_data
+    
+    def get_project(self, project_id: int, fields: Tuple[str, ...] = Project.__slots__) -> Optional[Project]:
+        """Fetch one project with only the requested fields populated"""
+        return self._fetch(Project, fields, '''
+            SELECT {fields}
+            FROM projects p
+            LEFT JOIN clients c ON p.client_id = c.id
+            WHERE p.id = ?
+        ''', (project_id,)).fetchone()
+    
+    def get_client(self, client_id: int, fields: Tuple[str, ...] = Client.__slots__) -> Optional[Client]:
+        """Fetch one client with only the requested fields populated"""
+        return self._fetch(Client, fields, 'SELECT {fields} FROM clients c WHERE c.id = ?',
+                           (client_id,)).fetchone()
+    
+    def get_communications(self, project_id: int,
+                           fields: Tuple[str, ...] = ('id', 'message_type', 'subject', 'sent_date')
+                           ) -> List[Communication]:
+        """A project's communications, newest first (served by the covering index by default)"""
+        return self._fetch(Communication, fields, '''
+            SELECT {fields}
+            FROM communications m
+            WHERE m.project_id = ?
+            ORDER BY m.sent_date DESC
+        ''', (project_id,)).fetchall()
+    
+    def _enqueue_outbox(self, conn: sqlite3.Connection, rows: List[Tuple]):
+        """Queue (project_id, client_id, message_type, recipient, subject, content, created) rows for delivery"""
+        conn.executemany('''
+            INSERT INTO outbox (project_id, client_id, message_type, recipient,
+                                subject, content, created_date, next_attempt_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [row + (row[6],) for row in rows])
+    
+    @_write_operation
     def send_automated_message(self, project_id: int, template_name: str, 
                              custom_vars: Dict[str, str] = None) -> bool:
         """Send an automated message using a template"""
         try:
             # Get project and client details
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT p.*, c.name, c.email 
-                FROM projects p 
-                JOIN clients c ON p.client_id = c.id 
-                WHERE p.id = ?
-            ''', (project_id,))
-            
-            result = cursor.fetchone()
+            result = self._fetch(Project, self.MESSAGE_FIELDS,
+                                 self.MESSAGE_CONTEXT_QUERY + 'WHERE p.id = ?', (project_id,)).fetchone()
             if not result:
                 logger.error(f"Project {project_id} not found")
                 return False
             
-            # Map database columns to variables
-            project_data = {
-                'project_id': result[0],
-                'client_id': result[1],
-                'project_type': result[2],
-                'project_title': result[3],
-                'package_type': result[6],
-                'due_date': result[8],
-                'client_name': result[11],
-                'client_email': result[12]
-            }
-            
             # Get template
-            template = self.get_template(template_name)
+            template = self.templates.get(template_name)
             if not template:
                 logger.error(f"Template {template_name} not found")
                 return False
             
-            # Add default seller information
-            project_data.update({
-                'seller_name': 'Your Name',
-                'service_type': project_data['project_type']
-            })
-            
-            # Merge custom variables
-            if custom_vars:
-                project_data.update(custom_vars)
+            project_data = self._message_context(result, custom_vars)
             
             # Format template
             try:
-                subject = template['subject'].format(**project_data)
-                content = template['content'].format(**project_data)
+                subject, content = template.render(project_data)
             except KeyError as e:
                 logger.error(f"Missing template variable: {e}")
                 return False
             
-            # Log the communication (in real implementation, this would send email)
-            cursor.execute('''
-                INSERT INTO communications (project_id, client_id, message_type, 
-                                          subject, content, sent_date)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (project_id, project_data['client_id'], template_name, 
-                  subject, content, datetime.now().isoformat()))
-            
-            conn.commit()
-            conn.close()
+            # Log the communication and queue it for the outbox delivery worker
+            now = datetime.now().isoformat()
+            with self.db.transaction() as conn:
+                self.templates.record_usage(template_name)
+                conn.execute('''
+                    INSERT INTO communications (project_id, client_id, message_type, 
+                                              subject, content, sent_date)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (project_id, project_data['client_id'], template_name, 
+                      subject, content, now))
+                self._enqueue_outbox(conn, [(project_id, project_data['client_id'], template_name,
+                                             project_data['client_email'], subject, content, now)])
             
             logger.info(f"Automated message sent: {template_name} for project {project_id}")
             return True
@@ -339,125 +1434,375 @@ Best regards,
             logger.error(f"Error sending automated message: {str(e)}")
             return False
     
-    def update_project_status(self, project_id: int, status: str, notes: str = None):
-        """Update project status and trigger appropriate communications"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def _iter_message_rows(self, projects: Union[Iterable[int], str], params: Tuple = (),
+                           batch_size: int = 500) -> Iterator[List[Project]]:
+        """Yield batches of message-context projects for project IDs or an ID-returning query"""
+        if isinstance(projects, str):
+            # The caller's query becomes a subquery by concatenation; its values bind through params
+            cursor = self._fetch(Project, self.MESSAGE_FIELDS, self.MESSAGE_CONTEXT_QUERY, params,
+                                 suffix='WHERE p.id IN (' + projects + ') ORDER BY p.id')
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield rows
+        else:
+            for id_chunk in _chunked(projects, batch_size):
+                marks = ','.join('?' * len(id_chunk))
+                yield self._fetch(Project, self.MESSAGE_FIELDS,
+                                  self.MESSAGE_CONTEXT_QUERY + f'WHERE p.id IN ({marks})', id_chunk).fetchall()
+    
+    @_write_operation
+    def send_bulk_messages(self, template_name: str, projects: Union[Iterable[int], str],
+                           custom_vars: Dict[str, str] = None, params: Tuple = (),
+                           batch_size: int = 500) -> Dict[int, bool]:
+        """Render and log one message per project in a single transaction.
         
-        # Update project status
-        cursor.execute('''
-            UPDATE projects SET status = ?, notes = ? WHERE id = ?
-        ''', (status, notes, project_id))
-        
-        conn.commit()
-        conn.close()
-        
-        # Trigger automated communications based on status
-        if status == 'active':
-            self.send_automated_message(project_id, 'project_kickoff')
-        elif status == 'in_progress':
-            self.send_automated_message(project_id, 'progress_update', {
-                'progress_percentage': '50',
-                'current_task': 'Data analysis and insights generation',
-                'completed_tasks': '• Initial research completed\\n• Data collection finalized',
-                'next_steps': '• Complete analysis\\n• Generate recommendations\\n• Prepare final report'
-            })
-        elif status == 'completed':
-            self.send_automated_message(project_id, 'delivery_notification', {
-                'deliverables_list': '• Comprehensive analysis report\\n• Executive summary\\n• Data visualizations\\n• Strategic recommendations',
-                'key_findings': 'Key insights and actionable recommendations included in the full report.'
-            })
-            # Schedule follow-up
-            self.schedule_follow_up(project_id, days=7)
-        
-        logger.info(f"Project {project_id} status updated to: {status}")
-    
-    def schedule_follow_up(self, project_id: int, days: int = 7):
-        """Schedule a follow-up communication"""
-        # In a real implementation, this would use a task scheduler
-        # For now, we'll just log the scheduled follow-up
-        follow_up_date = datetime.now() + timedelta(days=days)
-        logger.info(f"Follow-up scheduled for project {project_id} on {follow_up_date.date()}")
+        ``projects`` is either an iterable of project IDs or an SQL query that
+        selects project IDs (e.g. ``"SELECT id FROM projects WHERE status = ?"``
+        with ``params``). Rows are fetched in batches with one query each and
+        the communications are written with executemany. Returns
+        ``{project_id: success}``; requested IDs that do not exist map to False.
+        """
+        requested = None
+        if not isinstance(projects, str):
+            requested = list(projects)
+            projects = requested
+        
+        template = self.templates.get(template_name)
+        if not template:
+            logger.error(f"Template {template_name} not found")
+            return {project_id: False for project_id in requested or []}
+        
+        # Every row supplies the same variable names, so validate them once up front
+        available = self._message_context(Project(), custom_vars)
+        missing = template.variables.difference(available)
+        if missing:
+            logger.error(f"Missing template variable: {', '.join(sorted(missing))}")
+            return {project_id: False for project_id in requested or []}
+        
+        results: Dict[int, bool] = {}
+        sent = 0
+        sent_date = datetime.now().isoformat()
+        
+        with self.db.transaction() as conn:
+            for rows in self._iter_message_rows(projects, params, batch_size):
+                communications = []
+                outbox_rows = []
+                for project in rows:
+                    try:
+                        subject, content = template.render(self._message_context(project, custom_vars))
+                    except (KeyError, ValueError, AttributeError, IndexError) as e:
+                        logger.error(f"Error rendering {template_name} for project {project.id}: {e}")
+                        results[project.id] = False
+                        continue
+                    communications.append((project.id, project.client_id, template_name,
+                                           subject, content, sent_date))
+                    outbox_rows.append((project.id, project.client_id, template_name, project.client_email,
+                                        subject, content, sent_date))
+                    results[project.id] = True
+                
+                conn.executemany('''
+                    INSERT INTO communications (project_id, client_id, message_type, 
+                                              subject, content, sent_date)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', communications)
+                self._enqueue_outbox(conn, outbox_rows)
+                sent += len(communications)
+            
+            if sent:
+                self.templates.record_usage(template_name, sent)
+        
+        for project_id in requested or []:
+            results.setdefault(project_id, False)
+        
+        logger.info(f"Bulk message {template_name}: {sent} sent, {len(results) - sent} failed")
+        return results
     
-    def generate_project_report(self, project_id: int) -> Dict[str, Any]:
-        """Generate a project status report"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    @staticmethod
+    def can_transition(current_status: Optional[str], new_status: str) -> bool:
+        """Whether PROJECT_LIFECYCLE allows moving from current_status to new_status"""
+        if new_status not in PROJECT_LIFECYCLE:
+            return False
+        if current_status not in PROJECT_LIFECYCLE:
+            return new_status in UNKNOWN_STATUS_TARGETS
+        # Re-entering the same status is allowed and re-runs its side effects
+        return current_status == new_status or new_status in PROJECT_LIFECYCLE[current_status]
+    
+    def _transition(self, project_ids: Iterable[int], status: str, notes: str = None,
+                    strict: bool = False) -> Dict[int, bool]:
+        """Validate and apply a status transition plus its STATUS_ACTIONS in one transaction.
         
-        # Get project details
-        cursor.execute('''
-            SELECT p.*, c.name, c.email 
-            FROM projects p 
-            JOIN clients c ON p.client_id = c.id 
-            WHERE p.id = ?
-        ''', (project_id,))
+        A project maps to True only if it moved and its status message (if the
+        status has one) was queued. A project that moved but whose message
+        could not be rendered maps to False; re-entering the same status is
+        allowed, so retrying re-sends the message.
+        """
+        if status not in PROJECT_LIFECYCLE:
+            raise InvalidTransitionError(f"Unknown project status: {status}")
         
-        project = cursor.fetchone()
+        project_ids = list(project_ids)
+        results: Dict[int, bool] = {}
+        now = datetime.now().isoformat()
         
-        # Get communications
-        cursor.execute('''
-            SELECT message_type, subject, sent_date 
-            FROM communications 
-            WHERE project_id = ? 
-            ORDER BY sent_date DESC
-        ''', (project_id,))
+        with self.db.transaction(immediate=True) as conn:
+            current: Dict[int, Optional[str]] = {}
+            for id_chunk in _chunked(project_ids, 500):
+                marks = ','.join('?' * len(id_chunk))
+                current.update(conn.execute(
+                    f'SELECT id, status FROM projects WHERE id IN ({marks})', id_chunk))
+            
+            moved = []
+            for project_id in project_ids:
+                if project_id not in current:
+                    logger.error(f"Project {project_id} not found")
+                    results[project_id] = False
+                elif not self.can_transition(current[project_id], status):
+                    message = f"Illegal status transition for project {project_id}: {current[project_id]} -> {status}"
+                    if strict:
+                        raise InvalidTransitionError(message)
+                    logger.error(message)
+                    results[project_id] = False
+                else:
+                    moved.append(project_id)
+                    results[project_id] = True
+            
+            if moved:
+                conn.executemany('''
+                    UPDATE projects
+                    SET status = ?, notes = ?,
+                        completion_date = CASE WHEN ? = 'completed' THEN ? ELSE completion_date END
+                    WHERE id = ?
+                ''', [(status, notes, status, now, project_id) for project_id in moved])
+                
+                # Trigger automated communications based on status
+                action = STATUS_ACTIONS.get(status)
+                if action:
+                    messages = self.send_bulk_messages(action['template'], moved, action.get('custom_vars'))
+                    for project_id in moved:
+                        if not messages.get(project_id):
+                            logger.error(f"Project {project_id} moved to {status} but its "
+                                         f"{action['template']} message could not be sent")
+                            results[project_id] = False
+                    if action.get('follow_up_days'):
+                        self._schedule_follow_ups(conn, moved, action['follow_up_days'])
         
-        communications = cursor.fetchall()
-        conn.close()
+        if moved:
+            logger.info(f"{len(moved)} project(s) moved to status: {status}")
+        return results
+    
+    @_write_operation
+    def update_project_status(self, project_id: int, status: str, notes: str = None) -> bool:
+        """Update project status and trigger appropriate communications.
         
+        The status change, its messages and any follow-up share one commit.
+        Raises InvalidTransitionError for a transition PROJECT_LIFECYCLE forbids.
+        Returns False if the project does not exist or its status message could
+        not be sent (the status itself still changes in that case).
+        """
+        updated = self._transition([project_id], status, notes, strict=True)[project_id]
+        if updated:
+            logger.info(f"Project {project_id} status updated to: {status}")
+        return updated
+    
+    @_write_operation
+    def transition_many(self, project_ids: Iterable[int], status: str, notes: str = None) -> Dict[int, bool]:
+        """Move many projects to ``status`` in a single transaction.
+        
+        Projects that do not exist or cannot legally make the transition are
+        skipped and reported as False; the rest are updated, messaged in bulk
+        and get their follow-ups scheduled together. Projects whose status
+        message failed are moved but also reported as False.
+        """
+        return self._transition(project_ids, status, notes)
+    
+    def _schedule_follow_ups(self, conn: sqlite3.Connection, project_ids: List[int], days: float,
+                             template_name: str = 'follow_up', custom_vars: Dict[str, str] = None) -> int:
+        """Insert one follow-up task per project; returns the last task ID"""
+        follow_up_date = (datetime.now() + timedelta(days=days)).isoformat()
+        payload = {'template_name': template_name}
+        if custom_vars:
+            payload['custom_vars'] = custom_vars
+        payload = json.dumps(payload, sort_keys=True)
+        created = datetime.now().isoformat()
+        
+        conn.executemany('''
+            INSERT INTO scheduled_tasks (task_type, project_id, payload, due_at, created_date)
+            VALUES ('follow_up', ?, ?, ?, ?)
+        ''', [(project_id, payload, follow_up_date, created) for project_id in project_ids])
+        return conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+    
+    @_write_operation
+    def schedule_follow_up(self, project_id: int, days: float = 7, template_name: str = 'follow_up',
+                           custom_vars: Dict[str, str] = None) -> int:
+        """Schedule a follow-up communication; follow_up_scheduler.FollowUpScheduler sends it when due"""
+        with self.db.transaction() as conn:
+            task_id = self._schedule_follow_ups(conn, [project_id], days, template_name, custom_vars)
+        
+        follow_up_date = datetime.now() + timedelta(days=days)
+        logger.info(f"Follow-up scheduled for project {project_id} on {follow_up_date.date()}")
+        return task_id
+    
+    def generate_project_report(self, project_id: int) -> Dict[str, Any]:
+        """Generate a project status report"""
+        project = self.get_project(project_id, ('id', 'client_name', 'project_type', 'title', 'status',
+                                                'start_date', 'due_date', 'price'))
         if not project:
             return {}
         
+        communications = self.get_communications(project_id, ('message_type', 'subject', 'sent_date'))
+        
         return {
-            'project_id': project[0],
-            'client_name': project[11],
-            'project_type': project[2],
-            'title': project[3],
-            'status': project[5],
-            'start_date': project[7],
-            'due_date': project[8],
-            'price': project[10],
+            'project_id': project.id,
+            'client_name': project.client_name,
+            'project_type': project.project_type,
+            'title': project.title,
+            'status': project.status,
+            'start_date': project.start_date,
+            'due_date': project.due_date,
+            'price': project.price,
             'communications': [
                 {
-                    'type': comm[0],
-                    'subject': comm[1],
-                    'date': comm[2]
+                    'type': comm.message_type,
+                    'subject': comm.subject,
+                    'date': comm.sent_date
                 } for comm in communications
             ]
         }
     
-    def get_dashboard_data(self) -> Dict[str, Any]:
-        """Get data for the business dashboard"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def _search_enabled(self) -> bool:
+        return self.db.connection().execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'communications_fts'").fetchone() is not None
+    
+    def search_communications(self, query: str, limit: int = 20, project_id: int = None,
+                              raw: bool = False) -> List[Dict[str, Any]]:
+        """Full-text search over message subjects and bodies, best matches first.
         
-        # Get project statistics
-        cursor.execute('SELECT COUNT(*) FROM projects')
-        total_projects = cursor.fetchone()[0]
+        ``query`` is treated as plain words unless ``raw`` is set, in which case
+        it is passed through as FTS5 query syntax.
+        """
+        match = query if raw else _fts_query(query)
+        if not match:
+            return []
+        if not self._search_enabled():
+            raise RuntimeError("Full-text search is unavailable: this SQLite build lacks FTS5")
         
-        cursor.execute('SELECT COUNT(*) FROM projects WHERE status = "active"')
-        active_projects = cursor.fetchone()[0]
+        sql = '''
+            SELECT c.id, c.project_id, c.client_id, c.message_type, c.subject, c.sent_date,
+                   snippet(communications_fts, -1, '[', ']', '…', 16), f.rank
+            FROM communications_fts f
+            JOIN communications c ON c.id = f.rowid
+            WHERE communications_fts MATCH ?
+        '''
+        params: List[Any] = [match]
+        if project_id is not None:
+            sql += ' AND c.project_id = ?'
+            params.append(project_id)
+        sql += ' ORDER BY f.rank LIMIT ?'
+        params.append(limit)
         
-        cursor.execute('SELECT COUNT(*) FROM projects WHERE status = "completed"')
-        completed_projects = cursor.fetchone()[0]
+        return [
+            {
+                'id': row[0],
+                'project_id': row[1],
+                'client_id': row[2],
+                'type': row[3],
+                'subject': row[4],
+                'date': row[5],
+                'snippet': row[6],
+                'rank': row[7]
+            } for row in self.db.connection().execute(sql, params)
+        ]
+    
+    def search_projects(self, query: str, limit: int = 20, raw: bool = False) -> List[Dict[str, Any]]:
+        """Full-text search over project titles, descriptions and requirements"""
+        match = query if raw else _fts_query(query)
+        if not match:
+            return []
+        if not self._search_enabled():
+            raise RuntimeError("Full-text search is unavailable: this SQLite build lacks FTS5")
         
-        cursor.execute('SELECT SUM(price) FROM projects WHERE status = "completed"')
-        total_revenue = cursor.fetchone()[0] or 0
+        rows = self.db.connection().execute('''
+            SELECT p.id, p.client_id, p.title, p.status,
+                   snippet(projects_fts, -1, '[', ']', '…', 16), f.rank
+            FROM projects_fts f
+            JOIN projects p ON p.id = f.rowid
+            WHERE projects_fts MATCH ?
+            ORDER BY f.rank
+            LIMIT ?
+        ''', (match, limit))
+        return [
+            {
+                'id': row[0],
+                'client_id': row[1],
+                'title': row[2],
+                'status': row[3],
+                'snippet': row[4],
+                'rank': row[5]
+            } for row in rows
+        ]
+    
+    def search(self, query: str, limit: int = 20) -> Dict[str, List[Dict[str, Any]]]:
+        """Search communications and projects at once"""
+        return {
+            'communications': self.search_communications(query, limit),
+            'projects': self.search_projects(query, limit)
+        }
+    
+    def get_client_leaderboard(self, limit: int = 10) -> List[Client]:
+        """Top clients by lifetime completed revenue, read from the maintained rollups"""
+        return self._fetch(Client, ('id', 'name', 'email', 'total_projects', 'total_revenue'), '''
+            SELECT {fields}
+            FROM clients c
+            ORDER BY c.total_revenue DESC
+            LIMIT ?
+        ''', (limit,)).fetchall()
+    
+    def get_monthly_revenue(self, since: str = None, until: str = None) -> List[Dict[str, Any]]:
+        """Completed revenue per month (``YYYY-MM``), optionally limited to [since, until]"""
+        rows = self.db.connection().execute('''
+            SELECT month, completed_projects, revenue
+            FROM monthly_revenue
+            WHERE completed_projects > 0 AND month >= ? AND month <= ?
+            ORDER BY month
+        ''', (since or '', until or '9999-12'))
+        return [
+            {
+                'month': row[0],
+                'completed_projects': row[1],
+                'revenue': row[2]
+            } for row in rows
+        ]
+    
+    def get_dashboard_data(self) -> Dict[str, Any]:
+        """Get data for the business dashboard"""
+        cursor = self.db.connection().cursor()
         
-        cursor.execute('SELECT COUNT(*) FROM clients')
-        total_clients = cursor.fetchone()[0]
+        # Project and client statistics come from the trigger-maintained
+        # summary tables, so this is one pass over a handful of rows
+        cursor.execute('''
+            SELECT c.client_count, s.status, s.project_count, s.total_price
+            FROM client_summary c
+            LEFT JOIN project_status_summary s ON s.project_count > 0
+        ''')
+        summary_rows = cursor.fetchall()
+        total_clients = summary_rows[0][0] if summary_rows else 0
+        status_counts = {row[1]: row[2] for row in summary_rows if row[1] is not None}
+        status_revenue = {row[1]: row[3] for row in summary_rows if row[1] is not None}
+        
+        total_projects = sum(status_counts.values())
+        active_projects = status_counts.get('active', 0)
+        completed_projects = status_counts.get('completed', 0)
+        total_revenue = status_revenue.get('completed', 0)
         
         # Get recent projects
-        cursor.execute('''
-            SELECT p.id, p.title, p.status, p.due_date, c.name 
+        recent_projects = self._fetch(Project, ('id', 'title', 'status', 'due_date', 'client_name'), '''
+            SELECT {fields}
             FROM projects p 
             JOIN clients c ON p.client_id = c.id 
             ORDER BY p.start_date DESC 
             LIMIT 10
-        ''')
-        recent_projects = cursor.fetchall()
-        
-        conn.close()
+        ''').fetchall()
         
         return {
             'total_projects': total_projects,
@@ -465,24 +1810,38 @@ Best regards,
             'completed_projects': completed_projects,
             'total_revenue': total_revenue,
             'total_clients': total_clients,
+            'status_counts': status_counts,
             'recent_projects': [
                 {
-                    'id': p[0],
-                    'title': p[1],
-                    'status': p[2],
-                    'due_date': p[3],
-                    'client_name': p[4]
+                    'id': p.id,
+                    'title': p.title,
+                    'status': p.status,
+                    'due_date': p.due_date,
+                    'client_name': p.client_name
                 } for p in recent_projects
             ]
         }
 
 def main():
     """Demo of the workflow automation system"""
+    parser = argparse.ArgumentParser(description="Fiverr workflow automation demo and maintenance")
+    parser.add_argument('--db', default='fiverr_business.db', help="Workflow database path")
+    parser.add_argument('--rebuild-rollups', action='store_true',
+                        help="Recompute dashboard, client and monthly revenue aggregates, then exit")
+    args = parser.parse_args()
+    
+    if args.rebuild_rollups:
+        automation = FiverrWorkflowAutomation(args.db)
+        automation.rebuild_rollups()
+        automation.close()
+        print(f"✅ Rollups rebuilt for {args.db}")
+        return
+    
     print("🤖 Fiverr Workflow Automation System")
     print("=" * 50)
     
     # Initialize the system
-    automation = FiverrWorkflowAutomation()
+    automation = FiverrWorkflowAutomation(args.db)
     
     # Demo: Add a client and project
     client_id = automation.add_client("John Smith", "john@example.com", "johnsmith_fiverr")
@@ -515,6 +1874,7 @@ def main():
     print(f"Total Revenue: ${dashboard['total_revenue']}")
     print(f"Total Clients: {dashboard['total_clients']}")
     
+    automation.close()
     print("\n✅ Workflow automation demo completed!")
 
 if __name__ == "__main__":
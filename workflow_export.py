@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Streaming Export for Fiverr Workflow Automation
+Exports projects, clients and communications to CSV, JSONL or Parquet in constant memory
+"""
+
+import argparse
+import csv
+import json
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+import logging
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+    pq = None
+
+from workflow_automation import DatabaseConnectionManager, FiverrWorkflowAutomation
+
+logger = logging.getLogger(__name__)
+
+# Exportable tables: which column the date-range filter applies to and which
+# column the ``status`` filter matches (None if the table has no such column)
+EXPORT_TABLES: Dict[str, Dict[str, Optional[str]]] = {
+    'projects': {'date_column': 'start_date', 'status_column': 'status'},
+    'clients': {'date_column': 'first_contact_date', 'status_column': None},
+    'communications': {'date_column': 'sent_date', 'status_column': 'message_type'},
+}
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+
+
+def table_columns(db: DatabaseConnectionManager, table: str) -> List[Tuple[str, str]]:
+    """Return (column name, declared SQL type) pairs for an exportable table"""
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unsupported export table: {table}")
+    rows = db.connection().execute(f'PRAGMA table_info({table})').fetchall()
+    return [(row[1], (row[2] or '').upper()) for row in rows]
+
+
+def iter_batches(db: DatabaseConnectionManager, table: str, since: str = None, until: str = None,
+                 status: str = None, batch_size: int = 1000) -> Iterator[List[Tuple]]:
+    """Yield row batches of ``table`` in id order, filtered by date range and status.
+
+    ``since`` is inclusive and ``until`` exclusive; both are compared against
+    the table's ISO-formatted date column. Only ``batch_size`` rows are held in
+    memory at a time.
+    """
+    config = EXPORT_TABLES.get(table)
+    if config is None:
+        raise ValueError(f"Unsupported export table: {table}")
+
+    columns = [name for name, _ in table_columns(db, table)]
+    conditions, params = [], []
+    if since:
+        conditions.append(f"{config['date_column']} >= ?")
+        params.append(since)
+    if until:
+        conditions.append(f"{config['date_column']} < ?")
+        params.append(until)
+    if status:
+        if not config['status_column']:
+            raise ValueError(f"Table {table} has no status column to filter on")
+        conditions.append(f"{config['status_column']} = ?")
+        params.append(status)
+
+    query = f"SELECT {', '.join(columns)} FROM {table}"
+    if conditions:
+        query += ' WHERE ' + ' AND '.join(conditions)
+    query += ' ORDER BY id'
+
+    # A dedicated cursor steps through the result lazily; nothing is materialised
+    cursor = db.connection().cursor()
+    cursor.arraysize = batch_size
+    cursor.execute(query, params)
+    try:
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                return
+            yield rows
+    finally:
+        cursor.close()
+
+
+def iter_records(db: DatabaseConnectionManager, table: str, **filters) -> Iterator[Dict[str, Any]]:
+    """Yield one dict per row; convenience wrapper around iter_batches"""
+    columns = [name for name, _ in table_columns(db, table)]
+    for rows in iter_batches(db, table, **filters):
+        for row in rows:
+            yield dict(zip(columns, row))
+
+
+def export_csv(db: DatabaseConnectionManager, table: str, output_path: str, **filters) -> int:
+    """Stream ``table`` to a CSV file with a header row; returns the row count"""
+    columns = [name for name, _ in table_columns(db, table)]
+    count = 0
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for rows in iter_batches(db, table, **filters):
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+
+def export_jsonl(db: DatabaseConnectionManager, table: str, output_path: str, **filters) -> int:
+    """Stream ``table`` to a JSON Lines file; returns the row count"""
+    columns = [name for name, _ in table_columns(db, table)]
+    count = 0
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for rows in iter_batches(db, table, **filters):
+            f.writelines(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + '\n' for row in rows)
+            count += len(rows)
+    return count
+
+
+def _arrow_type(sql_type: str):
+    if 'INT' in sql_type or sql_type == 'BOOLEAN':
+        return pa.int64()
+    if any(token in sql_type for token in ('REAL', 'FLOA', 'DOUB', 'NUMERIC')):
+        return pa.float64()
+    return pa.string()
+
+
+def export_parquet(db: DatabaseConnectionManager, table: str, output_path: str, **filters) -> int:
+    """Stream ``table`` to Parquet, one row group per batch; requires pyarrow"""
+    if pa is None:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+
+    columns = table_columns(db, table)
+    schema = pa.schema([(name, _arrow_type(sql_type)) for name, sql_type in columns])
+    count = 0
+    with pq.ParquetWriter(output_path, schema) as writer:
+        for rows in iter_batches(db, table, **filters):
+            arrays = [pa.array([row[i] for row in rows], type=schema.field(i).type)
+                      for i in range(len(columns))]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            count += len(rows)
+    return count
+
+
+EXPORTERS = {
+    'csv': export_csv,
+    'jsonl': export_jsonl,
+    'parquet': export_parquet,
+}
+
+
+def export_table(db: DatabaseConnectionManager, table: str, output_path: str, fmt: str = 'csv',
+                 **filters) -> int:
+    """Export ``table`` in one of EXPORT_FORMATS; returns the number of rows written"""
+    exporter = EXPORTERS.get(fmt)
+    if exporter is None:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    count = exporter(db, table, output_path, **filters)
+    logger.info(f"Exported {count} {table} rows to {output_path} ({fmt})")
+    return count
+
+
+def main():
+    """Command-line entry point for exporting workflow history"""
+    parser = argparse.ArgumentParser(description="Export Fiverr workflow data without loading it into memory")
+    parser.add_argument('table', choices=sorted(EXPORT_TABLES))
+    parser.add_argument('output', help="Output file path")
+    parser.add_argument('--format', dest='fmt', choices=EXPORT_FORMATS,
+                        help="Defaults to the output file extension, else csv")
+    parser.add_argument('--db', default='fiverr_business.db', help="Workflow database path")
+    parser.add_argument('--since', help="Inclusive lower bound on the table's date column (ISO date)")
+    parser.add_argument('--until', help="Exclusive upper bound on the table's date column (ISO date)")
+    parser.add_argument('--status', help="Project status, or message type for communications")
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    fmt = args.fmt
+    if fmt is None:
+        suffix = Path(args.output).suffix.lstrip('.').lower()
+        fmt = suffix if suffix in EXPORT_FORMATS else 'csv'
+
+    automation = FiverrWorkflowAutomation(args.db)
+    count = export_table(automation.db, args.table, args.output, fmt, since=args.since,
+                         until=args.until, status=args.status, batch_size=args.batch_size)
+    automation.close()
+    print(f"✅ Exported {count} {args.table} rows to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Multi-process Stress Benchmark for Fiverr Workflow Automation
+Runs N processes of mixed reads and writes against one SQLite database and
+reports throughput, lock retries and lock errors
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import time
+from typing import Dict, Any
+import logging
+
+from workflow_automation import FiverrWorkflowAutomation, InvalidTransitionError, PROJECT_LIFECYCLE, _is_busy_error
+
+logger = logging.getLogger(__name__)
+
+
+def _write_op(automation: FiverrWorkflowAutomation, rng: random.Random, worker_id: int, seq: int):
+    choice = rng.random()
+    if choice < 0.3:
+        automation.add_client(f"Stress Client {worker_id}-{seq}", f"stress{worker_id}-{seq}@example.com")
+    elif choice < 0.8:
+        automation.create_project(rng.randint(1, 50), "market_research", f"Stress project {worker_id}-{seq}",
+                                  "standard", rng.choice((150.0, 300.0, 500.0)))
+    else:
+        # Pick a move PROJECT_LIFECYCLE allows from the current status, avoiding the
+        # terminal 'cancelled' so projects keep cycling
+        project = automation.get_project(rng.randint(1, 200), ('id', 'status'))
+        targets = [status for status in PROJECT_LIFECYCLE.get(project.status, ()) if status != 'cancelled'] \
+            if project else []
+        if targets:
+            automation.update_project_status(project.id, rng.choice(targets), "stress")
+
+
+def _read_op(automation: FiverrWorkflowAutomation, rng: random.Random):
+    if rng.random() < 0.5:
+        automation.get_dashboard_data()
+    else:
+        automation.generate_project_report(rng.randint(1, 200))
+
+
+def _worker(db_path: str, duration: float, read_ratio: float, single_writer: bool, worker_id: int) -> Dict[str, Any]:
+    """Run mixed operations until ``duration`` elapses; returns this process' counters"""
+    logging.getLogger('workflow_automation').setLevel(logging.ERROR)
+    automation = FiverrWorkflowAutomation(db_path, single_writer=single_writer)
+    rng = random.Random(worker_id)
+    counts = {'reads': 0, 'writes': 0, 'transition_conflicts': 0, 'lock_errors': 0, 'other_errors': 0}
+    deadline = time.perf_counter() + duration
+    seq = 0
+    while time.perf_counter() < deadline:
+        seq += 1
+        is_read = rng.random() < read_ratio
+        try:
+            if is_read:
+                _read_op(automation, rng)
+            else:
+                _write_op(automation, rng, worker_id, seq)
+            counts['reads' if is_read else 'writes'] += 1
+        except InvalidTransitionError:
+            # Another process moved the project between our read and our write
+            counts['transition_conflicts'] += 1
+        except sqlite3.OperationalError as e:
+            counts['lock_errors' if _is_busy_error(e) else 'other_errors'] += 1
+        except Exception:
+            counts['other_errors'] += 1
+    automation.close()
+    counts['busy_retries'] = automation.db.stats['busy_retries']
+    counts['transactions'] = automation.db.stats['transactions']
+    return counts
+
+
+def _seed(db_path: str):
+    """Create the schema and enough clients/projects for the workload to hit"""
+    automation = FiverrWorkflowAutomation(db_path)
+    automation.add_clients_bulk([{'name': f"Seed Client {i}", 'email': f"seed{i}@example.com"}
+                                 for i in range(50)])
+    automation.create_projects_bulk([{'client_id': i % 50 + 1, 'project_type': 'data_analysis',
+                                      'title': f"Seed project {i}", 'package_type': 'standard',
+                                      'price': 200.0} for i in range(200)])
+    automation.close()
+
+
+def run_benchmark(db_path: str, processes: int = 4, duration: float = 10.0, read_ratio: float = 0.7,
+                  single_writer: bool = False) -> Dict[str, Any]:
+    """Run the stress workload and return aggregated counters and throughput"""
+    _seed(db_path)
+    args = [(db_path, duration, read_ratio, single_writer, worker_id) for worker_id in range(processes)]
+    started = time.perf_counter()
+    with multiprocessing.get_context('spawn').Pool(processes) as pool:
+        results = pool.starmap(_worker, args)
+    elapsed = time.perf_counter() - started
+
+    totals: Dict[str, Any] = {key: sum(r[key] for r in results) for key in results[0]}
+    totals['processes'] = processes
+    totals['elapsed'] = elapsed
+    totals['ops_per_second'] = (totals['reads'] + totals['writes']) / duration
+    totals['writes_per_second'] = totals['writes'] / duration
+    return totals
+
+
+def main():
+    """Command-line entry point for the concurrency stress test"""
+    parser = argparse.ArgumentParser(description="Stress the workflow database from several processes")
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds each process runs")
+    parser.add_argument('--read-ratio', type=float, default=0.7, help="Fraction of operations that are reads")
+    parser.add_argument('--db', default='stress_benchmark.db', help="Scratch database (recreated)")
+    parser.add_argument('--single-writer', action='store_true',
+                        help="Serialize each process' writes through a writer thread")
+    args = parser.parse_args()
+
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(args.db + suffix):
+            os.remove(args.db + suffix)
+
+    print("🏋️ Workflow Database Stress Benchmark")
+    print("=" * 50)
+    totals = run_benchmark(args.db, args.processes, args.duration, args.read_ratio, args.single_writer)
+
+    print(f"Processes: {totals['processes']} ({'single-writer' if args.single_writer else 'direct'} writes)")
+    print(f"Throughput: {totals['ops_per_second']:.0f} ops/s ({totals['writes_per_second']:.0f} writes/s)")
+    print(f"Reads: {totals['reads']}  Writes: {totals['writes']}  Transactions: {totals['transactions']}")
+    print(f"Lock retries: {totals['busy_retries']}  Status conflicts: {totals['transition_conflicts']}")
+    print(f"Lock errors: {totals['lock_errors']}  Other errors: {totals['other_errors']}")
+
+if __name__ == "__main__":
+    main()